@@ -0,0 +1,15 @@
+"""
+Điểm vào dòng lệnh: python -m cvrp_simulator solve <tệp dữ liệu> [tùy chọn]
+"""
+
+import os
+import sys
+
+# Các mô-đun của dự án nhập tuyệt đối (from core import ...) tính từ thư mục gốc của dự án
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Các script đo hiệu năng cho CVRP Simulator"""
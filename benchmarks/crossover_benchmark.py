@@ -0,0 +1,142 @@
+"""
+Micro-benchmark cho các toán tử lai ghép của Thuật toán Di truyền
+
+So sánh phiên bản quét danh sách cũ (O(n^2)) của OX/PMX với phiên bản dùng mảng tra cứu,
+cùng các kernel theo hàng của biểu diễn ma trận.
+
+Chạy từ thư mục gốc của dự án:
+    python -m benchmarks.crossover_benchmark --sizes 100 500 1000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from core import CVRP, GeneticAlgorithm_CVRP
+from core.population import (
+    random_population, segment_bounds,
+    ordered_crossover_rows, partially_mapped_crossover_rows, cycle_crossover_rows,
+)
+
+
+def reference_ordered_crossover(parent1, parent2, point1, point2):
+    """OX như phiên bản trước: `parent[j] in child` quét lại danh sách con cho mỗi gene"""
+    size = len(parent1)
+    child = [-1] * size
+    child[point1:point2 + 1] = parent1[point1:point2 + 1]
+    j = 0
+    for i in range(size):
+        if point1 <= i <= point2:
+            continue
+        while parent2[j] in child:
+            j = (j + 1) % size
+        child[i] = parent2[j]
+        j = (j + 1) % size
+    return child
+
+
+def reference_partially_mapped_crossover(parent1, parent2, point1, point2):
+    """PMX như phiên bản trước: mỗi xung đột tìm gene ánh xạ bằng cách quét lại đoạn giữa"""
+    size = len(parent1)
+    child = parent2.copy()
+    mapped_genes = set()
+    for i in range(point1, point2 + 1):
+        child[i] = parent1[i]
+        mapped_genes.add(parent1[i])
+    for i in range(size):
+        if i < point1 or i > point2:
+            current = child[i]
+            while current in mapped_genes:
+                for j in range(point1, point2 + 1):
+                    if parent1[j] == current:
+                        current = parent2[j]
+                        break
+            child[i] = current
+    return child
+
+
+def time_per_call(function, repeats, seed=None):
+    """
+    Thời gian trung bình (micro giây) của một lần gọi function()
+
+    seed: nếu có, đặt lại hạt giống của random một lần trước vòng đo (ngoài phần được tính giờ)
+    """
+    if seed is not None:
+        random.seed(seed)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def operator_host():
+    """GA thật trên một bài toán một khách hàng; toán tử lai ghép không phụ thuộc dữ liệu bài toán"""
+    cvrp = CVRP()
+    cvrp.add_depot(0, 0)
+    cvrp.add_customer(1, 1, 0, 1)
+    cvrp.calculate_distances()
+    return GeneticAlgorithm_CVRP(cvrp)
+
+
+def benchmark_size(size, repeats, batch):
+    """Đo thời gian mọi toán tử lai ghép với nhiễm sắc thể độ dài size"""
+    ga = operator_host()
+    parent1 = random.sample(range(1, size + 1), size)
+    parent2 = random.sample(range(1, size + 1), size)
+
+    # Các hàm của GA tự chọn điểm lai ghép bằng random; phiên bản tham chiếu chọn theo cùng cách
+    # và mỗi phép đo bắt đầu từ cùng hạt giống, nên hai bên lai ghép trên cùng dãy đoạn
+    def random_points(reference):
+        def call():
+            point1 = random.randint(0, size - 2)
+            point2 = random.randint(point1 + 1, size - 1)
+            return reference(parent1, parent2, point1, point2)
+        return call
+
+    def operator_call(function):
+        return lambda: function(parent1, parent2)
+
+    parents1 = random_population(batch, size)
+    parents2 = random_population(batch, size)
+    start, end = segment_bounds(batch, size)
+
+    # Thời gian cho mỗi cặp cha mẹ (kernel theo hàng chia đều cho batch cặp)
+    results = {
+        'OX (list scan, before)': time_per_call(random_points(reference_ordered_crossover), repeats, seed=0),
+        'OX (lookup array)': time_per_call(operator_call(ga.ordered_crossover), repeats, seed=0) / 2,
+        'OX (matrix rows)': time_per_call(
+            lambda: ordered_crossover_rows(parents1, parents2, start, end), repeats) / batch,
+        'PMX (segment search, before)': time_per_call(
+            random_points(reference_partially_mapped_crossover), repeats, seed=0),
+        'PMX (direct mapping)': time_per_call(operator_call(ga.partially_mapped_crossover), repeats, seed=0) / 2,
+        'PMX (matrix rows)': time_per_call(
+            lambda: partially_mapped_crossover_rows(parents1, parents2, start, end), repeats) / batch,
+        'CX (list)': time_per_call(operator_call(ga.cycle_crossover), repeats) / 2,
+        'CX (matrix rows)': time_per_call(
+            lambda: cycle_crossover_rows(parents1, parents2), repeats) / (2 * batch),
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark GA crossover operators (time per child)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000],
+                        help="Chromosome lengths (number of customers)")
+    parser.add_argument("--repeats", type=int, default=20, help="Calls per measurement")
+    parser.add_argument("--batch", type=int, default=100, help="Parent pairs per call for matrix kernels")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+
+    print(f"{'operator':<32}" + "".join(f"{f'n={size}':>14}" for size in args.sizes))
+    columns = [benchmark_size(size, args.repeats, args.batch) for size in args.sizes]
+    for name in columns[0]:
+        print(f"{name:<32}" + "".join(f"{column[name]:>12.1f}us" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
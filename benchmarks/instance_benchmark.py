@@ -0,0 +1,221 @@
+"""
+Benchmark ACO và GA trên các bộ dữ liệu CVRPLIB đi kèm (A, M, Golden, X)
+
+Mỗi bộ dữ liệu được giải với N hạt giống cho từng thuật toán; báo cáo ghi chi phí tốt nhất
+và trung bình, độ lệch so với lời giải tốt nhất đã biết trong tệp .sol (BKS), thời gian chạy
+và thời gian đạt ngưỡng (BKS x (1 + target_gap%)), rồi xuất ra JSON.
+
+Lưu ý: BKS của CVRPLIB (trừ Golden) dùng khoảng cách làm tròn tới số nguyên, còn bộ giải
+dùng khoảng cách thực nên độ lệch chỉ dùng để so sánh tương đối giữa các phiên bản.
+
+Chạy từ thư mục gốc của dự án:
+    python -m benchmarks.instance_benchmark --instances "A/A-n3*" --seeds 3 -n 100
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from cli import load_instance
+from core import ACO_CVRP, GeneticAlgorithm_CVRP
+
+
+DATASETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datasets")
+
+SOLVERS = {
+    'aco': (ACO_CVRP, 'max_iterations'),
+    'ga': (GeneticAlgorithm_CVRP, 'max_generations'),
+}
+
+
+def read_best_known_cost(sol_file):
+    """Read the best-known cost from the 'Cost N' line of a CVRPLIB .sol file"""
+    with open(sol_file, 'r') as f:
+        for line in f:
+            if line.startswith('Cost'):
+                return float(line.split()[1])
+    return None
+
+
+def find_instances(patterns):
+    """Resolve patterns relative to datasets/ (e.g. 'A/*', 'X/X-n101-k25') to .vrp files with a .sol"""
+    instances = []
+    for pattern in patterns:
+        if not pattern.endswith('.vrp'):
+            pattern += '.vrp'
+        for vrp_file in sorted(glob.glob(os.path.join(DATASETS_DIR, pattern))):
+            sol_file = os.path.splitext(vrp_file)[0] + '.sol'
+            if os.path.exists(sol_file) and vrp_file not in instances:
+                instances.append(vrp_file)
+    return instances
+
+
+def gap_percent(cost, best_known):
+    """Relative gap to the best-known cost in percent"""
+    return (cost - best_known) / best_known * 100.0
+
+
+def run_once(cvrp, solver, params, seed, target_cost):
+    """Run one solver with one seed and record cost, wall time and time-to-target"""
+    algorithm_class, _ = SOLVERS[solver]
+    random.seed(seed)
+    np.random.seed(seed)
+    if solver == 'aco':
+        params = dict(params, seed=seed)
+
+    # Thời điểm chi phí tốt nhất lần đầu đạt ngưỡng, đo từ lúc bắt đầu chạy
+    hit = {}
+
+    def step_callback(data):
+        if 'time' not in hit and data['best_cost'] <= target_cost:
+            hit['time'] = time.perf_counter() - start_time
+
+    algorithm = algorithm_class(cvrp, **params)
+    start_time = time.perf_counter()
+    solution, cost = algorithm.run(step_callback=step_callback)
+    wall_time = time.perf_counter() - start_time
+
+    return {
+        'seed': seed,
+        'cost': float(cost),
+        'valid': bool(solution) and cvrp.is_solution_valid(solution),
+        'wall_time': wall_time,
+        'time_to_target': hit.get('time'),
+        'iterations': len(algorithm.cost_history),
+    }
+
+
+def summarize(runs, best_known):
+    """
+    Aggregate the runs of one solver on one instance
+
+    Cost, gap and time-to-target statistics only use valid runs (None when no run is valid),
+    so an infeasible solution can never report a gap below the best-known cost.
+    """
+    valid_runs = [run for run in runs if run['valid']]
+    costs = [run['cost'] for run in valid_runs]
+    hits = [run['time_to_target'] for run in valid_runs if run['time_to_target'] is not None]
+    summary = {
+        'valid_runs': len(valid_runs),
+        'invalid_runs': len(runs) - len(valid_runs),
+        'best_cost': None,
+        'mean_cost': None,
+        'best_gap': None,
+        'mean_gap': None,
+        'mean_wall_time': float(np.mean([run['wall_time'] for run in runs])),
+        'target_hits': len(hits),
+        'mean_time_to_target': float(np.mean(hits)) if hits else None,
+    }
+    if costs:
+        summary['best_cost'] = min(costs)
+        summary['mean_cost'] = float(np.mean(costs))
+        summary['best_gap'] = gap_percent(summary['best_cost'], best_known)
+        summary['mean_gap'] = gap_percent(summary['mean_cost'], best_known)
+    return summary
+
+
+def format_value(value, width, spec='.1f', suffix=''):
+    """Right-align a number in a report column, or '-' when it is missing"""
+    text = '-' if value is None else f"{value:{spec}}{suffix}"
+    return f"{text:>{width}}"
+
+
+def run_benchmark(instances, solvers, seeds, iterations, target_gap, solver_params):
+    """Run every solver on every instance and return the report entries"""
+    results = []
+    for vrp_file in instances:
+        name = os.path.splitext(os.path.basename(vrp_file))[0]
+        best_known = read_best_known_cost(os.path.splitext(vrp_file)[0] + '.sol')
+        cvrp = load_instance(vrp_file)
+        target_cost = best_known * (1 + target_gap / 100.0)
+
+        for solver in solvers:
+            params = dict(solver_params.get(solver, {}))
+            if iterations is not None:
+                params[SOLVERS[solver][1]] = iterations
+
+            runs = [run_once(cvrp, solver, params, seed, target_cost) for seed in seeds]
+            entry = {
+                'instance': name,
+                'customers': len(cvrp.customers) - 1,
+                'best_known_cost': best_known,
+                'solver': solver,
+                'parameters': params,
+                'runs': runs,
+            }
+            entry.update(summarize(runs, best_known))
+            results.append(entry)
+
+            print(f"{name:<16}{solver:>5}{format_value(entry['best_cost'], 12)}{format_value(entry['mean_cost'], 12)}"
+                  f"{format_value(entry['best_gap'], 10, '.2f', '%')}{format_value(entry['mean_gap'], 10, '.2f', '%')}"
+                  f"{entry['mean_wall_time']:>9.2f}s{entry['target_hits']:>5}/{len(runs)}"
+                  f"{entry['invalid_runs']:>9}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the solvers on bundled CVRPLIB instances (gap to BKS)")
+    parser.add_argument("--instances", nargs="+", default=["A/*"],
+                        help="Instance patterns relative to datasets/, e.g. 'A/*' or 'X/X-n101-k25'")
+    parser.add_argument("--solvers", nargs="+", choices=sorted(SOLVERS), default=["aco", "ga"],
+                        help="Solvers to run")
+    parser.add_argument("--seeds", type=int, default=3, help="Number of seeds per solver and instance")
+    parser.add_argument("--seed-base", type=int, default=0, help="First seed")
+    parser.add_argument("-n", "--iterations", type=int, help="Iterations (ACO) or generations (GA) per run")
+    parser.add_argument("--target-gap", type=float, default=5.0,
+                        help="Gap to BKS in percent that counts as reaching the target")
+    parser.add_argument("--aco-params", type=json.loads, default={}, help="Extra ACO_CVRP arguments as JSON")
+    parser.add_argument("--ga-params", type=json.loads, default={},
+                        help="Extra GeneticAlgorithm_CVRP arguments as JSON")
+    parser.add_argument("-o", "--output", default="benchmark_report.json", help="Output JSON report")
+    args = parser.parse_args()
+
+    instances = find_instances(args.instances)
+    if not instances:
+        parser.error("no instance with a .sol file matches " + " ".join(args.instances))
+
+    seeds = list(range(args.seed_base, args.seed_base + args.seeds))
+    print(f"{'instance':<16}{'solver':>5}{'best':>12}{'mean':>12}{'best gap':>10}{'mean gap':>10}"
+          f"{'time':>10}{'hits':>7}{'invalid':>9}")
+    started = time.time()
+    results = run_benchmark(instances, args.solvers, seeds, args.iterations, args.target_gap,
+                            {'aco': args.aco_params, 'ga': args.ga_params})
+
+    # Độ lệch trung bình của từng thuật toán trên các bộ dữ liệu có ít nhất một lần chạy hợp lệ
+    summary = {}
+    for solver in args.solvers:
+        entries = [entry for entry in results if entry['solver'] == solver]
+        solved = [entry for entry in entries if entry['valid_runs']]
+        summary[solver] = {
+            'mean_gap': float(np.mean([entry['mean_gap'] for entry in solved])) if solved else None,
+            'mean_best_gap': float(np.mean([entry['best_gap'] for entry in solved])) if solved else None,
+            'target_hits': sum(entry['target_hits'] for entry in entries),
+            'runs': sum(len(entry['runs']) for entry in entries),
+            'invalid_runs': sum(entry['invalid_runs'] for entry in entries),
+            'unsolved_instances': len(entries) - len(solved),
+        }
+
+    report = {
+        'settings': {
+            'instances': [os.path.relpath(path, DATASETS_DIR) for path in instances],
+            'solvers': args.solvers,
+            'seeds': seeds,
+            'iterations': args.iterations,
+            'target_gap': args.target_gap,
+        },
+        'total_time': time.time() - started,
+        'summary': summary,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
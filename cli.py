@@ -0,0 +1,201 @@
+"""
+Giao diện dòng lệnh giải bài toán CVRP không cần màn hình
+Chạy ACO hoặc GA trên một tệp JSON hay .vrp (CVRPLIB) và ghi lời giải cùng các chỉ số ra JSON;
+không nhập các mô-đun giao diện (tkinter, matplotlib)
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from convert_cvrplib import parse_vrp_file
+from core import CVRP, ACO_CVRP, GeneticAlgorithm_CVRP
+
+
+# Tham số dòng lệnh riêng của từng thuật toán: (cờ, tên tham số của lớp, kiểu, mô tả, các giá trị
+# hợp lệ hoặc None nếu không giới hạn)
+ACO_OPTIONS = [
+    ("--ants", "num_ants", int, "Number of ants", None),
+    ("--alpha", "alpha", float, "Pheromone importance", None),
+    ("--beta", "beta", float, "Heuristic importance", None),
+    ("--rho", "rho", float, "Pheromone evaporation rate", None),
+    ("--q", "q", float, "Pheromone deposit factor", None),
+    ("--elitist-ants", "elitist_ants", int, "Number of elitist ants", None),
+    ("--candidate-list-size", "candidate_list_size", int, "Nearest neighbors considered per step (0 = all)", None),
+    ("--construction", "construction", str, "Solution construction", ("sequential", "batched")),
+]
+
+GA_OPTIONS = [
+    ("--population-size", "population_size", int, "Population size", None),
+    ("--mutation-rate", "mutation_rate", float, "Mutation probability", None),
+    ("--crossover-rate", "crossover_rate", float, "Crossover probability", None),
+    ("--elitism", "elitism", int, "Number of elite individuals kept", None),
+    ("--selection", "selection_method", str, "Selection method", ("tournament", "roulette", "rank")),
+    ("--crossover", "crossover_method", str, "Crossover operator", ("ordered", "partially_mapped", "cycle")),
+    ("--mutation", "mutation_method", str, "Mutation operator", ("swap", "insert", "inversion", "scramble")),
+    ("--tournament-size", "tournament_size", int, "Tournament size", None),
+    ("--early-stopping", "early_stopping", int, "Stop after this many generations without improvement", None),
+    ("--decoder", "decoder", str, "Chromosome decoder", ("auto", "insertion", "split")),
+    ("--representation", "representation", str, "Population storage", ("list", "array")),
+    ("--engine", "engine", str, "Evolution engine", ("generational", "steady_state")),
+    ("--islands", "islands", int, "Number of islands (0 or 1 = single population)", None),
+    ("--migration-interval", "migration_interval", int, "Generations between migrations", None),
+]
+
+# Cờ bật/tắt riêng của từng thuật toán (tên thuộc tính, cờ)
+ACO_SWITCHES = [("min_max", "--min-max")]
+GA_SWITCHES = [("savings_seeding", "--savings-seeding")]
+
+
+def load_instance(path):
+    """Load a CVRP instance from a JSON file or a CVRPLIB .vrp file"""
+    cvrp = CVRP()
+    if path.lower().endswith('.vrp'):
+        data = parse_vrp_file(path)
+        if not data['depot']:
+            raise ValueError(f"No depot found in {path}")
+        cvrp.load_from_dict(data)
+    elif not cvrp.load_from_file(path):
+        raise ValueError(f"Cannot load instance: {path}")
+    return cvrp
+
+
+def build_algorithm(cvrp, args):
+    """Create the solver selected on the command line"""
+    options = ACO_OPTIONS if args.algorithm == "aco" else GA_OPTIONS
+    params = {name: getattr(args, name) for _, name, _, _, _ in options if getattr(args, name) is not None}
+    if args.local_search:
+        params['local_search'] = True
+    if args.workers is not None:
+        params['workers'] = args.workers
+    if args.progress:
+        params['callback_interval_ms'] = args.progress_interval
+
+    if args.algorithm == "aco":
+        if args.iterations is not None:
+            params['max_iterations'] = args.iterations
+        if args.min_max:
+            params['min_max_aco'] = True
+        params['seed'] = args.seed
+        return ACO_CVRP(cvrp, **params), params
+
+    if args.iterations is not None:
+        params['max_generations'] = args.iterations
+    if args.savings_seeding:
+        params['savings_seeding'] = True
+    return GeneticAlgorithm_CVRP(cvrp, **params), params
+
+
+def foreign_options(args):
+    """Flags given on the command line that belong to the solver not selected with -a"""
+    if args.algorithm == "aco":
+        options, switches = GA_OPTIONS, GA_SWITCHES
+    else:
+        options, switches = ACO_OPTIONS, ACO_SWITCHES
+    flags = [flag for flag, name, _, _, _ in options if getattr(args, name) is not None]
+    return flags + [flag for name, flag in switches if getattr(args, name)]
+
+
+def print_progress(data):
+    """Print one progress line to stderr"""
+    step = data.get('iteration', data.get('generation', 0))
+    print(f"[{data['progress'] * 100:5.1f}%] step {step}: best cost {data['best_cost']:.2f}", file=sys.stderr)
+
+
+def solve(args):
+    """Run the 'solve' command and return the process exit code"""
+    try:
+        cvrp = load_instance(args.instance)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.seed is not None:
+        random.seed(args.seed)
+        np.random.seed(args.seed)
+
+    try:
+        algorithm, params = build_algorithm(cvrp, args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    start_time = time.time()
+    solution, cost = algorithm.run(step_callback=print_progress if args.progress else None)
+    wall_time = time.time() - start_time
+
+    solution = [route for route in (solution or []) if route]
+    result = {
+        'instance': os.path.basename(args.instance),
+        'algorithm': args.algorithm,
+        'parameters': {key: value for key, value in params.items() if key != 'callback_interval_ms'},
+        'seed': args.seed,
+        'cost': float(cost),
+        'valid': bool(solution) and cvrp.is_solution_valid(solution),
+        'num_routes': len(solution),
+        # Tuyến theo mã khách hàng trong tệp dữ liệu (không gồm depot)
+        'routes': [[int(cvrp.customers[node].id) for node in route] for route in solution],
+        'wall_time': wall_time,
+        'computation_time': float(sum(algorithm.time_history)),
+        'iterations': len(algorithm.cost_history),
+        'cost_history': [float(value) for value in algorithm.cost_history],
+    }
+
+    if args.output and args.output != "-":
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+
+def build_parser():
+    """Build the command-line argument parser"""
+    parser = argparse.ArgumentParser(prog="cvrp_simulator", description="Headless CVRP solver")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve_parser = commands.add_parser("solve", help="Solve a CVRP instance and write the result as JSON")
+    solve_parser.add_argument("instance", help="Instance file (.json or CVRPLIB .vrp)")
+    solve_parser.add_argument("-a", "--algorithm", choices=("aco", "ga"), default="ga", help="Solver to run")
+    solve_parser.add_argument("-o", "--output", help="Output JSON file (default: stdout)")
+    solve_parser.add_argument("-n", "--iterations", type=int, help="Maximum iterations (ACO) or generations (GA)")
+    solve_parser.add_argument("--seed", type=int, help="Random seed")
+    solve_parser.add_argument("--workers", type=int, help="Worker processes (0 or 1 = serial)")
+    solve_parser.add_argument("--local-search", action="store_true", help="Apply 2-opt local search")
+    solve_parser.add_argument("--progress", action="store_true", help="Print progress to stderr")
+    solve_parser.add_argument("--progress-interval", type=int, default=1000,
+                              help="Minimum milliseconds between progress lines")
+
+    aco_group = solve_parser.add_argument_group("ACO options")
+    for flag, name, kind, help_text, choices in ACO_OPTIONS:
+        aco_group.add_argument(flag, dest=name, type=kind, choices=choices, help=help_text)
+    aco_group.add_argument("--min-max", action="store_true", help="Use the MAX-MIN Ant System variant")
+
+    ga_group = solve_parser.add_argument_group("GA options")
+    for flag, name, kind, help_text, choices in GA_OPTIONS:
+        ga_group.add_argument(flag, dest=name, type=kind, choices=choices, help=help_text)
+    ga_group.add_argument("--savings-seeding", action="store_true",
+                          help="Seed the initial population with the Clarke-Wright savings solution")
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "solve":
+        foreign = foreign_options(args)
+        if foreign:
+            parser.error(f"{', '.join(foreign)} cannot be used with -a {args.algorithm}")
+        return solve(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 # Import core modules for easy access
 from .cvrp import CVRP, Customer
 from .aco import ACO_CVRP
-from .genetic import GeneticAlgorithm_CVRP
\ No newline at end of file
+from .genetic import GeneticAlgorithm_CVRP
+from .savings import clarke_wright_savings
\ No newline at end of file
@@ -8,13 +8,55 @@ import random
 import time
 import threading
 import copy
+import multiprocessing
+from multiprocessing import shared_memory
+
+from .callbacks import throttle_callback
+from .cvrp import CVRP
+from .local_search import two_opt_route, two_opt_solution
+from .savings import clarke_wright_savings
+
+
+# ACO chỉ dùng để xây dựng lời giải trong mỗi tiến trình con khi chạy song song
+_worker_aco = None
+_worker_shared_memory = None
+
+
+def _init_ant_worker(distances, demands, capacity, settings, run_seed, shared_memory_name):
+    """
+    Khởi tạo tiến trình con một lần với dữ liệu cần cho việc xây dựng lời giải
+
+    Tham số:
+    distances -- Ma trận khoảng cách
+    demands -- Mảng nhu cầu (chỉ số 0 là depot)
+    capacity -- Sức chứa của xe
+    settings -- Tham số ACO ảnh hưởng tới việc xây dựng (candidate_list_size, local_search)
+    run_seed -- Hạt giống của lần chạy, dùng cho bộ sinh ngẫu nhiên của từng kiến
+    shared_memory_name -- Tên vùng nhớ dùng chung chứa choice_info
+    """
+    global _worker_aco, _worker_shared_memory
+    _worker_shared_memory = shared_memory.SharedMemory(name=shared_memory_name)
+    n = len(demands)
+    choice_info = np.ndarray((n, n), dtype=np.float64, buffer=_worker_shared_memory.buf)
+
+    # Tiến trình con chỉ đọc choice_info dùng chung, không tạo các ma trận n×n riêng
+    _worker_aco = ACO_CVRP(CVRP.from_arrays(distances, demands, capacity), choice_info=choice_info, **settings)
+    _worker_aco.run_seed = run_seed
+
+
+def _build_ant_task(task):
+    """Xây dựng lời giải cho một kiến (iteration, ant) trong tiến trình con"""
+    iteration, ant = task
+    return _worker_aco.build_ant(_worker_aco.ant_rng(iteration, ant))
 
 
 class ACO_CVRP:
     """Thuật toán Ant Colony Optimization cho bài toán Định tuyến Phương tiện có Giới hạn Tải trọng (CVRP)"""
 
     def __init__(self, cvrp, num_ants=20, alpha=1.0, beta=2.0, rho=0.5, q=100, max_iterations=100,
-                 min_max_aco=False, local_search=False, elitist_ants=0, initial_pheromone=1.0):
+                 min_max_aco=False, local_search=False, elitist_ants=0, initial_pheromone=1.0,
+                 candidate_list_size=0, construction="sequential", workers=0, seed=None,
+                 callback_interval_ms=0, callback_every=1, choice_info=None):
         """
         Khởi tạo thuật toán ACO cho CVRP
 
@@ -30,6 +72,15 @@ class ACO_CVRP:
         local_search -- Sử dụng tìm kiếm cục bộ
         elitist_ants -- Số lượng kiến ưu tú
         initial_pheromone -- Giá trị pheromone khởi tạo ban đầu
+        candidate_list_size -- Số láng giềng gần nhất kiến xem xét ở mỗi bước (0 = duyệt toàn bộ)
+        construction -- Cách xây dựng lời giải ('sequential': từng kiến, 'batched': mọi kiến cùng lúc)
+        workers -- Số tiến trình xây dựng lời giải song song (0 hoặc 1 = chạy tuần tự, chỉ áp dụng cho 'sequential')
+        seed -- Hạt giống ngẫu nhiên; mỗi kiến dùng bộ sinh riêng theo (seed, vòng lặp, kiến), khi xây
+                dựng theo lô cả đàn dùng chung một bộ sinh theo (seed, vòng lặp)
+        callback_interval_ms -- Khoảng thời gian tối thiểu (ms) giữa hai lần gọi step_callback
+        callback_every -- Chỉ gọi step_callback mỗi callback_every vòng lặp (vòng lặp cuối luôn được gọi)
+        choice_info -- Ma trận choice_info có sẵn (vd. vùng nhớ dùng chung trong tiến trình con); khi
+                       có, đối tượng chỉ dùng để xây dựng lời giải và không tạo pheromone/heuristic
         """
         self.cvrp = cvrp
         self.num_ants = num_ants
@@ -42,28 +93,51 @@ class ACO_CVRP:
         self.local_search = local_search
         self.elitist_ants = elitist_ants
         self.initial_pheromone = initial_pheromone
+        self.candidate_list_size = candidate_list_size
+        self.construction = construction
+        self.workers = workers
+        self.seed = seed
+        self.callback_interval_ms = callback_interval_ms
+        self.callback_every = callback_every
 
         # Số lượng khách hàng
         self.n = len(cvrp.customers)
 
-        # Khởi tạo ma trận pheromone
-        self.pheromone = np.ones((self.n, self.n)) * self.initial_pheromone
+        # Nhu cầu của khách hàng dạng list (lấy từ mảng cvrp.demands), tra cứu vô hướng
+        # trong các vòng lặp Python nhanh hơn so với truy cập thuộc tính Customer
+        self.demands = cvrp.demands.tolist()
+
+        # Danh sách ứng viên: k khách hàng gần nhất của mỗi nút (None nếu không dùng)
+        self.neighbors = None
+        if candidate_list_size:
+            self.neighbors = cvrp.get_neighbors(candidate_list_size).tolist()
 
         # Khởi tạo giá trị pheromone tối thiểu và tối đa (cho MIN-MAX ACO)
         self.max_pheromone = 1.0
         self.min_pheromone = 0.1
 
-        # Khởi tạo ma trận heuristic (nghịch đảo của khoảng cách)
-        self.heuristic = np.zeros((self.n, self.n))
-        for i in range(self.n):
-            for j in range(self.n):
-                if i != j and cvrp.distances[i, j] > 0:
-                    self.heuristic[i, j] = 1.0 / cvrp.distances[i, j]
+        if choice_info is not None:
+            self.pheromone = self.heuristic = self.heuristic_beta = None
+            self.choice_info = choice_info
+        else:
+            # Khởi tạo ma trận pheromone
+            self.pheromone = np.ones((self.n, self.n)) * self.initial_pheromone
+
+            # Khởi tạo ma trận heuristic (nghịch đảo của khoảng cách)
+            self.heuristic = np.zeros((self.n, self.n))
+            np.divide(1.0, cvrp.distances, out=self.heuristic, where=cvrp.distances > 0)
+
+            # Ma trận choice_info = pheromone^alpha * heuristic^beta, làm mới một lần mỗi vòng lặp
+            # sau khi cập nhật pheromone để mỗi bước của kiến chỉ cần lấy một hàng
+            self.heuristic_beta = self.heuristic ** self.beta
+            self.choice_info = np.empty((self.n, self.n))
+            self.update_choice_info()
 
         # Lưu kết quả
         self.best_solution = None
         self.best_cost = float('inf')
         self.best_iteration = 0
+        self.best_edges = None
 
         # Trạng thái cho trực quan hóa
         self.current_solution = None
@@ -82,6 +156,11 @@ class ACO_CVRP:
         self.pause_condition = threading.Condition()
         self.was_stopped = False
 
+        # Tiến trình con và vùng nhớ dùng chung cho choice_info (chỉ tồn tại trong lúc chạy)
+        self.pool = None
+        self.shared_choice_info = None
+        self.run_seed = None
+
     def run(self, callback=None, step_callback=None):
         """
         Chạy thuật toán ACO
@@ -100,6 +179,7 @@ class ACO_CVRP:
         self.worst_cost_history = []
         self.pheromone_stats_history = []
         self.time_history = []
+        self.best_edges = None
 
         # Nếu sử dụng MIN-MAX ACO, khởi tạo giá trị pheromone tối đa
         if self.min_max_aco:
@@ -108,6 +188,36 @@ class ACO_CVRP:
             self.max_pheromone = 1.0 / (self.rho * initial_cost)
             self.min_pheromone = self.max_pheromone * 0.001
 
+        # Hạt giống cho bộ sinh ngẫu nhiên riêng của từng kiến (khi chạy song song hoặc có seed)
+        self.run_seed = self.seed
+        if self.run_seed is None and self.workers > 1:
+            self.run_seed = int(np.random.randint(2 ** 31))
+
+        # Điều tiết step_callback; vòng lặp cuối bị giữ lại được gửi bằng flush()
+        step_callback = throttle_callback(step_callback, self.callback_interval_ms, self.callback_every)
+
+        try:
+            self.start_workers()
+            self.run_iterations(step_callback)
+        finally:
+            self.shutdown_workers()
+
+        if step_callback:
+            step_callback.flush()
+
+        # Gọi callback khi hoàn thành
+        if callback and not self.was_stopped:
+            callback((self.best_solution, self.best_cost))
+
+        return self.best_solution, self.best_cost
+
+    def run_iterations(self, step_callback=None):
+        """
+        Vòng lặp chính của thuật toán ACO
+
+        Tham số:
+        step_callback -- StepThrottle bọc hàm gọi lại sau mỗi vòng lặp (nhận dữ liệu dạng hàm)
+        """
         for iteration in range(self.max_iterations):
             # Kiểm tra dừng
             if self.stop_flag:
@@ -123,30 +233,20 @@ class ACO_CVRP:
             start_time = time.time()
             self.current_iteration = iteration
 
-            ant_solutions = []
-            ant_costs = []
-
             # Mỗi kiến xây dựng một giải pháp
-            for ant in range(self.num_ants):
-                solution = self.construct_solution()
-
-                # Áp dụng tìm kiếm cục bộ nếu được kích hoạt
-                if self.local_search:
-                    solution = self.local_search_2opt(solution)
-
-                cost = self.cvrp.calculate_solution_cost(solution)
-
-                ant_solutions.append(solution)
-                ant_costs.append(cost)
+            ant_solutions, ant_costs = self.construct_colony(iteration)
 
+            for solution, cost in zip(ant_solutions, ant_costs):
                 # Cập nhật giải pháp tốt nhất
                 if cost < self.best_cost:
                     self.best_solution = copy.deepcopy(solution)
+                    self.best_edges = None
                     self.best_cost = cost
                     self.best_iteration = iteration
 
             # Cập nhật pheromone
             self.update_pheromone(ant_solutions, ant_costs)
+            self.update_choice_info()
 
             # Tính toán các thống kê
             avg_cost = np.mean(ant_costs)
@@ -187,20 +287,98 @@ class ACO_CVRP:
                     'best_cost': self.best_cost,
                     'avg_cost': avg_cost,
                     'worst_cost': worst_cost,
-                    'pheromone': self.pheromone,
+                    'avg_pheromone': pheromone_stats['avg'],
+                    'max_pheromone': pheromone_stats['max'],
+                    'min_pheromone': pheromone_stats['min'],
                     'cost_history': self.cost_history,
                     'computation_time': computation_time,  # Thời gian tính toán thuần túy
                 }
-                should_stop = step_callback(data)
+                # update_pheromone sửa ma trận tại chỗ, nên người nhận (thường ở luồng giao diện)
+                # cần một bản sao; bản sao chỉ được tạo khi bước thực sự được chuyển tiếp
+                should_stop = step_callback(lambda data=data: dict(data, pheromone=self.pheromone.copy()))
                 if should_stop:
                     self.was_stopped = True
                     break
 
-        # Gọi callback khi hoàn thành
-        if callback and not self.was_stopped:
-            callback((self.best_solution, self.best_cost))
+    def construct_colony(self, iteration):
+        """
+        Xây dựng giải pháp cho cả đàn kiến trong một vòng lặp
 
-        return self.best_solution, self.best_cost
+        Tham số:
+        iteration -- Vòng lặp hiện tại (dùng để sinh hạt giống cho từng kiến)
+
+        Trả về:
+        Danh sách giải pháp và danh sách chi phí tương ứng
+        """
+        if self.pool is not None:
+            tasks = [(iteration, ant) for ant in range(self.num_ants)]
+            chunksize = max(1, self.num_ants // (self.workers * 4))
+            results = self.pool.map(_build_ant_task, tasks, chunksize=chunksize)
+        elif self.construction == "batched":
+            rng = self.colony_rng(iteration) if self.run_seed is not None else np.random
+            results = [self.improve_ant(solution) for solution in self.construct_solutions_batched(rng)]
+        else:
+            results = []
+            for ant in range(self.num_ants):
+                rng = self.ant_rng(iteration, ant) if self.run_seed is not None else np.random
+                results.append(self.build_ant(rng))
+
+        return [solution for solution, _ in results], [cost for _, cost in results]
+
+    def build_ant(self, rng=np.random):
+        """Một kiến xây dựng giải pháp, áp dụng tìm kiếm cục bộ (nếu có) và tính chi phí"""
+        return self.improve_ant(self.construct_solution(rng))
+
+    def improve_ant(self, solution):
+        """Áp dụng tìm kiếm cục bộ (nếu có) và trả về cặp (giải pháp, chi phí)"""
+        if self.local_search:
+            solution = self.local_search_2opt(solution)
+        return solution, self.cvrp.calculate_solution_cost(solution)
+
+    def ant_rng(self, iteration, ant):
+        """Bộ sinh ngẫu nhiên tất định cho kiến ant ở vòng lặp iteration"""
+        seed = np.random.SeedSequence([self.run_seed, iteration, ant]).generate_state(1)[0]
+        return np.random.RandomState(seed)
+
+    def colony_rng(self, iteration):
+        """Bộ sinh ngẫu nhiên tất định cho cả đàn kiến ở vòng lặp iteration (xây dựng theo lô)"""
+        seed = np.random.SeedSequence([self.run_seed, iteration]).generate_state(1)[0]
+        return np.random.RandomState(seed)
+
+    def start_workers(self):
+        """Khởi tạo nhóm tiến trình con và chuyển choice_info sang vùng nhớ dùng chung"""
+        if self.workers <= 1 or self.construction == "batched":
+            return
+
+        self.shared_choice_info = shared_memory.SharedMemory(create=True, size=self.choice_info.nbytes)
+        shared = np.ndarray(self.choice_info.shape, dtype=np.float64, buffer=self.shared_choice_info.buf)
+        shared[:] = self.choice_info
+        self.choice_info = shared
+
+        # Dùng 'spawn' vì thuật toán thường chạy trong luồng nền của giao diện
+        context = multiprocessing.get_context("spawn")
+        settings = {'candidate_list_size': self.candidate_list_size, 'local_search': self.local_search}
+        initargs = (self.cvrp.distances, self.cvrp.demands, self.cvrp.capacity, settings, self.run_seed,
+                    self.shared_choice_info.name)
+        self.pool = context.Pool(self.workers, initializer=_init_ant_worker, initargs=initargs)
+
+    def shutdown_workers(self):
+        """
+        Dừng nhóm tiến trình con và giải phóng vùng nhớ dùng chung
+
+        Hai tài nguyên được giải phóng độc lập, nên vùng nhớ vẫn được trả lại khi việc tạo nhóm
+        tiến trình thất bại sau khi vùng nhớ đã được cấp phát
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+        if self.shared_choice_info is not None:
+            self.choice_info = self.choice_info.copy()
+            self.shared_choice_info.close()
+            self.shared_choice_info.unlink()
+            self.shared_choice_info = None
 
     def construct_initial_solution(self):
         """
@@ -209,104 +387,53 @@ class ACO_CVRP:
         Trả về:
         Danh sách các tuyến đường
         """
-        # Tạo tuyến đường riêng cho từng khách hàng
-        routes = [[i] for i in range(1, self.n)]
-
-        # Tính toán các giá trị savings
-        savings = []
-        for i in range(1, self.n):
-            for j in range(i+1, self.n):
-                # Savings = dist(0,i) + dist(0,j) - dist(i,j)
-                saving = (self.cvrp.distances[0, i] + self.cvrp.distances[0, j] -
-                          self.cvrp.distances[i, j])
-                savings.append((saving, i, j))
-
-        # Sắp xếp theo savings giảm dần
-        savings.sort(reverse=True)
-
-        # Ánh xạ giữa khách hàng và tuyến đường
-        customer_to_route = {i: idx for idx, route in enumerate(routes) for i in route}
-
-        # Hợp nhất các tuyến đường dựa trên savings
-        for saving, i, j in savings:
-            # Nếu i và j đã ở cùng tuyến đường, bỏ qua
-            if customer_to_route[i] == customer_to_route[j]:
-                continue
-
-            # Lấy tuyến đường chứa i và j
-            route_i = routes[customer_to_route[i]]
-            route_j = routes[customer_to_route[j]]
-
-            # Kiểm tra nếu i và j là đầu/cuối của các tuyến đường
-            is_i_end = (i == route_i[0] or i == route_i[-1])
-            is_j_end = (j == route_j[0] or j == route_j[-1])
-
-            # Nếu cả hai không phải đầu/cuối, bỏ qua
-            if not (is_i_end and is_j_end):
-                continue
-
-            # Kiểm tra ràng buộc dung lượng
-            total_demand = sum(self.cvrp.customers[k].demand for k in route_i + route_j)
-            if total_demand > self.cvrp.capacity:
-                continue
-
-            # Hợp nhất hai tuyến đường
-            # Xác định vị trí của i và j trong tuyến đường để hợp nhất hợp lý
-            if i == route_i[0]:
-                route_i.reverse()
-            if j == route_j[-1]:
-                route_j.reverse()
-
-            # Hợp nhất và cập nhật ánh xạ
-            new_route = route_i + route_j
-            routes[customer_to_route[i]] = new_route
-            routes.pop(customer_to_route[j])
-
-            # Cập nhật ánh xạ
-            for k in route_j:
-                customer_to_route[k] = customer_to_route[i]
-
-            # Cập nhật các chỉ số tuyến đường
-            for k in range(1, self.n):
-                for idx, route in enumerate(routes):
-                    if k in route:
-                        customer_to_route[k] = idx
-
-        return routes
-
-    def construct_solution(self):
+        return clarke_wright_savings(self.cvrp)
+
+    def construct_solution(self, rng=np.random):
         """
         Xây dựng một giải pháp bằng một kiến
 
+        Tham số:
+        rng -- Bộ sinh ngẫu nhiên (mặc định là bộ sinh toàn cục của NumPy)
+
         Trả về:
         Danh sách các tuyến đường (mỗi tuyến là một danh sách khách hàng)
         """
         solution = []
-        remaining = list(range(1, self.n))  # Danh sách khách hàng chưa thăm (bỏ qua depot 0)
+        visited = [False] * self.n
+        unvisited = self.n - 1  # Số khách hàng chưa thăm (bỏ qua depot 0)
 
-        while remaining:
+        while unvisited:
             # Bắt đầu một tuyến mới từ depot
             route = []
             current_capacity = 0
             current_node = 0  # Depot
 
             while True:
-                # Tìm các khách hàng tiếp theo có thể thăm
+                # Tìm các khách hàng tiếp theo có thể thăm, ưu tiên trong danh sách ứng viên
                 candidates = []
-                for node in remaining:
-                    if current_capacity + self.cvrp.customers[node].demand <= self.cvrp.capacity:
-                        candidates.append(node)
+                if self.neighbors is not None:
+                    candidates = [node for node in self.neighbors[current_node]
+                                  if not visited[node] and
+                                  current_capacity + self.demands[node] <= self.cvrp.capacity]
+
+                # Nếu danh sách ứng viên không còn nút khả thi, duyệt toàn bộ khách hàng chưa thăm
+                # (theo thứ tự chỉ số tăng dần)
+                if not candidates:
+                    candidates = [node for node in range(1, self.n) if not visited[node] and
+                                  current_capacity + self.demands[node] <= self.cvrp.capacity]
 
                 if not candidates:
                     break  # Không thể thêm khách hàng vào tuyến hiện tại
 
                 # Chọn khách hàng tiếp theo dựa trên quy tắc chọn của ACO
-                next_node = self.select_next_node(current_node, candidates)
+                next_node = self.select_next_node(current_node, candidates, rng)
                 route.append(next_node)
-                remaining.remove(next_node)
+                visited[next_node] = True
+                unvisited -= 1
 
                 # Cập nhật dung lượng hiện tại
-                current_capacity += self.cvrp.customers[next_node].demand
+                current_capacity += self.demands[next_node]
                 current_node = next_node
 
             if route:  # Nếu tuyến không rỗng, thêm vào giải pháp
@@ -314,13 +441,129 @@ class ACO_CVRP:
 
         return solution
 
-    def select_next_node(self, current, candidates):
+    def construct_solutions_batched(self, rng=np.random):
+        """
+        Xây dựng giải pháp cho tất cả kiến cùng lúc
+
+        Mọi kiến tiến từng bước song song: mặt nạ đã thăm (num_ants x n), mảng tải trọng
+        và phép chọn roulette được vector hóa trên các hàng của choice_info.
+
+        Tham số:
+        rng -- Bộ sinh ngẫu nhiên (mặc định là bộ sinh toàn cục của NumPy)
+
+        Trả về:
+        Danh sách giải pháp, mỗi kiến một giải pháp
+        """
+        num_ants = self.num_ants
+        capacity = self.cvrp.capacity
+        demands = self.cvrp.demands
+
+        visited = np.zeros((num_ants, self.n), dtype=bool)
+        visited[:, 0] = True
+        load = np.zeros(num_ants)
+        current = np.zeros(num_ants, dtype=np.intp)
+        unvisited_count = np.full(num_ants, self.n - 1)
+        solutions = [[[]] for _ in range(num_ants)]
+
+        neighbors = None
+        if self.candidate_list_size:
+            neighbors = self.cvrp.get_neighbors(self.candidate_list_size)
+
+        while True:
+            ants = np.flatnonzero(unvisited_count > 0)
+            if ants.size == 0:
+                break
+
+            cur = current[ants]
+            next_nodes = np.full(ants.size, -1)
+
+            # Ưu tiên chọn trong danh sách ứng viên
+            if neighbors is not None and neighbors.shape[1] > 0:
+                nb = neighbors[cur]
+                mask = ~visited[ants[:, None], nb] & (load[ants, None] + demands[nb] <= capacity)
+                rows = np.flatnonzero(mask.any(axis=1))
+                if rows.size:
+                    weights = self.choice_info[cur[rows, None], nb[rows]]
+                    cols = self.batched_roulette(weights, mask[rows], rng)
+                    next_nodes[rows] = nb[rows, cols]
+
+            # Các kiến còn lại duyệt toàn bộ khách hàng chưa thăm
+            rows = np.flatnonzero(next_nodes < 0)
+            if rows.size:
+                mask = ~visited[ants[rows]] & (load[ants[rows], None] + demands[None, :] <= capacity)
+                movable = mask.any(axis=1)
+                picked = rows[movable]
+                if picked.size:
+                    weights = self.choice_info[cur[picked]]
+                    next_nodes[picked] = self.batched_roulette(weights, mask[movable], rng)
+
+                # Kiến không còn khách hàng khả thi quay về depot và bắt đầu tuyến mới
+                for ant in ants[rows[~movable]]:
+                    if solutions[ant][-1]:
+                        solutions[ant].append([])
+                    elif current[ant] == 0:
+                        # Khách hàng có nhu cầu vượt sức chứa: phục vụ bằng tuyến riêng
+                        for node in np.flatnonzero(~visited[ant]):
+                            solutions[ant][-1].append(int(node))
+                            solutions[ant].append([])
+                        visited[ant] = True
+                        unvisited_count[ant] = 0
+                    load[ant] = 0
+                    current[ant] = 0
+
+            # Di chuyển các kiến đã chọn được khách hàng tiếp theo
+            movers = next_nodes >= 0
+            moved_ants = ants[movers]
+            nodes = next_nodes[movers]
+            visited[moved_ants, nodes] = True
+            load[moved_ants] += demands[nodes]
+            current[moved_ants] = nodes
+            unvisited_count[moved_ants] -= 1
+            for ant, node in zip(moved_ants.tolist(), nodes.tolist()):
+                solutions[ant][-1].append(node)
+
+        return [[route for route in solution if route] for solution in solutions]
+
+    def batched_roulette(self, weights, mask, rng=np.random):
+        """
+        Chọn một cột cho mỗi hàng bằng bánh xe roulette
+
+        Tham số:
+        weights -- Ma trận trọng số (mỗi hàng một kiến)
+        mask -- Mặt nạ các cột khả thi (mỗi hàng có ít nhất một cột khả thi)
+        rng -- Bộ sinh ngẫu nhiên (mặc định là bộ sinh toàn cục của NumPy)
+
+        Trả về:
+        Mảng chỉ số cột được chọn
+        """
+        weights = weights * mask
+        totals = weights.sum(axis=1)
+
+        # Hàng có tổng trọng số bằng 0: chọn đều trên các cột khả thi
+        zero = totals <= 0
+        if zero.any():
+            weights[zero] = mask[zero]
+            totals[zero] = weights[zero].sum(axis=1)
+
+        cumulative = np.cumsum(weights, axis=1)
+        thresholds = rng.random_sample(len(weights)) * totals
+        selected = np.argmax(cumulative > thresholds[:, None], axis=1)
+
+        # Sai số làm tròn có thể khiến ngưỡng bằng tổng: lấy cột khả thi cuối cùng
+        overflow = cumulative[np.arange(len(weights)), selected] <= thresholds
+        if overflow.any():
+            last = weights.shape[1] - 1 - np.argmax(weights[overflow, ::-1] > 0, axis=1)
+            selected[overflow] = last
+        return selected
+
+    def select_next_node(self, current, candidates, rng=np.random):
         """
         Chọn khách hàng tiếp theo dựa trên pheromone và heuristic
 
         Tham số:
         current -- Khách hàng hiện tại
         candidates -- Danh sách các khách hàng tiếp theo có thể chọn
+        rng -- Bộ sinh ngẫu nhiên (mặc định là bộ sinh toàn cục của NumPy)
 
         Trả về:
         Khách hàng tiếp theo được chọn
@@ -328,24 +571,26 @@ class ACO_CVRP:
         if not candidates:
             return None
 
-        # Tính xác suất cho mỗi ứng viên
-        probabilities = np.zeros(len(candidates))
+        # Lấy trọng số của các ứng viên từ hàng choice_info của nút hiện tại
+        cumulative = np.cumsum(self.choice_info[current, candidates])
+        total = cumulative[-1]
 
-        for i, candidate in enumerate(candidates):
-            pheromone = self.pheromone[current, candidate] ** self.alpha
-            heuristic_value = self.heuristic[current, candidate] ** self.beta
-            probabilities[i] = pheromone * heuristic_value
-
-        # Chuẩn hóa xác suất
-        if np.sum(probabilities) > 0:
-            probabilities = probabilities / np.sum(probabilities)
+        # Chọn khách hàng tiếp theo bằng bánh xe roulette trên tổng tích lũy
+        if total > 0:
+            selected = int(np.searchsorted(cumulative, rng.random_sample() * total, side='right'))
+            selected = min(selected, len(candidates) - 1)
         else:
-            probabilities = np.ones(len(candidates)) / len(candidates)
-
-        # Chọn khách hàng tiếp theo dựa trên xác suất
-        selected = np.random.choice(len(candidates), p=probabilities)
+            selected = rng.randint(len(candidates))
         return candidates[selected]
 
+    def update_choice_info(self):
+        """Làm mới ma trận choice_info từ ma trận pheromone hiện tại"""
+        if self.alpha == 1:
+            np.multiply(self.pheromone, self.heuristic_beta, out=self.choice_info)
+        else:
+            np.power(self.pheromone, self.alpha, out=self.choice_info)
+            self.choice_info *= self.heuristic_beta
+
     def update_pheromone(self, solutions, costs):
         """
         Cập nhật ma trận pheromone
@@ -354,8 +599,12 @@ class ACO_CVRP:
         solutions -- Danh sách các giải pháp
         costs -- Danh sách các chi phí tương ứng
         """
-        # Bay hơi pheromone
-        self.pheromone = (1 - self.rho) * self.pheromone
+        # Bay hơi pheromone (tại chỗ, không cấp phát lại ma trận)
+        self.pheromone *= (1 - self.rho)
+
+        # Cạnh của giải pháp tốt nhất toàn cục chỉ trích xuất lại khi giải pháp đó thay đổi
+        if self.best_solution and self.best_edges is None:
+            self.best_edges = self.solution_edges(self.best_solution)
 
         if self.min_max_aco:
             # Trong MIN-MAX ACO, chỉ kiến tốt nhất vòng lặp hoặc tốt nhất toàn cục thả pheromone
@@ -368,18 +617,22 @@ class ACO_CVRP:
 
             # Thả pheromone cho giải pháp tốt nhất toàn cục nếu có
             if self.best_solution:
-                self.deposit_pheromone(self.best_solution, self.best_cost, weight=2.0)
+                self.deposit_edges(self.best_edges, self.deposit_amount(self.best_cost, 2.0))
 
             # Giới hạn pheromone trong khoảng [min_pheromone, max_pheromone]
-            self.pheromone = np.clip(self.pheromone, self.min_pheromone, self.max_pheromone)
+            np.clip(self.pheromone, self.min_pheromone, self.max_pheromone, out=self.pheromone)
         else:
-            # Trong ACO tiêu chuẩn, tất cả kiến thả pheromone
-            for solution, cost in zip(solutions, costs):
-                self.deposit_pheromone(solution, cost)
+            # Trong ACO tiêu chuẩn, tất cả kiến thả pheromone trong một lần cập nhật
+            edges = [self.solution_edges(solution) for solution in solutions]
+            tails = np.concatenate([edge[0] for edge in edges])
+            heads = np.concatenate([edge[1] for edge in edges])
+            deltas = np.repeat([self.deposit_amount(cost) for cost in costs],
+                               [len(edge[0]) for edge in edges])
+            self.deposit_edges((tails, heads), deltas)
 
             # Thả pheromone bổ sung cho giải pháp tốt nhất nếu sử dụng kiến ưu tú
             if self.elitist_ants > 0 and self.best_solution:
-                self.deposit_pheromone(self.best_solution, self.best_cost, weight=self.elitist_ants)
+                self.deposit_edges(self.best_edges, self.deposit_amount(self.best_cost, self.elitist_ants))
 
     def deposit_pheromone(self, solution, cost, weight=1.0):
         """
@@ -390,19 +643,37 @@ class ACO_CVRP:
         cost -- Chi phí của giải pháp
         weight -- Hệ số nhân cho lượng pheromone (mặc định = 1.0)
         """
-        delta = (self.q / cost) * weight if cost > 0 else 0
+        self.deposit_edges(self.solution_edges(solution), self.deposit_amount(cost, weight))
 
-        for route in solution:
-            prev_node = 0  # Bắt đầu từ depot
+    def deposit_amount(self, cost, weight=1.0):
+        """Lượng pheromone thả trên mỗi cạnh của giải pháp có chi phí cost"""
+        return (self.q / cost) * weight if cost > 0 else 0
+
+    def deposit_edges(self, edges, delta):
+        """
+        Cộng lượng pheromone delta lên các cạnh theo cả hai chiều (đồ thị vô hướng)
 
-            for node in route:
-                self.pheromone[prev_node, node] += delta
-                self.pheromone[node, prev_node] += delta  # Đồ thị vô hướng
-                prev_node = node
+        Tham số:
+        edges -- Cặp mảng (đầu, cuối) của các cạnh
+        delta -- Lượng pheromone (một số hoặc mảng, mỗi cạnh một giá trị)
+        """
+        tails, heads = edges
+        np.add.at(self.pheromone, (tails, heads), delta)
+        np.add.at(self.pheromone, (heads, tails), delta)
 
-            # Quay lại depot
-            self.pheromone[prev_node, 0] += delta
-            self.pheromone[0, prev_node] += delta
+    def solution_edges(self, solution):
+        """
+        Trích xuất các cạnh của một giải pháp, kể cả cạnh đi và về depot
+
+        Trả về:
+        Cặp mảng (đầu, cuối) của các cạnh
+        """
+        tour = [0]
+        for route in solution:
+            tour.extend(route)
+            tour.append(0)
+        tour = np.array(tour, dtype=np.intp)
+        return tour[:-1], tour[1:]
 
     def local_search_2opt(self, solution):
         """
@@ -414,19 +685,7 @@ class ACO_CVRP:
         Trả về:
         Giải pháp cải tiến
         """
-        improved_solution = []
-
-        for route in solution:
-            # Bỏ qua các tuyến quá ngắn
-            if len(route) <= 2:
-                improved_solution.append(route)
-                continue
-
-            # Áp dụng 2-opt cho tuyến
-            improved_route = self.apply_2opt(route)
-            improved_solution.append(improved_route)
-
-        return improved_solution
+        return two_opt_solution(solution, self.cvrp.distances)
 
     def apply_2opt(self, route):
         """
@@ -438,33 +697,7 @@ class ACO_CVRP:
         Trả về:
         Tuyến cải tiến
         """
-        if not route or len(route) < 2:
-            return route
-
-        best_route = route.copy()
-        improved = True
-
-        while improved:
-            improved = False
-            best_distance = self.cvrp.calculate_route_distance(best_route)
-
-            for i in range(len(best_route) - 1):
-                for j in range(i + 1, len(best_route)):
-                    if j - i < 1:
-                        continue
-
-                    new_route = best_route[:i+1] + best_route[i+1:j+1][::-1] + best_route[j+1:]
-                    current_distance = self.cvrp.calculate_route_distance(new_route)
-
-                    if current_distance < best_distance:
-                        best_route = new_route
-                        best_distance = current_distance
-                        improved = True
-            
-            if not improved:
-                break
-        
-        return best_route
+        return two_opt_route(route, self.cvrp.distances)
 
     def stop(self):
         """Dừng thuật toán"""
@@ -0,0 +1,125 @@
+"""
+Điều tiết và gộp các lần gọi step_callback của thuật toán
+StepThrottle giới hạn tần suất gọi ở phía thuật toán, LatestValue giữ trạng thái mới nhất cho giao diện
+"""
+
+import threading
+import time
+
+
+class StepThrottle:
+    """
+    Bọc step_callback, chỉ chuyển tiếp một bước khi đã qua đủ every bước và min_interval_ms
+    mili giây kể từ lần chuyển tiếp trước
+
+    Bước bị bỏ qua được giữ lại (chỉ bước mới nhất); flush() ở cuối lần chạy chuyển tiếp
+    bước đó nên bước cuối cùng luôn tới được người nhận. Với every=1 và min_interval_ms=0
+    mọi bước đều được chuyển tiếp như khi gọi trực tiếp.
+
+    Dữ liệu có thể là một hàm không tham số trả về từ điển dữ liệu: hàm chỉ được gọi khi bước
+    được chuyển tiếp, nên các phần tốn kém (vd. bản sao ma trận pheromone) chỉ được tạo cho
+    các bước tới người nhận. Bước bị giữ lại chỉ được flush() ở cuối lần chạy, khi trạng thái
+    của thuật toán vẫn là trạng thái của bước đó.
+    """
+
+    def __init__(self, callback, min_interval_ms=0, every=1, clock=time.monotonic):
+        """
+        Tham số:
+        callback -- Hàm nhận dữ liệu của một bước
+        min_interval_ms -- Khoảng thời gian tối thiểu (ms) giữa hai lần chuyển tiếp
+        every -- Chỉ chuyển tiếp mỗi every bước
+        clock -- Hàm trả về thời gian hiện tại (giây)
+        """
+        self.callback = callback
+        self.min_interval = max(0, min_interval_ms) / 1000.0
+        self.every = max(1, every)
+        self.clock = clock
+        self.steps = 0
+        self.delivered = 0
+        self.last_step = 0
+        self.last_time = None
+        self.pending = None
+
+    def __call__(self, data):
+        """
+        Nhận dữ liệu của một bước
+
+        Tham số:
+        data -- Từ điển dữ liệu, hoặc hàm không tham số trả về từ điển đó
+
+        Trả về:
+        Kết quả của callback nếu bước được chuyển tiếp, None nếu bước được giữ lại
+        """
+        self.steps += 1
+        now = self.clock()
+        if (self.steps - self.last_step >= self.every
+                and (self.last_time is None or now - self.last_time >= self.min_interval)):
+            return self.deliver(data, now)
+
+        self.pending = data
+        return None
+
+    def deliver(self, data, now=None):
+        """Chuyển tiếp dữ liệu ngay lập tức"""
+        self.pending = None
+        self.last_step = self.steps
+        self.last_time = self.clock() if now is None else now
+        self.delivered += 1
+        return self.callback(data() if callable(data) else data)
+
+    def flush(self):
+        """Chuyển tiếp bước đang bị giữ lại (nếu có) và trả về kết quả của callback"""
+        if self.pending is None:
+            return None
+        return self.deliver(self.pending)
+
+
+def throttle_callback(callback, min_interval_ms=0, every=1):
+    """
+    Bọc step_callback bằng StepThrottle
+
+    Trả về:
+    StepThrottle, hoặc None nếu callback là None
+    """
+    if callback is None:
+        return None
+    return StepThrottle(callback, min_interval_ms, every)
+
+
+class LatestValue:
+    """
+    Bộ đệm một chỗ, an toàn giữa các luồng: giá trị mới ghi đè giá trị chưa được đọc
+
+    Luồng thuật toán gọi put() sau mỗi bước và chỉ cần lên lịch xử lý (vd. root.after) khi
+    put() trả về True; luồng giao diện gọi take() và chỉ thấy trạng thái mới nhất, nên hàng
+    đợi sự kiện không bị dồn khi thuật toán chạy nhanh hơn tốc độ vẽ.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.value = None
+        self.has_value = False
+        self.dropped = 0
+
+    def put(self, value):
+        """
+        Ghi giá trị mới nhất
+
+        Trả về:
+        True nếu bộ đệm đang trống (người gọi cần lên lịch một lần take())
+        """
+        with self.lock:
+            was_empty = not self.has_value
+            if not was_empty:
+                self.dropped += 1
+            self.value = value
+            self.has_value = True
+            return was_empty
+
+    def take(self):
+        """Lấy và xóa giá trị mới nhất (None nếu bộ đệm trống)"""
+        with self.lock:
+            value = self.value
+            self.value = None
+            self.has_value = False
+            return value
@@ -4,13 +4,14 @@ Defines the CVRP problem and its components
 """
 
 import numpy as np
-import math
 import random
 import json
 
 
 class Customer:
     """Class representing a customer in the CVRP problem"""
+    __slots__ = ('id', 'x', 'y', 'demand')
+
     def __init__(self, id, x, y, demand):
         self.id = id
         self.x = x
@@ -26,16 +27,74 @@ class CVRP:
         self.depot = None    # The depot
         self.capacity = capacity  # Vehicle capacity
         self.distances = None  # Distance matrix
+        self.distance_dtype = np.float64  # dtype of the distance matrix (float32 halves memory)
+
+        # Struct-of-arrays mirror of self.customers, indexed like the customer list.
+        # Built on first access and dropped whenever a customer is added.
+        self._xs = None
+        self._ys = None
+        self._demands = None
+        self.neighbor_lists = {}  # Cache of k-nearest-neighbor lists keyed by k
+
+    @property
+    def xs(self):
+        """Customer x coordinates"""
+        if self._xs is None:
+            self.build_arrays()
+        return self._xs
+
+    @xs.setter
+    def xs(self, values):
+        self._xs = values
+
+    @property
+    def ys(self):
+        """Customer y coordinates"""
+        if self._ys is None:
+            self.build_arrays()
+        return self._ys
+
+    @ys.setter
+    def ys(self, values):
+        self._ys = values
+
+    @property
+    def demands(self):
+        """Customer demands (0 for the depot)"""
+        if self._demands is None:
+            self.build_arrays()
+        return self._demands
+
+    @demands.setter
+    def demands(self, values):
+        self._demands = values
+
+    def clear_arrays(self):
+        """Drop the array mirror so it is rebuilt from the customer list on next access"""
+        self._xs = self._ys = self._demands = None
 
     def add_depot(self, x, y):
         """Add a depot to the problem"""
         self.depot = Customer(0, x, y, 0)
         self.customers.append(self.depot)
+        self.clear_arrays()
 
     def add_customer(self, id, x, y, demand):
         """Add a customer to the problem"""
         customer = Customer(id, x, y, demand)
         self.customers.append(customer)
+        self.clear_arrays()
+
+    @classmethod
+    def from_arrays(cls, distances, demands, capacity):
+        """Create a problem from a distance matrix and demand array only (customers get no coordinates)"""
+        cvrp = cls(capacity)
+        cvrp.customers = [Customer(i, 0.0, 0.0, demand) for i, demand in enumerate(np.asarray(demands).tolist())]
+        cvrp.depot = cvrp.customers[0]
+        cvrp.demands = np.asarray(demands)
+        cvrp.distances = distances
+        cvrp.distance_dtype = distances.dtype
+        return cvrp
 
     def load_problem(self, num_customers, capacity, seed=None):
         """Create a random CVRP problem"""
@@ -65,21 +124,25 @@ class CVRP:
             with open(filename, 'r') as f:
                 data = json.load(f)
 
-                self.capacity = data['capacity']
-                self.customers = []
-
-                depot = data['depot']
-                self.add_depot(depot['x'], depot['y'])
-
-                for c in data['customers']:
-                    self.add_customer(c['id'], c['x'], c['y'], c['demand'])
-
-                self.calculate_distances()
-                return True
+            self.load_from_dict(data)
+            return True
         except Exception as e:
             print(f"Error reading file: {e}")
             return False
 
+    def load_from_dict(self, data):
+        """Load CVRP problem from a dict with 'capacity', 'depot' and 'customers' (the JSON file layout)"""
+        self.capacity = data['capacity']
+        self.customers = []
+
+        depot = data['depot']
+        self.add_depot(depot['x'], depot['y'])
+
+        for c in data['customers']:
+            self.add_customer(c['id'], c['x'], c['y'], c['demand'])
+
+        self.calculate_distances()
+
     def save_to_file(self, filename):
         """Save CVRP problem to a file"""
         try:
@@ -106,17 +169,69 @@ class CVRP:
             print(f"Error saving file: {e}")
             return False
 
-    def calculate_distances(self):
-        """Calculate distance matrix between customers"""
+    def build_arrays(self):
+        """Build contiguous coordinate and demand arrays from the customer list"""
+        self.xs = np.array([c.x for c in self.customers], dtype=np.float64)
+        self.ys = np.array([c.y for c in self.customers], dtype=np.float64)
+        self.demands = np.array([c.demand for c in self.customers])
+
+    def calculate_distances(self, dtype=None, block_size=1024):
+        """Calculate distance matrix between customers
+
+        The upper triangle is computed block by block with NumPy broadcasting
+        and mirrored into the lower triangle, so each pair is computed once and
+        peak temporary memory stays at block_size x n.
+        """
+        if dtype is not None:
+            self.distance_dtype = dtype
+
+        self.build_arrays()
+        xs, ys = self.xs, self.ys
+        n = len(xs)
+        self.distances = np.zeros((n, n), dtype=self.distance_dtype)
+
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            dx = xs[start:stop, None] - xs[None, start:]
+            dy = ys[start:stop, None] - ys[None, start:]
+            block = np.hypot(dx, dy)
+            self.distances[start:stop, start:] = block
+            self.distances[start:, start:stop] = block.T
+
+        self.neighbor_lists = {}
+
+    def get_neighbors(self, k=20):
+        """Return the cached k-nearest-neighbor lists, building them on first use
+
+        Row i holds the k customers closest to node i (row 0 is the depot),
+        nearest first. The depot and the node itself are never neighbors.
+        """
+        k = max(0, min(k, len(self.customers) - 2))
+        if k not in self.neighbor_lists:
+            self.neighbor_lists[k] = self.build_neighbor_lists(k)
+        return self.neighbor_lists[k]
+
+    def build_neighbor_lists(self, k, block_size=1024):
+        """Build sorted k-nearest-neighbor lists with argpartition, one row block at a time"""
         n = len(self.customers)
-        self.distances = np.zeros((n, n))
+        neighbors = np.zeros((n, k), dtype=np.int32)
+        if k == 0:
+            return neighbors
+
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            block = self.distances[start:stop].astype(np.float64)
+            block[:, 0] = np.inf  # The depot is not a candidate
+            block[np.arange(stop - start), np.arange(start, stop)] = np.inf
+
+            if k < n - 2:
+                idx = np.argpartition(block, k - 1, axis=1)[:, :k]
+            else:
+                idx = np.tile(np.arange(n), (stop - start, 1))
+            order = np.argsort(np.take_along_axis(block, idx, axis=1), axis=1, kind='stable')
+            neighbors[start:stop] = np.take_along_axis(idx, order, axis=1)[:, :k]
 
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    xi, yi = self.customers[i].x, self.customers[i].y
-                    xj, yj = self.customers[j].x, self.customers[j].y
-                    self.distances[i, j] = math.sqrt((xi - xj) ** 2 + (yi - yj) ** 2)
+        return neighbors
 
     def calculate_route_distance(self, route):
         """Calculate the distance of a route"""
@@ -137,7 +252,7 @@ class CVRP:
 
     def calculate_route_demand(self, route):
         """Calculate the total demand of a route"""
-        return sum(self.customers[i].demand for i in route)
+        return self.demands[list(route)].sum().item()
 
     def calculate_solution_cost(self, solution):
         """Calculate the total distance of a solution (list of routes)"""
@@ -5,7 +5,56 @@ Thuật toán Di truyền cải tiến cho bài toán CVRP (Capacitated Vehicle
 import numpy as np
 import random
 import time
+import heapq
 import threading
+import multiprocessing
+from collections import OrderedDict
+
+from .callbacks import throttle_callback
+from .cvrp import CVRP
+from .history import RunHistory
+from .islands import island_sizes, island_worker, migration_sources
+from .local_search import two_opt_route, two_opt_solution
+from .population import (
+    random_population, segment_bounds, tournament_select, roulette_select, rank_select,
+    ordered_crossover_rows, partially_mapped_crossover_rows, cycle_crossover_rows,
+    swap_mutation_rows, insert_mutation_rows, inversion_mutation_rows, scramble_mutation_rows,
+    hamming_diversity, sampled_hamming_diversity,
+)
+from .savings import clarke_wright_savings, solution_to_chromosome
+from .split import routes_from_labels, split_state
+
+
+# Số khách hàng tối thiểu để decoder='auto' chọn Split thay cho chèn rẻ nhất
+SPLIT_DECODER_MIN_CUSTOMERS = 100
+
+# Số cá thể tối đa giữ trong bộ nhớ đệm độ thích nghi (LRU) mặc định
+DEFAULT_FITNESS_CACHE_SIZE = 1024
+
+# GA chỉ dùng để giải mã trong mỗi tiến trình con khi đánh giá quần thể song song
+_worker_ga = None
+
+
+def _init_fitness_worker(distances, demands, capacity, decoder):
+    """
+    Khởi tạo tiến trình con một lần với dữ liệu cần cho việc giải mã
+
+    Tham số:
+    distances -- Ma trận khoảng cách
+    demands -- Mảng nhu cầu (chỉ số 0 là depot)
+    capacity -- Sức chứa của xe
+    decoder -- Cách giải mã đã chọn ('insertion' hoặc 'split')
+    """
+    global _worker_ga
+    cvrp = CVRP.from_arrays(distances, demands, capacity)
+    _worker_ga = GeneticAlgorithm_CVRP(cvrp, decoder=decoder, fitness_cache_size=0)
+    # Tiến trình con không nhận gợi ý cha mẹ nên trạng thái Split không bao giờ được dùng lại
+    _worker_ga.cache_split_states = False
+
+
+def _evaluate_task(chromosome):
+    """Giải mã và đánh giá một nhiễm sắc thể trong tiến trình con"""
+    return _worker_ga.decode_and_evaluate(chromosome)
 
 
 class GeneticAlgorithm_CVRP:
@@ -13,7 +62,12 @@ class GeneticAlgorithm_CVRP:
 
     def __init__(self, cvrp, population_size=50, mutation_rate=0.1, crossover_rate=0.8, elitism=5, max_generations=100,
                  selection_method="tournament", crossover_method="ordered", mutation_method="swap",
-                 tournament_size=3, early_stopping=None, local_search=False):
+                 tournament_size=3, early_stopping=None, local_search=False, savings_seeding=False,
+                 decoder="auto", fitness_cache_size=DEFAULT_FITNESS_CACHE_SIZE,
+                 representation="list", diversity_interval=1, diversity_sample_pairs=None, workers=0,
+                 islands=0, migration_interval=10, migration_size=2, migration_topology="ring",
+                 engine="generational", replacement="worst", report_interval=None,
+                 include_population=False, callback_interval_ms=0, callback_every=1):
         """
         Khởi tạo Thuật toán Di truyền cho CVRP
 
@@ -30,7 +84,34 @@ class GeneticAlgorithm_CVRP:
         tournament_size -- Kích thước tournament (chỉ dùng khi selection_method là 'tournament')
         early_stopping -- Số thế hệ không cải thiện để dừng sớm (None nếu không dùng)
         local_search -- Sử dụng tìm kiếm cục bộ
+        savings_seeding -- Gieo một cá thể từ giải pháp savings (Clarke-Wright) vào quần thể ban đầu
+        decoder -- Cách giải mã nhiễm sắc thể ('insertion': chèn rẻ nhất, 'split': Split của Prins,
+                   'auto': Split khi có từ SPLIT_DECODER_MIN_CUSTOMERS khách hàng trở lên)
+        fitness_cache_size -- Số nhiễm sắc thể tối đa trong bộ nhớ đệm độ thích nghi LRU (0 = tắt)
+        representation -- Cách lưu quần thể ('list': danh sách các list, 'array': ma trận NumPy int32
+                          với các toán tử xử lý theo hàng)
+        diversity_interval -- Tính độ đa dạng mỗi bao nhiêu thế hệ (các thế hệ khác giữ giá trị gần nhất)
+        diversity_sample_pairs -- Số cặp cá thể lấy mẫu để ước lượng độ đa dạng (None = tính chính xác)
+        workers -- Số tiến trình đánh giá quần thể song song (0 hoặc 1 = chạy tuần tự)
+        islands -- Số đảo (quần thể con) tiến hóa trong các tiến trình riêng (0 hoặc 1 = không dùng
+                   mô hình đảo; khi dùng, workers được bỏ qua)
+        migration_interval -- Số thế hệ giữa hai lần di cư
+        migration_size -- Số cá thể tốt nhất mỗi đảo gửi đi trong một lần di cư
+        migration_topology -- Cấu trúc di cư ('ring': vòng, 'random': đảo nguồn ngẫu nhiên)
+        engine -- Cách tiến hóa ('generational': thay cả quần thể mỗi thế hệ, 'steady_state': mỗi
+                  bước tạo hai con và thay trực tiếp vào quần thể; không dùng cùng mô hình đảo)
+        replacement -- Cá thể bị thay ở chế độ steady_state ('worst': kém nhất, 'similar': giống con
+                       nhất trong tournament_size cá thể ngẫu nhiên)
+        report_interval -- Số con được tạo giữa hai lần ghi thống kê và gọi step_callback ở chế độ
+                           steady_state (None = population_size, tức một "thế hệ")
+        include_population -- Gửi kèm bản sao quần thể trong dữ liệu của step_callback (tốn O(kích
+                              thước quần thể x số khách hàng) mỗi bước; mặc định không gửi)
+        callback_interval_ms -- Khoảng thời gian tối thiểu (ms) giữa hai lần gọi step_callback
+        callback_every -- Chỉ gọi step_callback mỗi callback_every lần báo cáo (lần cuối luôn được gọi)
         """
+        if engine == "steady_state" and representation == "array":
+            raise ValueError("engine='steady_state' chỉ hỗ trợ representation='list'")
+
         self.cvrp = cvrp
         self.population_size = population_size
         self.mutation_rate = mutation_rate
@@ -43,10 +124,34 @@ class GeneticAlgorithm_CVRP:
         self.tournament_size = tournament_size
         self.early_stopping = early_stopping
         self.local_search = local_search
+        self.savings_seeding = savings_seeding
+        self.fitness_cache_size = fitness_cache_size
+        self.representation = representation
+        self.diversity_interval = max(1, diversity_interval)
+        self.diversity_sample_pairs = diversity_sample_pairs
+        self.workers = workers
+        self.islands = islands
+        self.migration_interval = max(1, migration_interval)
+        self.migration_size = migration_size
+        self.migration_topology = migration_topology
+        self.engine = engine
+        self.replacement = replacement
+        self.report_interval = report_interval
+        self.include_population = include_population
+        self.callback_interval_ms = callback_interval_ms
+        self.callback_every = callback_every
 
         # Số lượng khách hàng
         self.n = len(cvrp.customers)
 
+        if decoder == "auto":
+            decoder = "split" if self.n - 1 >= SPLIT_DECODER_MIN_CUSTOMERS else "insertion"
+        self.decoder = decoder
+
+        # Nhu cầu của khách hàng dạng list (lấy từ mảng cvrp.demands), tra cứu vô hướng
+        # trong các vòng lặp Python nhanh hơn so với truy cập thuộc tính Customer
+        self.demands = cvrp.demands.tolist()
+
         # Lưu kết quả
         self.best_solution = None
         self.best_cost = float('inf')
@@ -62,6 +167,31 @@ class GeneticAlgorithm_CVRP:
         self.worst_cost_history = []
         self.diversity_history = []
 
+        # Truy cập lịch sử cho step_callback, không sao chép các danh sách ở mỗi thế hệ
+        self.history = RunHistory(self, ('cost_history', 'avg_cost_history', 'worst_cost_history',
+                                         'diversity_history', 'time_history'))
+
+        # Bộ nhớ đệm LRU: nhiễm sắc thể -> (độ thích nghi, giải pháp đã giải mã)
+        # cache_hits đếm các lần dùng lại kết quả đã có (trong bộ nhớ đệm hoặc của nhiễm sắc thể
+        # trùng trong cùng lô), cache_misses đếm các lần phải giải mã, kể cả khi bộ nhớ đệm tắt
+        self.fitness_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Bộ sinh số ngẫu nhiên riêng cho ước lượng độ đa dạng, không làm lệch chuỗi ngẫu nhiên
+        # của quá trình tiến hóa
+        self.diversity_rng = np.random.RandomState(0)
+
+        # Trạng thái Split của các cá thể trong quần thể hiện tại và, cho mỗi con mới, cặp (cha/mẹ
+        # gốc, vị trí đầu tiên có thể khác cha/mẹ đó) do toán tử lai ghép/đột biến cho biết, để giải
+        # mã con chỉ từ vị trí đó (chỉ dùng với decoder 'split')
+        self.split_states = {}
+        self.parent_hints = {}
+        self.cache_split_states = True
+
+        # (cha/mẹ gốc, vị trí đầu tiên có thể khác) của hai con do lần lai ghép gần nhất tạo ra
+        self.offspring_origins = None
+
         # Cờ dừng, tạm dừng và biến stagnation
         self.stop_flag = False
         self.paused = False
@@ -69,6 +199,23 @@ class GeneticAlgorithm_CVRP:
         self.stagnation_count = 0
         self.was_stopped = False
 
+        # Nhóm tiến trình con đánh giá độ thích nghi (chỉ tồn tại trong lúc chạy)
+        self.pool = None
+
+    def __getstate__(self):
+        """Trạng thái gửi sang tiến trình con: bỏ bộ nhớ đệm, nhóm tiến trình và đối tượng đồng bộ"""
+        state = self.__dict__.copy()
+        state['pause_condition'] = None
+        state['pool'] = None
+        state['fitness_cache'] = OrderedDict()
+        state['split_states'] = {}
+        state['parent_hints'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.pause_condition = threading.Condition()
+
     def run(self, callback=None, step_callback=None):
         """
         Chạy Thuật toán Di truyền
@@ -87,9 +234,66 @@ class GeneticAlgorithm_CVRP:
         self.worst_cost_history = []
         self.diversity_history = []
         self.stagnation_count = 0
+        self.fitness_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.diversity_rng = np.random.RandomState(0)
+        self.split_states = {}
+        self.parent_hints = {}
+
+        # Điều tiết step_callback; thế hệ cuối bị giữ lại được gửi bằng flush()
+        step_callback = throttle_callback(step_callback, self.callback_interval_ms, self.callback_every)
+
+        self.start_workers()
+        try:
+            if self.islands > 1:
+                self.run_islands(step_callback)
+            elif self.engine == "steady_state":
+                self.run_steady_state(step_callback)
+            else:
+                self.run_generations(step_callback)
+        finally:
+            self.shutdown_workers()
 
-        # Khởi tạo quần thể
-        population = self.initialize_population()
+        if step_callback:
+            step_callback.flush()
+
+        # Đảm bảo giải pháp tốt nhất cuối cùng là hợp lệ và khả thi
+        if self.best_solution:
+            if not self.cvrp.is_solution_valid(self.best_solution) or not self.check_solution_feasibility(self.best_solution):
+                self.best_solution = self.repair_solution(self.best_solution)
+                # Kiểm tra lại tính khả thi
+                if not self.check_solution_feasibility(self.best_solution):
+                    # Nếu vẫn không khả thi, chia thành các tuyến riêng biệt
+                    new_solution = []
+                    for route in self.best_solution:
+                        for customer in route:
+                            new_solution.append([customer])
+                    self.best_solution = new_solution
+                self.best_cost = self.cvrp.calculate_solution_cost(self.best_solution)
+
+        # Kết thúc - gọi callback nếu có
+        if callback:
+            callback((self.best_solution, self.best_cost))
+
+        return self.best_solution, self.best_cost
+
+    def run_generations(self, step_callback=None):
+        """
+        Vòng lặp chính của Thuật toán Di truyền
+
+        Tham số:
+        step_callback -- Hàm gọi lại sau mỗi thế hệ
+        """
+        diversity = 0
+
+        # Khởi tạo quần thể; evaluations[i] là (độ thích nghi, giải pháp) của population[i]
+        # hoặc None nếu cá thể chưa được đánh giá
+        if self.representation == "array":
+            population = self.initialize_population_array()
+        else:
+            population = self.initialize_population()
+        evaluations = [None] * len(population)
 
         # Vòng lặp chính
         for generation in range(self.max_generations):
@@ -106,214 +310,486 @@ class GeneticAlgorithm_CVRP:
             # Bắt đầu tính thời gian tính toán thuần túy
             start_time = time.time()
 
-            # Đánh giá quần thể
-            fitness_values = [self.evaluate_fitness(individual) for individual in population]
-            best_idx = np.argmin(fitness_values)
-            current_best_solution = self.decode_chromosome_with_feasibility_check(population[best_idx])
-            current_best_cost = fitness_values[best_idx]
-
-            # Kiểm tra và sửa chữa giải pháp tốt nhất nếu cần
-            if not self.cvrp.is_solution_valid(current_best_solution) or not self.check_solution_feasibility(current_best_solution):
-                current_best_solution = self.repair_solution(current_best_solution)
-                # Đảm bảo tính khả thi của giải pháp đã sửa chữa
-                if not self.check_solution_feasibility(current_best_solution):
-                    # Nếu vẫn không khả thi, chia thành các tuyến riêng biệt
-                    new_solution = []
-                    for route in current_best_solution:
-                        for customer in route:
-                            new_solution.append([customer])
-                    current_best_solution = new_solution
-                # Cập nhật lại chi phí
-                current_best_cost = self.cvrp.calculate_solution_cost(current_best_solution)
-            
-            # Áp dụng tìm kiếm cục bộ nếu được kích hoạt
-            if self.local_search and current_best_solution:
-                improved_solution = self.local_search_2opt(current_best_solution)
-                # Cập nhật lại chi phí sau khi áp dụng tìm kiếm cục bộ
-                improved_cost = self.cvrp.calculate_solution_cost(improved_solution)
-                if improved_cost < current_best_cost:
-                    current_best_solution = improved_solution
-                    current_best_cost = improved_cost
-
-            # Cập nhật giải pháp tốt nhất
-            if current_best_cost < self.best_cost:
-                self.best_solution = current_best_solution
-                self.best_cost = current_best_cost
-                self.stagnation_count = 0
-            else:
-                self.stagnation_count += 1
+            # Đánh giá quần thể (cá thể ưu tú mang theo kết quả từ thế hệ trước)
+            evaluations = self.evaluate_population(population, evaluations)
+            fitness_values = [fitness for fitness, _ in evaluations]
+            current_best_solution, current_best_cost = self.generation_best(evaluations, fitness_values)
 
             # Tính toán các thống kê
             avg_cost = sum(fitness_values) / len(fitness_values)
             worst_cost = max(fitness_values)
-            diversity = self.calculate_diversity(population)
-
-            # Lưu lịch sử
-            self.cost_history.append(self.best_cost)
-            self.avg_cost_history.append(avg_cost)
-            self.worst_cost_history.append(worst_cost)
-            self.diversity_history.append(diversity)
-
-            # Lưu thời gian và kết thúc đo thời gian tính toán thuần túy
-            end_time = time.time()
-            computation_time = end_time - start_time
-            self.time_history.append(computation_time)
-
-            # Gọi hàm callback cho mỗi bước và truyền thời gian tính toán thuần túy
-            if step_callback:
-                self.current_solution = current_best_solution
-                self.current_cost = current_best_cost
-
-                step_data = {
-                    'generation': generation,
-                    'progress': (generation + 1) / self.max_generations,
-                    'solution': self.current_solution,
-                    'cost': self.current_cost,
-                    'best_solution': self.best_solution,
-                    'best_cost': self.best_cost,
-                    'avg_cost': avg_cost,
-                    'worst_cost': worst_cost,
-                    'diversity': diversity,
-                    'population': population.copy(),
-                    'fitness_values': fitness_values.copy(),
-                    'cost_history': self.cost_history.copy(),
-                    'avg_cost_history': self.avg_cost_history.copy(),
-                    'worst_cost_history': self.worst_cost_history.copy(),
-                    'diversity_history': self.diversity_history.copy(),
-                    'time_history': self.time_history.copy(),
-                    'stagnation': self.stagnation_count,
-                    'computation_time': computation_time,  # Thời gian tính toán thuần túy
-                }
-                step_callback(step_data)
+            if generation % self.diversity_interval == 0:
+                diversity = self.calculate_diversity(population)
+
+            # Kết thúc đo thời gian tính toán thuần túy
+            computation_time = time.time() - start_time
+
+            self.record_generation(generation, current_best_solution, current_best_cost, avg_cost, worst_cost,
+                                   diversity, population, fitness_values, computation_time, step_callback)
 
             # Kiểm tra dừng sớm
             if self.early_stopping and self.stagnation_count >= self.early_stopping:
                 break
 
             # Tạo quần thể mới
-            new_population = []
-
-            # Elitism - giữ lại các cá thể tốt nhất
-            sorted_indices = np.argsort(fitness_values)
-            for i in range(self.elitism):
-                new_population.append(population[sorted_indices[i]])
-
-            # Tạo cá thể mới cho quần thể tiếp theo
-            while len(new_population) < self.population_size:
-                # Chọn lọc
-                if self.selection_method == "tournament":
-                    parent1 = self.tournament_selection(population, fitness_values)
-                    parent2 = self.tournament_selection(population, fitness_values)
-                elif self.selection_method == "roulette":
-                    parent1 = self.roulette_wheel_selection(population, fitness_values)
-                    parent2 = self.roulette_wheel_selection(population, fitness_values)
-                elif self.selection_method == "rank":
-                    parent1 = self.rank_selection(population, fitness_values)
-                    parent2 = self.rank_selection(population, fitness_values)
-                else:  # Mặc định tournament
-                    parent1 = self.tournament_selection(population, fitness_values)
-                    parent2 = self.tournament_selection(population, fitness_values)
-
-                # Lai ghép
-                if random.random() < self.crossover_rate:
-                    if self.crossover_method == "ordered":
-                        child1, child2 = self.ordered_crossover(parent1, parent2)
-                    elif self.crossover_method == "partially_mapped":
-                        child1, child2 = self.partially_mapped_crossover(parent1, parent2)
-                    elif self.crossover_method == "cycle":
-                        child1, child2 = self.cycle_crossover(parent1, parent2)
-                    else:  # Mặc định ordered
-                        child1, child2 = self.ordered_crossover(parent1, parent2)
+            if self.representation == "array":
+                population, evaluations = self.breed_population_array(population, evaluations, fitness_values)
+            else:
+                population, evaluations = self.breed_population(population, evaluations, fitness_values)
+
+    def run_islands(self, step_callback=None):
+        """
+        Vòng lặp chính của mô hình đảo
+
+        Các đảo tiến hóa song song migration_interval thế hệ mỗi chu kỳ, sau đó mỗi đảo nhận
+        migration_size cá thể tốt nhất từ đảo nguồn theo migration_topology. Thống kê của từng
+        thế hệ được gộp từ mọi đảo và báo qua step_callback như khi chạy một quần thể.
+
+        Tham số:
+        step_callback -- Hàm gọi lại sau mỗi thế hệ
+        """
+        sizes = island_sizes(self.population_size, min(self.islands, self.population_size))
+        base_seed = int(np.random.randint(2 ** 31))
+        migration_rng = np.random.RandomState(base_seed)
+
+        # Dùng 'spawn' vì thuật toán thường chạy trong luồng nền của giao diện
+        context = multiprocessing.get_context("spawn")
+        connections = []
+        processes = []
+        try:
+            for island, size in enumerate(sizes):
+                seed = int(np.random.SeedSequence([base_seed, island]).generate_state(1)[0])
+                parent_end, child_end = context.Pipe()
+                process = context.Process(target=island_worker, args=(self, island, size, seed, child_end),
+                                          daemon=True)
+                process.start()
+                child_end.close()
+                connections.append(parent_end)
+                processes.append(process)
+
+            immigrants = [[] for _ in sizes]
+            generation = 0
+            finished = False
+            while generation < self.max_generations and not finished:
+                # Kiểm tra dừng
+                if self.stop_flag:
+                    self.was_stopped = True
+                    break
+
+                # Kiểm tra tạm dừng
+                with self.pause_condition:
+                    while self.paused and not self.stop_flag:
+                        self.pause_condition.wait()
+
+                # Các đảo tiến hóa song song trong một chu kỳ di cư
+                generations = min(self.migration_interval, self.max_generations - generation)
+                for connection, island_immigrants in zip(connections, immigrants):
+                    connection.send((generations, island_immigrants))
+                results = [connection.recv() for connection in connections]
+
+                # Gộp thống kê các đảo theo từng thế hệ
+                for step in range(generations):
+                    records = [island_records[step] for island_records, _ in results]
+                    best = min(records, key=lambda record: record['cost'])
+                    fitness_values = [fitness for record in records for fitness in record['fitness_values']]
+                    avg_cost = sum(fitness_values) / len(fitness_values)
+                    worst_cost = max(fitness_values)
+                    diversity = sum(record['diversity'] for record in records) / len(records)
+                    computation_time = max(record['computation_time'] for record in records)
+                    self.cache_hits = sum(record['cache_hits'] for record in records)
+                    self.cache_misses = sum(record['cache_misses'] for record in records)
+
+                    self.record_generation(generation, best['solution'], best['cost'], avg_cost, worst_cost,
+                                           diversity, None, fitness_values, computation_time, step_callback)
+                    generation += 1
+
+                    # Kiểm tra dừng sớm
+                    if self.early_stopping and self.stagnation_count >= self.early_stopping:
+                        finished = True
+                        break
+
+                # Di cư: mỗi đảo nhận các cá thể tốt nhất của đảo nguồn
+                sources = migration_sources(len(sizes), self.migration_topology, migration_rng)
+                immigrants = [results[source][1] for source in sources]
+        finally:
+            for connection in connections:
+                try:
+                    connection.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                connection.close()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+    def run_steady_state(self, step_callback=None):
+        """
+        Vòng lặp của biến thể steady-state
+
+        Mỗi bước tạo hai con; con không trùng với cá thể đã có được đánh giá ngay và thay cho
+        cá thể bị chọn theo replacement nếu tốt hơn nó. Cá thể kém nhất được tìm bằng max-heap
+        (xóa lười các mục đã cũ) nên không phải sắp xếp lại quần thể. Tổng số con tạo ra bằng
+        max_generations * population_size; thống kê được ghi, step_callback được gọi và điều kiện
+        dừng sớm được kiểm tra sau mỗi report_interval con được tạo (kể cả khi không con nào được
+        nhận vào quần thể) và ở bước cuối cùng. Trạng thái Split chỉ được giữ cho các cá thể
+        đang có trong quần thể.
+
+        Tham số:
+        step_callback -- Hàm gọi lại sau mỗi lần báo cáo
+        """
+        population = self.initialize_population()
+        evaluations = self.evaluate_population(population, [None] * len(population))
+        fitness_values = [fitness for fitness, _ in evaluations]
+        size = len(population)
+
+        # Số lần xuất hiện của từng nhiễm sắc thể để loại con trùng lặp
+        members = {}
+        for individual in population:
+            key = tuple(individual)
+            members[key] = members.get(key, 0) + 1
+
+        # Max-heap theo độ thích nghi; versions[i] tăng mỗi khi vị trí i bị thay
+        versions = [0] * size
+        heap = [(-fitness, 0, i) for i, fitness in enumerate(fitness_values)]
+        heapq.heapify(heap)
+        best_index = int(np.argmin(fitness_values))
+
+        total_offspring = self.max_generations * self.population_size
+        report_interval = self.report_interval or self.population_size
+        produced = 0
+        report = 0
+        diversity = 0
+        start_time = time.time()
+
+        while produced < total_offspring:
+            # Kiểm tra dừng
+            if self.stop_flag:
+                self.was_stopped = True
+                break
+
+            # Kiểm tra tạm dừng
+            with self.pause_condition:
+                while self.paused and not self.stop_flag:
+                    self.pause_condition.wait()
+
+            previous_reports = produced // report_interval
+            for child in self.make_offspring(population, fitness_values)[:total_offspring - produced]:
+                produced += 1
+                key = tuple(child)
+                if key in members:
+                    continue
+
+                entry = self.evaluate(child)
+                if self.replacement == "similar":
+                    victim = self.similar_individual(child, population, best_index)
                 else:
-                    child1, child2 = parent1.copy(), parent2.copy()
-                
-                # Kiểm tra và sửa chữa nhiễm sắc thể sau khi lai ghép
-                child1 = self.check_and_repair_chromosomes(child1)
-                child2 = self.check_and_repair_chromosomes(child2)
-                
-                # Kiểm tra tính khả thi của giải pháp sau khi lai ghép
-                solution1 = self.decode_chromosome(child1)
-                solution2 = self.decode_chromosome(child2)
-                
-                if not self.check_solution_feasibility(solution1):
-                    # Giải pháp không khả thi, cần sửa chữa
-                    # Sử dụng lại phương pháp decode có kiểm tra khả thi
-                    solution1 = self.decode_chromosome_with_feasibility_check(child1)
-                
-                if not self.check_solution_feasibility(solution2):
-                    # Giải pháp không khả thi, cần sửa chữa
-                    solution2 = self.decode_chromosome_with_feasibility_check(child2)
-
-                # Đột biến
-                if random.random() < self.mutation_rate:
-                    if self.mutation_method == "swap":
-                        self.swap_mutation(child1)
-                    elif self.mutation_method == "insert":
-                        self.insert_mutation(child1)
-                    elif self.mutation_method == "inversion":
-                        self.inversion_mutation(child1)
-                    elif self.mutation_method == "scramble":
-                        self.scramble_mutation(child1)
-                    else:  # Mặc định swap
-                        self.swap_mutation(child1)
-                    
-                    # Kiểm tra và sửa chữa sau khi đột biến
-                    child1 = self.check_and_repair_chromosomes(child1)
-                    
-                    # Kiểm tra tính khả thi sau đột biến
-                    solution1 = self.decode_chromosome(child1)
-                    if not self.check_solution_feasibility(solution1):
-                        # Giải pháp không khả thi, cần sửa chữa
-                        solution1 = self.decode_chromosome_with_feasibility_check(child1)
-
-                if random.random() < self.mutation_rate:
-                    if self.mutation_method == "swap":
-                        self.swap_mutation(child2)
-                    elif self.mutation_method == "insert":
-                        self.insert_mutation(child2)
-                    elif self.mutation_method == "inversion":
-                        self.inversion_mutation(child2)
-                    elif self.mutation_method == "scramble":
-                        self.scramble_mutation(child2)
-                    else:  # Mặc định swap
-                        self.swap_mutation(child2)
-                    
-                    # Kiểm tra và sửa chữa sau khi đột biến
-                    child2 = self.check_and_repair_chromosomes(child2)
-                    
-                    # Kiểm tra tính khả thi sau đột biến
-                    solution2 = self.decode_chromosome(child2)
-                    if not self.check_solution_feasibility(solution2):
-                        # Giải pháp không khả thi, cần sửa chữa
-                        solution2 = self.decode_chromosome_with_feasibility_check(child2)
+                    # Bỏ các mục đã cũ ở đỉnh heap
+                    while heap[0][1] != versions[heap[0][2]]:
+                        heapq.heappop(heap)
+                    victim = heap[0][2]
+                if entry[0] >= fitness_values[victim]:
+                    self.split_states.pop(key, None)
+                    continue
 
-                # Thêm vào quần thể mới
-                new_population.append(child1)
-                if len(new_population) < self.population_size:
-                    new_population.append(child2)
+                # Thay cá thể bị chọn bằng con
+                old_key = tuple(population[victim])
+                members[old_key] -= 1
+                if not members[old_key]:
+                    del members[old_key]
+                    self.split_states.pop(old_key, None)
+                members[key] = members.get(key, 0) + 1
+
+                population[victim] = child
+                evaluations[victim] = entry
+                fitness_values[victim] = entry[0]
+                versions[victim] += 1
+                heapq.heappush(heap, (-entry[0], versions[victim], victim))
+                if entry[0] < fitness_values[best_index]:
+                    best_index = victim
+
+            # Gợi ý cha mẹ chỉ dùng cho hai con vừa được đánh giá
+            self.parent_hints = {}
+
+            # Dựng lại heap khi có quá nhiều mục cũ
+            if len(heap) > 2 * size:
+                heap = [(-fitness, versions[i], i) for i, fitness in enumerate(fitness_values)]
+                heapq.heapify(heap)
+
+            if produced // report_interval == previous_reports and produced < total_offspring:
+                continue
 
-            # Cập nhật quần thể
-            population = new_population
+            # Ghi thống kê và báo cáo
+            current_best_solution, current_best_cost = self.generation_best(evaluations, fitness_values)
+            avg_cost = sum(fitness_values) / len(fitness_values)
+            worst_cost = max(fitness_values)
+            if report % self.diversity_interval == 0:
+                diversity = self.calculate_diversity(population)
+            computation_time = time.time() - start_time
+
+            self.record_generation(report, current_best_solution, current_best_cost, avg_cost, worst_cost,
+                                   diversity, population, fitness_values, computation_time, step_callback,
+                                   progress=produced / total_offspring)
+            report += 1
+            start_time = time.time()
 
-        # Đảm bảo giải pháp tốt nhất cuối cùng là hợp lệ và khả thi
-        if self.best_solution:
-            if not self.cvrp.is_solution_valid(self.best_solution) or not self.check_solution_feasibility(self.best_solution):
-                self.best_solution = self.repair_solution(self.best_solution)
-                # Kiểm tra lại tính khả thi
-                if not self.check_solution_feasibility(self.best_solution):
-                    # Nếu vẫn không khả thi, chia thành các tuyến riêng biệt
-                    new_solution = []
-                    for route in self.best_solution:
-                        for customer in route:
-                            new_solution.append([customer])
-                    self.best_solution = new_solution
-                self.best_cost = self.cvrp.calculate_solution_cost(self.best_solution)
+            # Kiểm tra dừng sớm (tính theo số lần báo cáo không cải thiện)
+            if self.early_stopping and self.stagnation_count >= self.early_stopping:
+                break
 
-        # Kết thúc - gọi callback nếu có
-        if callback:
-            callback((self.best_solution, self.best_cost))
+    def similar_individual(self, child, population, best_index):
+        """
+        Chọn cá thể giống con nhất (ít vị trí khác nhau nhất) trong tournament_size cá thể ngẫu nhiên,
+        không bao giờ chọn cá thể tốt nhất
 
-        return self.best_solution, self.best_cost
+        Tham số:
+        child -- Nhiễm sắc thể con
+        population -- Quần thể
+        best_index -- Vị trí cá thể tốt nhất
+
+        Trả về:
+        Vị trí cá thể bị thay
+        """
+        candidates = [i for i in random.sample(range(len(population)), min(self.tournament_size, len(population)))
+                      if i != best_index]
+        if not candidates:
+            return best_index
+        return min(candidates, key=lambda i: sum(1 for a, b in zip(child, population[i]) if a != b))
+
+    def generation_best(self, evaluations, fitness_values):
+        """
+        Lấy giải pháp tốt nhất của thế hệ, sửa chữa nếu cần và áp dụng tìm kiếm cục bộ (nếu có)
+
+        Tham số:
+        evaluations -- Kết quả (độ thích nghi, giải pháp) của quần thể
+        fitness_values -- Giá trị thích nghi tương ứng
+
+        Trả về:
+        Cặp (giải pháp tốt nhất của thế hệ, chi phí)
+        """
+        best_idx = np.argmin(fitness_values)
+        current_best_solution = evaluations[best_idx][1]
+        current_best_cost = fitness_values[best_idx]
+
+        # Kiểm tra và sửa chữa giải pháp tốt nhất nếu cần
+        if not self.cvrp.is_solution_valid(current_best_solution) or not self.check_solution_feasibility(current_best_solution):
+            current_best_solution = self.repair_solution(current_best_solution)
+            # Đảm bảo tính khả thi của giải pháp đã sửa chữa
+            if not self.check_solution_feasibility(current_best_solution):
+                # Nếu vẫn không khả thi, chia thành các tuyến riêng biệt
+                new_solution = []
+                for route in current_best_solution:
+                    for customer in route:
+                        new_solution.append([customer])
+                current_best_solution = new_solution
+            # Cập nhật lại chi phí
+            current_best_cost = self.cvrp.calculate_solution_cost(current_best_solution)
+
+        # Áp dụng tìm kiếm cục bộ nếu được kích hoạt
+        if self.local_search and current_best_solution:
+            improved_solution = self.local_search_2opt(current_best_solution)
+            # Cập nhật lại chi phí sau khi áp dụng tìm kiếm cục bộ
+            improved_cost = self.cvrp.calculate_solution_cost(improved_solution)
+            if improved_cost < current_best_cost:
+                current_best_solution = improved_solution
+                current_best_cost = improved_cost
+
+        return current_best_solution, current_best_cost
+
+    def record_generation(self, generation, current_best_solution, current_best_cost, avg_cost, worst_cost,
+                          diversity, population, fitness_values, computation_time, step_callback=None,
+                          progress=None):
+        """
+        Cập nhật giải pháp tốt nhất, lưu lịch sử của một thế hệ và gọi step_callback
+
+        Tham số:
+        generation -- Chỉ số thế hệ
+        current_best_solution, current_best_cost -- Giải pháp tốt nhất của thế hệ và chi phí
+        avg_cost, worst_cost, diversity -- Thống kê của quần thể
+        population -- Quần thể (None nếu không có, ví dụ ở mô hình đảo)
+        fitness_values -- Giá trị thích nghi của quần thể
+        computation_time -- Thời gian tính toán thuần túy của thế hệ
+        step_callback -- Hàm gọi lại sau mỗi thế hệ
+        progress -- Tiến độ (0..1); None = tính theo generation và max_generations
+        """
+        # Cập nhật giải pháp tốt nhất
+        if current_best_cost < self.best_cost:
+            self.best_solution = current_best_solution
+            self.best_cost = current_best_cost
+            self.stagnation_count = 0
+        else:
+            self.stagnation_count += 1
+
+        # Lưu lịch sử
+        self.cost_history.append(self.best_cost)
+        self.avg_cost_history.append(avg_cost)
+        self.worst_cost_history.append(worst_cost)
+        self.diversity_history.append(diversity)
+        self.time_history.append(computation_time)
+
+        # Gọi hàm callback cho mỗi bước và truyền thời gian tính toán thuần túy
+        if step_callback:
+            self.current_solution = current_best_solution
+            self.current_cost = current_best_cost
+
+            # Chỉ gửi dữ liệu của thế hệ hiện tại; lịch sử được truy cập qua self.history
+            step_data = {
+                'generation': generation,
+                'progress': (generation + 1) / self.max_generations if progress is None else progress,
+                'solution': self.current_solution,
+                'cost': self.current_cost,
+                'best_solution': self.best_solution,
+                'best_cost': self.best_cost,
+                'avg_cost': avg_cost,
+                'worst_cost': worst_cost,
+                'diversity': diversity,
+                'fitness_values': list(fitness_values),
+                'history': self.history,
+                'history_length': len(self.cost_history),
+                'stagnation': self.stagnation_count,
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'computation_time': computation_time,  # Thời gian tính toán thuần túy
+            }
+            if self.include_population and population is not None:
+                step_data['population'] = population.copy()
+            step_callback(step_data)
+
+    def start_workers(self):
+        """Khởi tạo nhóm tiến trình con; mỗi tiến trình nhận dữ liệu giải mã đúng một lần"""
+        if self.workers <= 1 or self.islands > 1 or self.engine == "steady_state":
+            return
+
+        # Dùng 'spawn' vì thuật toán thường chạy trong luồng nền của giao diện
+        context = multiprocessing.get_context("spawn")
+        initargs = (self.cvrp.distances, self.cvrp.demands, self.cvrp.capacity, self.decoder)
+        self.pool = context.Pool(self.workers, initializer=_init_fitness_worker, initargs=initargs)
+
+    def shutdown_workers(self):
+        """Dừng nhóm tiến trình con"""
+        if self.pool is None:
+            return
+
+        self.pool.terminate()
+        self.pool.join()
+        self.pool = None
+
+    def breed_population(self, population, evaluations, fitness_values):
+        """
+        Tạo quần thể thế hệ kế tiếp (biểu diễn list) bằng elitism, chọn lọc, lai ghép và đột biến
+
+        Tham số:
+        population -- Quần thể hiện tại
+        evaluations -- Kết quả đánh giá tương ứng
+        fitness_values -- Giá trị thích nghi tương ứng
+
+        Trả về:
+        Cặp (quần thể mới, kết quả đánh giá mới; None cho cá thể chưa đánh giá)
+        """
+        new_population = []
+        new_evaluations = []
+
+        # Elitism - giữ lại các cá thể tốt nhất cùng kết quả đánh giá của chúng
+        sorted_indices = np.argsort(fitness_values)
+        for i in range(self.elitism):
+            new_population.append(population[sorted_indices[i]])
+            new_evaluations.append(evaluations[sorted_indices[i]])
+
+        # Tạo cá thể mới cho quần thể tiếp theo
+        while len(new_population) < self.population_size:
+            child1, child2 = self.make_offspring(population, fitness_values)
+
+            # Thêm vào quần thể mới; con được giải mã một lần duy nhất ở thế hệ kế tiếp
+            new_population.append(child1)
+            new_evaluations.append(None)
+            if len(new_population) < self.population_size:
+                new_population.append(child2)
+                new_evaluations.append(None)
+
+        return new_population, new_evaluations
+
+    def make_offspring(self, population, fitness_values):
+        """
+        Tạo hai con từ quần thể hiện tại (biểu diễn list): chọn lọc, lai ghép và đột biến
+
+        Tham số:
+        population -- Quần thể hiện tại
+        fitness_values -- Giá trị thích nghi tương ứng
+
+        Trả về:
+        Cặp nhiễm sắc thể con
+        """
+        # Chọn lọc
+        if self.selection_method == "tournament":
+            parent1 = self.tournament_selection(population, fitness_values)
+            parent2 = self.tournament_selection(population, fitness_values)
+        elif self.selection_method == "roulette":
+            parent1 = self.roulette_wheel_selection(population, fitness_values)
+            parent2 = self.roulette_wheel_selection(population, fitness_values)
+        elif self.selection_method == "rank":
+            parent1 = self.rank_selection(population, fitness_values)
+            parent2 = self.rank_selection(population, fitness_values)
+        else:  # Mặc định tournament
+            parent1 = self.tournament_selection(population, fitness_values)
+            parent2 = self.tournament_selection(population, fitness_values)
+
+        # Lai ghép
+        if random.random() < self.crossover_rate:
+            if self.crossover_method == "ordered":
+                child1, child2 = self.ordered_crossover(parent1, parent2)
+            elif self.crossover_method == "partially_mapped":
+                child1, child2 = self.partially_mapped_crossover(parent1, parent2)
+            elif self.crossover_method == "cycle":
+                child1, child2 = self.cycle_crossover(parent1, parent2)
+            else:  # Mặc định ordered
+                child1, child2 = self.ordered_crossover(parent1, parent2)
+            (origin1, start1), (origin2, start2) = self.offspring_origins
+        else:
+            child1, child2 = parent1.copy(), parent2.copy()
+            (origin1, start1), (origin2, start2) = (parent1, len(parent1)), (parent2, len(parent2))
+
+        # Kiểm tra và sửa chữa nhiễm sắc thể sau khi lai ghép
+        child1 = self.check_and_repair_chromosomes(child1)
+        child2 = self.check_and_repair_chromosomes(child2)
+
+        # Đột biến
+        if random.random() < self.mutation_rate:
+            if self.mutation_method == "swap":
+                changed = self.swap_mutation(child1)
+            elif self.mutation_method == "insert":
+                changed = self.insert_mutation(child1)
+            elif self.mutation_method == "inversion":
+                changed = self.inversion_mutation(child1)
+            elif self.mutation_method == "scramble":
+                changed = self.scramble_mutation(child1)
+            else:  # Mặc định swap
+                changed = self.swap_mutation(child1)
+            start1 = min(start1, changed)
+
+            # Kiểm tra và sửa chữa sau khi đột biến
+            child1 = self.check_and_repair_chromosomes(child1)
+
+        if random.random() < self.mutation_rate:
+            if self.mutation_method == "swap":
+                changed = self.swap_mutation(child2)
+            elif self.mutation_method == "insert":
+                changed = self.insert_mutation(child2)
+            elif self.mutation_method == "inversion":
+                changed = self.inversion_mutation(child2)
+            elif self.mutation_method == "scramble":
+                changed = self.scramble_mutation(child2)
+            else:  # Mặc định swap
+                changed = self.swap_mutation(child2)
+            start2 = min(start2, changed)
+
+            # Kiểm tra và sửa chữa sau khi đột biến
+            child2 = self.check_and_repair_chromosomes(child2)
+
+        if self.decoder == "split":
+            self.parent_hints[tuple(child1)] = (tuple(origin1), start1)
+            self.parent_hints[tuple(child2)] = (tuple(origin2), start2)
+
+        return child1, child2
 
     def initialize_population(self):
         """
@@ -324,7 +800,11 @@ class GeneticAlgorithm_CVRP:
         """
         population = []
 
-        for _ in range(self.population_size):
+        # Gieo cá thể từ giải pháp savings nếu được kích hoạt
+        if self.savings_seeding and self.n > 1:
+            population.append(solution_to_chromosome(clarke_wright_savings(self.cvrp)))
+
+        while len(population) < self.population_size:
             # Tạo hoán vị ngẫu nhiên của khách hàng
             chromosome = list(range(1, self.n))
             random.shuffle(chromosome)
@@ -332,6 +812,126 @@ class GeneticAlgorithm_CVRP:
 
         return population
 
+    def initialize_population_array(self):
+        """
+        Khởi tạo quần thể ban đầu dạng ma trận (mỗi hàng là một nhiễm sắc thể)
+
+        Trả về:
+        Ma trận int32 (population_size x số khách hàng)
+        """
+        population = random_population(self.population_size, self.n - 1)
+
+        # Gieo cá thể từ giải pháp savings nếu được kích hoạt
+        if self.savings_seeding and self.n > 1 and self.population_size > 0:
+            population[0] = solution_to_chromosome(clarke_wright_savings(self.cvrp))
+
+        return population
+
+    def breed_population_array(self, population, evaluations, fitness_values):
+        """
+        Tạo quần thể thế hệ kế tiếp (biểu diễn ma trận): chọn lọc, lai ghép và đột biến
+        được thực hiện cho tất cả các cặp cha mẹ cùng lúc
+
+        Tham số:
+        population -- Ma trận quần thể hiện tại
+        evaluations -- Kết quả đánh giá tương ứng
+        fitness_values -- Giá trị thích nghi tương ứng
+
+        Trả về:
+        Cặp (ma trận quần thể mới, kết quả đánh giá mới; None cho cá thể chưa đánh giá)
+        """
+        length = population.shape[1]
+        fitness_values = np.asarray(fitness_values)
+
+        # Elitism - giữ lại các cá thể tốt nhất cùng kết quả đánh giá của chúng
+        elite_indices = np.argsort(fitness_values)[:self.elitism]
+        offspring_count = max(self.population_size - len(elite_indices), 0)
+        pair_count = (offspring_count + 1) // 2
+
+        # Chọn lọc
+        parents1 = population[self.select_rows(fitness_values, pair_count)]
+        parents2 = population[self.select_rows(fitness_values, pair_count)]
+        children1 = parents1.copy()
+        children2 = parents2.copy()
+
+        # Lai ghép (cả hai con của một cặp dùng chung điểm lai ghép)
+        if length >= 2:
+            crossed = np.flatnonzero(np.random.random_sample(pair_count) < self.crossover_rate)
+            if len(crossed):
+                first, second = parents1[crossed], parents2[crossed]
+                if self.crossover_method == "cycle":
+                    children1[crossed], children2[crossed] = cycle_crossover_rows(first, second)
+                else:
+                    if self.crossover_method == "partially_mapped":
+                        crossover = partially_mapped_crossover_rows
+                    else:  # Mặc định ordered
+                        crossover = ordered_crossover_rows
+                    start, end = segment_bounds(len(crossed), length)
+                    children1[crossed] = crossover(first, second, start, end)
+                    children2[crossed] = crossover(second, first, start, end)
+
+        # Xếp xen kẽ con thứ nhất và thứ hai của từng cặp như biểu diễn list
+        children = np.empty((2 * pair_count, length), dtype=population.dtype)
+        children[0::2] = children1
+        children[1::2] = children2
+        children = children[:offspring_count]
+
+        # Đột biến
+        if length >= 2:
+            mutated = np.flatnonzero(np.random.random_sample(offspring_count) < self.mutation_rate)
+            if len(mutated):
+                self.mutate_rows(children, mutated)
+
+        if self.decoder == "split":
+            # Con ở hàng chẵn/lẻ so với cha/mẹ thứ nhất/thứ hai của cặp; vị trí khác đầu tiên
+            # được tìm cho cả lô bằng một phép so sánh ma trận
+            origins = np.empty_like(children)
+            origins[0::2] = parents1[:len(origins[0::2])]
+            origins[1::2] = parents2[:len(origins[1::2])]
+            differs = children != origins
+            starts = np.where(differs.any(axis=1), differs.argmax(axis=1), length).tolist()
+            for child, origin, start in zip(children.tolist(), origins.tolist(), starts):
+                self.parent_hints[tuple(child)] = (tuple(origin), start)
+
+        new_population = np.concatenate([population[elite_indices], children])
+        new_evaluations = [evaluations[i] for i in elite_indices] + [None] * offspring_count
+        return new_population, new_evaluations
+
+    def select_rows(self, fitness_values, count):
+        """
+        Chọn lọc count cá thể cùng lúc theo selection_method
+
+        Tham số:
+        fitness_values -- Mảng độ thích nghi
+        count -- Số cá thể cần chọn
+
+        Trả về:
+        Mảng chỉ số hàng được chọn
+        """
+        if self.selection_method == "roulette":
+            return roulette_select(fitness_values, count)
+        elif self.selection_method == "rank":
+            return rank_select(fitness_values, count)
+        else:  # Mặc định tournament
+            return tournament_select(fitness_values, count, self.tournament_size)
+
+    def mutate_rows(self, matrix, rows):
+        """
+        Đột biến các hàng được chọn của ma trận theo mutation_method
+
+        Tham số:
+        matrix -- Ma trận nhiễm sắc thể
+        rows -- Chỉ số các hàng cần đột biến
+        """
+        if self.mutation_method == "insert":
+            insert_mutation_rows(matrix, rows)
+        elif self.mutation_method == "inversion":
+            inversion_mutation_rows(matrix, rows)
+        elif self.mutation_method == "scramble":
+            scramble_mutation_rows(matrix, rows)
+        else:  # Mặc định swap
+            swap_mutation_rows(matrix, rows)
+
     def decode_chromosome(self, chromosome):
         """
         Giải mã nhiễm sắc thể thành giải pháp CVRP đảm bảo ràng buộc về sức chứa
@@ -342,13 +942,18 @@ class GeneticAlgorithm_CVRP:
         Trả về:
         Danh sách các tuyến hợp lệ
         """
+        if self.decoder == "split":
+            return self.split_chromosome(chromosome)
+
         solution = []
+        route_loads = []  # Tải trọng hiện tại của từng tuyến, cập nhật mỗi lần chèn
         
         for customer in chromosome:
-            customer_demand = self.cvrp.customers[customer].demand
+            customer_demand = self.demands[customer]
             
             if customer_demand > self.cvrp.capacity:
                 solution.append([customer])
+                route_loads.append(customer_demand)
                 # print(f"Warning: Customer {customer} has demand {customer_demand} exceeding vehicle capacity {self.cvrp.capacity}")
                 continue
                 
@@ -358,8 +963,7 @@ class GeneticAlgorithm_CVRP:
             best_pos_for_min_overall_cost = -1
             
             for i, route in enumerate(solution):
-                current_demand = sum(self.cvrp.customers[c].demand for c in route)
-                remaining_capacity_in_route = self.cvrp.capacity - current_demand
+                remaining_capacity_in_route = self.cvrp.capacity - route_loads[i]
                 
                 if remaining_capacity_in_route < customer_demand:
                     continue
@@ -389,11 +993,39 @@ class GeneticAlgorithm_CVRP:
                 # Chèn khách hàng vào tuyến đã chọn tại vị trí tốt nhất đã tìm thấy cho tuyến đó
                 route_to_insert_into = solution[best_route_idx]
                 solution[best_route_idx] = route_to_insert_into[:best_pos_for_min_overall_cost] + [customer] + route_to_insert_into[best_pos_for_min_overall_cost:]
+                route_loads[best_route_idx] += customer_demand
             else:
                 solution.append([customer])
+                route_loads.append(customer_demand)
         
         return solution
 
+    def split_chromosome(self, chromosome):
+        """
+        Giải mã nhiễm sắc thể bằng Split: chia tối ưu giant tour thành các tuyến theo thứ tự
+
+        Tham số:
+        chromosome -- Nhiễm sắc thể (hoán vị của khách hàng)
+
+        Trả về:
+        Danh sách các tuyến hợp lệ
+        """
+        key = tuple(chromosome)
+
+        # Dùng lại nhãn của cha/mẹ gốc tới vị trí đầu tiên bị thay đổi (nếu trạng thái của nó còn lưu)
+        previous = None
+        start = 0
+        hint = self.parent_hints.get(key)
+        if hint is not None:
+            previous = self.split_states.get(hint[0])
+            start = hint[1]
+
+        state = split_state(chromosome, self.cvrp.distances, self.cvrp.demands, self.cvrp.capacity,
+                            previous, start)
+        if self.cache_split_states:
+            self.split_states[key] = state
+        return routes_from_labels(chromosome, state[1])
+
     def check_and_repair_capacity(self, solution):
         """
         Kiểm tra và sửa chữa giải pháp không hợp lệ về ràng buộc sức chứa
@@ -412,7 +1044,7 @@ class GeneticAlgorithm_CVRP:
         valid_routes = []
         
         for i, route in enumerate(solution):
-            demand = sum(self.cvrp.customers[customer].demand for customer in route)
+            demand = sum(self.demands[customer] for customer in route)
             if demand > self.cvrp.capacity:
                 invalid_routes.append((i, route, demand))
             else:
@@ -442,7 +1074,7 @@ class GeneticAlgorithm_CVRP:
             
             for i, route_i in enumerate(new_solution):
                 # Tính demand của tuyến hiện tại
-                demand_i = sum(self.cvrp.customers[customer].demand for customer in route_i)
+                demand_i = sum(self.demands[customer] for customer in route_i)
                 
                 # Nếu tuyến không vượt quá capacity, bỏ qua
                 if demand_i <= self.cvrp.capacity:
@@ -450,7 +1082,7 @@ class GeneticAlgorithm_CVRP:
                 
                 # Tìm khách hàng để chuyển
                 for pos_i, customer in enumerate(route_i):
-                    customer_demand = self.cvrp.customers[customer].demand
+                    customer_demand = self.demands[customer]
                     
                     # Tìm tuyến khác để chuyển khách hàng này vào
                     for j, route_j in enumerate(new_solution):
@@ -458,7 +1090,7 @@ class GeneticAlgorithm_CVRP:
                             continue
                         
                         # Tính demand của tuyến đích
-                        demand_j = sum(self.cvrp.customers[c].demand for c in route_j)
+                        demand_j = sum(self.demands[c] for c in route_j)
                         
                         # Kiểm tra xem có thể thêm khách hàng vào tuyến j không
                         if demand_j + customer_demand <= self.cvrp.capacity:
@@ -496,6 +1128,111 @@ class GeneticAlgorithm_CVRP:
         
         return new_solution
 
+    def evaluate_population(self, population, evaluations):
+        """
+        Đánh giá các cá thể chưa có kết quả, giữ nguyên kết quả đã có của các cá thể khác
+
+        Khi có nhóm tiến trình con, các nhiễm sắc thể chưa có trong bộ nhớ đệm được gửi đi theo
+        từng khối; giải mã là tất định nên kết quả trùng với khi chạy tuần tự.
+
+        Tham số:
+        population -- Quần thể
+        evaluations -- Kết quả (độ thích nghi, giải pháp) tương ứng, None nếu chưa đánh giá
+
+        Trả về:
+        Danh sách kết quả đánh giá cho toàn bộ quần thể
+        """
+        if isinstance(population, np.ndarray):
+            population = population.tolist()
+        if self.pool is None:
+            evaluations = [entry if entry is not None else self.evaluate(individual)
+                           for individual, entry in zip(population, evaluations)]
+            self.retain_split_states(population)
+            return evaluations
+
+        evaluations = list(evaluations)
+        pending = {}  # nhiễm sắc thể -> các vị trí trong quần thể cần kết quả của nó
+        for i, (individual, entry) in enumerate(zip(population, evaluations)):
+            if entry is not None:
+                continue
+            key = tuple(individual)
+            cached = self.fitness_cache.get(key) if self.fitness_cache_size > 0 else None
+            if cached is not None:
+                self.fitness_cache.move_to_end(key)
+                self.cache_hits += 1
+                evaluations[i] = cached
+            elif key in pending:
+                self.cache_hits += 1
+                pending[key].append(i)
+            else:
+                pending[key] = [i]
+
+        if pending:
+            chromosomes = [list(key) for key in pending]
+            chunksize = max(1, len(chromosomes) // (self.workers * 4))
+            results = self.pool.map(_evaluate_task, chromosomes, chunksize=chunksize)
+            for (key, indices), entry in zip(pending.items(), results):
+                self.store_evaluation(key, entry)
+                for i in indices:
+                    evaluations[i] = entry
+
+        self.retain_split_states(population)
+        return evaluations
+
+    def retain_split_states(self, population):
+        """Chỉ giữ trạng thái Split của các cá thể trong quần thể (cha mẹ của thế hệ kế tiếp)"""
+        self.parent_hints = {}
+        if self.split_states:
+            keys = set(map(tuple, population))
+            self.split_states = {key: state for key, state in self.split_states.items() if key in keys}
+
+    def evaluate(self, chromosome):
+        """
+        Đánh giá nhiễm sắc thể, dùng lại kết quả trong bộ nhớ đệm LRU nếu đã gặp trước đó
+
+        Tham số:
+        chromosome -- Nhiễm sắc thể để đánh giá
+
+        Trả về:
+        Cặp (độ thích nghi, giải pháp đã giải mã)
+        """
+        if self.fitness_cache_size <= 0:
+            self.cache_misses += 1
+            return self.decode_and_evaluate(chromosome)
+
+        key = tuple(chromosome)
+        entry = self.fitness_cache.get(key)
+        if entry is not None:
+            self.fitness_cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry
+
+        entry = self.decode_and_evaluate(chromosome)
+        self.store_evaluation(key, entry)
+        return entry
+
+    def store_evaluation(self, key, entry):
+        """Ghi kết quả mới vào bộ nhớ đệm LRU (tính là một lần trượt) và loại mục cũ nhất khi đầy"""
+        self.cache_misses += 1
+        if self.fitness_cache_size <= 0:
+            return
+        self.fitness_cache[key] = entry
+        if len(self.fitness_cache) > self.fitness_cache_size:
+            self.fitness_cache.popitem(last=False)
+
+    def decode_and_evaluate(self, chromosome):
+        """
+        Giải mã nhiễm sắc thể (có kiểm tra khả thi) và tính độ thích nghi, không qua bộ nhớ đệm
+
+        Tham số:
+        chromosome -- Nhiễm sắc thể để đánh giá
+
+        Trả về:
+        Cặp (độ thích nghi, giải pháp đã giải mã)
+        """
+        solution = self.decode_chromosome_with_feasibility_check(chromosome)
+        return self.solution_fitness(solution), solution
+
     def evaluate_fitness(self, chromosome):
         """
         Đánh giá độ thích nghi của một nhiễm sắc thể với phạt cho giải pháp không hợp lệ
@@ -506,9 +1243,18 @@ class GeneticAlgorithm_CVRP:
         Trả về:
         Giá trị thích nghi (chi phí, thấp hơn là tốt hơn)
         """
-        # Giải mã nhiễm sắc thể thành giải pháp và kiểm tra tính khả thi
-        solution = self.decode_chromosome_with_feasibility_check(chromosome)
-        
+        return self.evaluate(chromosome)[0]
+
+    def solution_fitness(self, solution):
+        """
+        Tính độ thích nghi của một giải pháp đã giải mã (chi phí cộng phạt)
+
+        Tham số:
+        solution -- Giải pháp (danh sách các tuyến)
+
+        Trả về:
+        Giá trị thích nghi (chi phí, thấp hơn là tốt hơn)
+        """
         # Tính tổng chi phí của giải pháp
         cost = self.cvrp.calculate_solution_cost(solution)
         
@@ -517,7 +1263,7 @@ class GeneticAlgorithm_CVRP:
         
         # Phạt cho vi phạm ràng buộc sức chứa
         for route in solution:
-            route_demand = sum(self.cvrp.customers[customer].demand for customer in route)
+            route_demand = sum(self.demands[customer] for customer in route)
             if route_demand > self.cvrp.capacity:
                 # Phạt tỷ lệ với mức độ vi phạm
                 excess = route_demand - self.cvrp.capacity
@@ -542,19 +1288,7 @@ class GeneticAlgorithm_CVRP:
         Trả về:
         Giải pháp cải tiến
         """
-        improved_solution = []
-
-        for route in solution:
-            # Bỏ qua các tuyến quá ngắn
-            if len(route) <= 2:
-                improved_solution.append(route)
-                continue
-
-            # Áp dụng 2-opt cho tuyến
-            improved_route = self.apply_2opt(route)
-            improved_solution.append(improved_route)
-
-        return improved_solution
+        return two_opt_solution(solution, self.cvrp.distances)
 
     def apply_2opt(self, route):
         """
@@ -566,77 +1300,25 @@ class GeneticAlgorithm_CVRP:
         Trả về:
         Tuyến cải tiến
         """
-        if not route or len(route) < 2: # Thêm kiểm tra cho tuyến rỗng hoặc quá ngắn
-            return route
-
-        best_route = route.copy()
-        improved = True
-
-        while improved:
-            improved = False
-            best_distance = self.cvrp.calculate_route_distance(best_route) # MODIFIED
-
-            for i in range(len(best_route) - 1): # Sửa: lặp trên best_route
-                for j in range(i + 1, len(best_route)): # Sửa: lặp trên best_route
-                    # Đảo ngược đoạn từ i+1 đến j (bao gồm cả hai đầu)
-                    # new_route = best_route[:i+1] + best_route[i+1:j+1][::-1] + best_route[j+1:]
-                    # Logic đảo ngược chính xác hơn cho 2-opt:
-                    # Tuyến mới được hình thành bằng cách lấy: route[0...i-1] + route[i...j reversed] + route[j+1...end]
-                    # Ví dụ: 0-1-2-3-4-5. i=1, j=3. Segment là 1-2-3. Reversed là 3-2-1.
-                    # new_route = 0-3-2-1-4-5
-                    segment_to_reverse = best_route[i+1:j+1]
-                    if not segment_to_reverse: # Nếu đoạn rỗng, bỏ qua
-                        continue
-                    
-                    new_route = best_route[:i+1] + segment_to_reverse[::-1] + best_route[j+1:]
-                    current_distance = self.cvrp.calculate_route_distance(new_route) # MODIFIED
-
-                    if current_distance < best_distance:
-                        best_route = new_route
-                        best_distance = current_distance
-                        improved = True
-            
-            # Nếu không có cải thiện trong vòng lặp này, thoát
-            # Điều này làm cho 2-opt dừng sau lượt lặp đầu tiên tìm thấy cải thiện.
-            # Để 2-opt triệt để hơn, loại bỏ break này và để vòng while kiểm soát.
-            # if improved:
-            # break
-            # Tuy nhiên, để nhất quán với đánh giá trước, tôi sẽ giữ lại logic dừng sớm
-            # cho đến khi có yêu cầu thay đổi cụ thể hơn.
-            # Theo yêu cầu mới là làm cho 2-opt triệt để hơn, nên loại bỏ break này
-            if not improved: # Nếu không có cải thiện nào trong cả một lượt quét i, j thì mới dừng
-                 break
-
-        return best_route
+        return two_opt_route(route, self.cvrp.distances)
 
     def calculate_diversity(self, population):
         """
         Tính đa dạng của quần thể dựa trên khoảng cách Hamming trung bình
 
         Tham số:
-        population -- Quần thể
+        population -- Quần thể (danh sách nhiễm sắc thể hoặc ma trận)
 
         Trả về:
         Phần trăm đa dạng
         """
-        if not population or len(population) < 2:
+        if len(population) < 2:
             return 0
 
-        total_diff = 0
-        count = 0
-
-        for i in range(len(population)):
-            for j in range(i+1, len(population)):
-                # Đếm số vị trí khác nhau
-                diff = sum(1 for a, b in zip(population[i], population[j]) if a != b)
-                total_diff += diff
-                count += 1
-
-        # Trả về phần trăm đa dạng
-        if count > 0 and len(population[0]) > 0:
-            return (total_diff / count / len(population[0])) * 100
-        else:
-            return 0
+        matrix = np.asarray(population)
+        if self.diversity_sample_pairs is not None:
+            return sampled_hamming_diversity(matrix, self.diversity_sample_pairs, self.diversity_rng)
+        return hamming_diversity(matrix)
 
     # Các phương pháp chọn lọc
     def tournament_selection(self, population, fitness_values):
@@ -724,7 +1406,7 @@ class GeneticAlgorithm_CVRP:
         parent1, parent2 -- Hai nhiễm sắc thể cha mẹ
 
         Trả về:
-        Hai nhiễm sắc thể con
+        Hai nhiễm sắc thể con; offspring_origins ghi (cha/mẹ gốc, vị trí đầu tiên có thể khác) của mỗi con
         """
         # Lai ghép thứ tự (OX)
         size = len(parent1)
@@ -751,6 +1433,10 @@ class GeneticAlgorithm_CVRP:
         self.fill_ox(parent2, child1, mask)
         self.fill_ox(parent1, child2, mask)
 
+        # Mỗi con giữ đoạn giữa của một cha/mẹ; phần trước point1 được điền từ cha/mẹ kia
+        start = 0 if point1 > 0 else point2 + 1
+        self.offspring_origins = ((parent1, start), (parent2, start))
+
         return child1, child2
 
     def fill_ox(self, parent, child, mask):
@@ -765,13 +1451,20 @@ class GeneticAlgorithm_CVRP:
         size = len(parent)
         j = 0  # Chỉ số trong cha mẹ
 
+        # Đánh dấu các gene đã có trong con để tra cứu O(1) thay vì quét cả danh sách
+        present = [False] * (max(parent) + 1)
+        for gene in child:
+            if gene >= 0:
+                present[gene] = True
+
         for i in range(size):
             if not mask[i]:  # Nếu vị trí chưa điền
                 # Tìm giá trị tiếp theo từ cha mẹ không có trong con
-                while parent[j] in child:
+                while present[parent[j]]:
                     j = (j + 1) % size
 
                 child[i] = parent[j]
+                present[parent[j]] = True
                 j = (j + 1) % size
 
     def partially_mapped_crossover(self, parent1, parent2):
@@ -782,7 +1475,7 @@ class GeneticAlgorithm_CVRP:
         parent1, parent2 -- Hai nhiễm sắc thể cha mẹ
 
         Trả về:
-        Hai nhiễm sắc thể con
+        Hai nhiễm sắc thể con; offspring_origins ghi (cha/mẹ gốc, vị trí đầu tiên có thể khác) của mỗi con
         """
         size = len(parent1)
 
@@ -794,58 +1487,37 @@ class GeneticAlgorithm_CVRP:
         child1 = parent2.copy()
         child2 = parent1.copy()
 
-        # Tạo danh sách các gene đã được ánh xạ
-        mapped_genes1 = set()
-        mapped_genes2 = set()
+        # Ánh xạ trực tiếp gene trong đoạn của cha mẹ này -> gene cùng vị trí của cha mẹ kia
+        mapping1 = {}
+        mapping2 = {}
 
-        # Sao chép đoạn giữa hai điểm và xác định các gene đã được ánh xạ
+        # Sao chép đoạn giữa hai điểm và xây dựng ánh xạ
         for i in range(point1, point2 + 1):
             child1[i] = parent1[i]
             child2[i] = parent2[i]
-            mapped_genes1.add(parent1[i])
-            mapped_genes2.add(parent2[i])
-
-        # Xử lý xung đột cho child1
-        for i in range(size):
-            if i < point1 or i > point2:
-                if child1[i] in mapped_genes1:
-                    # Tìm gene thay thế không có trong danh sách đã ánh xạ
-                    conflicts = set()
-                    current = child1[i]
-                    
-                    # Tìm tất cả các xung đột có thể có
-                    while current in mapped_genes1:
-                        # Tìm vị trí của gene trong parent1
-                        for j in range(point1, point2 + 1):
-                            if parent1[j] == current:
-                                # Thay thế bằng gene tương ứng trong parent2
-                                current = parent2[j]
-                                conflicts.add(current)
-                                break
-                    
-                    # Áp dụng gene thay thế
-                    child1[i] = current
-
-        # Xử lý xung đột cho child2
-        for i in range(size):
-            if i < point1 or i > point2:
-                if child2[i] in mapped_genes2:
-                    # Tìm gene thay thế không có trong danh sách đã ánh xạ
-                    conflicts = set()
-                    current = child2[i]
-                    
-                    # Tìm tất cả các xung đột có thể có
-                    while current in mapped_genes2:
-                        # Tìm vị trí của gene trong parent2
-                        for j in range(point1, point2 + 1):
-                            if parent2[j] == current:
-                                # Thay thế bằng gene tương ứng trong parent1
-                                current = parent1[j]
-                                conflicts.add(current)
-                                break
-                    
-                    # Áp dụng gene thay thế
-                    child2[i] = current
+            mapping1[parent1[i]] = parent2[i]
+            mapping2[parent2[i]] = parent1[i]
+
+        # Xử lý xung đột ngoài đoạn: đi theo chuỗi ánh xạ cho đến gene không nằm trong đoạn
+        # (con 1 là bản sao của parent2 và ngược lại nên vị trí đổi đầu tiên là xung đột đầu tiên
+        # trước point1, hoặc point1)
+        start1 = start2 = point1
+        for i in list(range(point1)) + list(range(point2 + 1, size)):
+            current = child1[i]
+            while current in mapping1:
+                current = mapping1[current]
+            if current != child1[i]:
+                start1 = min(start1, i)
+            child1[i] = current
+
+            current = child2[i]
+            while current in mapping2:
+                current = mapping2[current]
+            if current != child2[i]:
+                start2 = min(start2, i)
+            child2[i] = current
+
+        self.offspring_origins = ((parent2, start1), (parent1, start2))
 
         return child1, child2
 
@@ -857,7 +1529,7 @@ class GeneticAlgorithm_CVRP:
         parent1, parent2 -- Hai nhiễm sắc thể cha mẹ
 
         Trả về:
-        Hai nhiễm sắc thể con
+        Hai nhiễm sắc thể con; offspring_origins ghi (cha/mẹ gốc, vị trí đầu tiên có thể khác) của mỗi con
         """
         size = len(parent1)
 
@@ -873,12 +1545,15 @@ class GeneticAlgorithm_CVRP:
         # Tạo mask để theo dõi các chu trình
         visited = [False] * size
 
-        # Xử lý từng chu trình
+        # Vị trí đầu tiên nhận gene của cha/mẹ kia (trước đó mỗi con trùng với cha/mẹ tương ứng)
+        start = size
+
+        # Xử lý từng chu trình, luân phiên lấy gene từ parent1 và parent2
+        cycle_mod = 0  # 0 = parent1 cho child1, 1 = parent2 cho child1
         for i in range(size):
             if not visited[i]:
                 # Bắt đầu một chu trình mới
                 j = i
-                cycle_mod = 0  # 0 = parent1 cho child1, 1 = parent2 cho child1
 
                 while not visited[j]:
                     visited[j] = True
@@ -890,6 +1565,7 @@ class GeneticAlgorithm_CVRP:
                     else:
                         child1[j] = parent2[j]
                         child2[j] = parent1[j]
+                        start = min(start, j)
 
                     # Tìm vị trí tiếp theo trong chu trình
                     j = positions[parent1[j]]
@@ -897,6 +1573,8 @@ class GeneticAlgorithm_CVRP:
                 # Chuyển đổi cycle_mod cho chu trình tiếp theo
                 cycle_mod = 1 - cycle_mod
 
+        self.offspring_origins = ((parent1, start), (parent2, start))
+
         return child1, child2
 
     # Các phương pháp đột biến
@@ -906,6 +1584,9 @@ class GeneticAlgorithm_CVRP:
 
         Tham số:
         chromosome -- Nhiễm sắc thể để đột biến
+
+        Trả về:
+        Vị trí đầu tiên có thể bị thay đổi
         """
         size = len(chromosome)
 
@@ -915,6 +1596,7 @@ class GeneticAlgorithm_CVRP:
 
         # Hoán đổi
         chromosome[idx1], chromosome[idx2] = chromosome[idx2], chromosome[idx1]
+        return min(idx1, idx2)
 
     def insert_mutation(self, chromosome):
         """
@@ -922,6 +1604,9 @@ class GeneticAlgorithm_CVRP:
 
         Tham số:
         chromosome -- Nhiễm sắc thể để đột biến
+
+        Trả về:
+        Vị trí đầu tiên có thể bị thay đổi
         """
         size = len(chromosome)
 
@@ -944,12 +1629,17 @@ class GeneticAlgorithm_CVRP:
             # Chèn giá trị vào idx1
             chromosome[idx1] = value
 
+        return idx1
+
     def inversion_mutation(self, chromosome):
         """
         Đột biến đảo ngược
 
         Tham số:
         chromosome -- Nhiễm sắc thể để đột biến
+
+        Trả về:
+        Vị trí đầu tiên có thể bị thay đổi
         """
         size = len(chromosome)
 
@@ -959,6 +1649,7 @@ class GeneticAlgorithm_CVRP:
 
         # Đảo ngược đoạn từ idx1 đến idx2
         chromosome[idx1:idx2+1] = reversed(chromosome[idx1:idx2+1])
+        return idx1
 
     def scramble_mutation(self, chromosome):
         """
@@ -966,6 +1657,9 @@ class GeneticAlgorithm_CVRP:
 
         Tham số:
         chromosome -- Nhiễm sắc thể để đột biến
+
+        Trả về:
+        Vị trí đầu tiên có thể bị thay đổi
         """
         size = len(chromosome)
 
@@ -981,6 +1675,7 @@ class GeneticAlgorithm_CVRP:
 
         # Đặt lại đoạn đã xáo trộn
         chromosome[idx1:idx2+1] = segment
+        return idx1
 
     def stop(self):
         """Dừng thuật toán"""
@@ -1011,7 +1706,7 @@ class GeneticAlgorithm_CVRP:
         valid_routes = []
         
         for i, route in enumerate(solution):
-            demand = sum(self.cvrp.customers[customer].demand for customer in route)
+            demand = sum(self.demands[customer] for customer in route)
             if demand > self.cvrp.capacity:
                 invalid_routes.append((i, route, demand))
             else:
@@ -1030,11 +1725,11 @@ class GeneticAlgorithm_CVRP:
         # Xử lý từng tuyến không hợp lệ
         for _, route, _ in invalid_routes:
             # Sắp xếp khách hàng trong tuyến theo demand (giảm dần)
-            sorted_customers = sorted(route, key=lambda c: self.cvrp.customers[c].demand, reverse=True)
+            sorted_customers = sorted(route, key=lambda c: self.demands[c], reverse=True)
             
             # Thử chèn vào các tuyến hợp lệ hoặc tạo tuyến mới
             for customer in sorted_customers:
-                customer_demand = self.cvrp.customers[customer].demand
+                customer_demand = self.demands[customer]
                 inserted = False
                 
                 # Tìm tuyến tốt nhất để chèn (best-fit)
@@ -1042,7 +1737,7 @@ class GeneticAlgorithm_CVRP:
                 best_remaining = -1
                 
                 for i, current_route in enumerate(new_solution):
-                    current_demand = sum(self.cvrp.customers[c].demand for c in current_route)
+                    current_demand = sum(self.demands[c] for c in current_route)
                     remaining = self.cvrp.capacity - current_demand
                     
                     # Nếu có thể chèn và còn nhiều dung lượng hơn
@@ -1193,7 +1888,7 @@ class GeneticAlgorithm_CVRP:
             return []
             
         # Tính tổng demand của tuyến
-        total_demand = sum(self.cvrp.customers[customer].demand for customer in route)
+        total_demand = sum(self.demands[customer] for customer in route)
         
         # Nếu không vượt quá capacity, giữ nguyên tuyến
         if total_demand <= self.cvrp.capacity:
@@ -1205,7 +1900,7 @@ class GeneticAlgorithm_CVRP:
         current_demand = 0
         
         for customer in route:
-            customer_demand = self.cvrp.customers[customer].demand
+            customer_demand = self.demands[customer]
             
             # Nếu thêm khách hàng này vào sẽ vượt quá capacity
             if current_demand + customer_demand > self.cvrp.capacity:
@@ -0,0 +1,60 @@
+"""
+Truy cập lịch sử của một lần chạy thuật toán mà không sao chép ở mỗi bước
+Step_callback chỉ nhận dữ liệu của bước hiện tại cùng một đối tượng RunHistory dùng chung
+"""
+
+
+class RunHistory:
+    """
+    Truy cập chỉ đọc tới các danh sách lịch sử (cost_history, ...) của một thuật toán
+
+    Đối tượng không giữ bản sao: mỗi lần truy vấn đọc trực tiếp thuộc tính của thuật toán
+    (kể cả khi run() tạo danh sách mới), nên việc gửi nó kèm mỗi bước tốn O(1). Người nhận
+    chỉ sao chép phần mình cần, ví dụ get(name, end=data['history_length']) để có đúng lịch
+    sử tại thời điểm bước được phát ra dù thuật toán đã chạy tiếp, hoặc since(name, start)
+    để chỉ lấy các giá trị mới.
+    """
+
+    def __init__(self, owner, names):
+        """
+        Tham số:
+        owner -- Đối tượng thuật toán chứa các danh sách lịch sử
+        names -- Tên các thuộc tính lịch sử được phép truy cập
+        """
+        self._owner = owner
+        self.names = tuple(names)
+
+    def _series(self, name):
+        if name not in self.names:
+            raise KeyError(name)
+        return getattr(self._owner, name)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __len__(self):
+        """Số bước đã ghi (độ dài của danh sách lịch sử đầu tiên)"""
+        return len(self._series(self.names[0]))
+
+    def get(self, name, start=0, end=None):
+        """
+        Bản sao của đoạn [start, end) trong một danh sách lịch sử
+
+        Tham số:
+        name -- Tên thuộc tính lịch sử (vd. 'cost_history')
+        start, end -- Chỉ số đầu và cuối (end = None: tới giá trị mới nhất)
+        """
+        return self._series(name)[start:end]
+
+    def since(self, name, start):
+        """Các giá trị được ghi từ chỉ số start trở đi"""
+        return self.get(name, start)
+
+    def latest(self, name, default=None):
+        """Giá trị mới nhất của một danh sách lịch sử (default nếu chưa có)"""
+        series = self._series(name)
+        return series[-1] if series else default
+
+    def snapshot(self, end=None):
+        """Từ điển tên -> bản sao của mọi danh sách lịch sử tới chỉ số end"""
+        return {name: self.get(name, end=end) for name in self.names}
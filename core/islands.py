@@ -0,0 +1,127 @@
+"""
+Mô hình đảo (island model) cho Thuật toán Di truyền
+Mỗi đảo là một quần thể con tiến hóa trong tiến trình riêng và định kỳ trao đổi các cá thể tốt nhất
+"""
+
+import random
+import time
+
+import numpy as np
+
+
+def island_sizes(population_size, island_count):
+    """Chia đều population_size cá thể cho island_count đảo (các đảo đầu nhận phần dư)"""
+    base, extra = divmod(population_size, island_count)
+    return [base + (1 if island < extra else 0) for island in range(island_count)]
+
+
+def migration_sources(island_count, topology, rng=np.random):
+    """
+    Chọn đảo nguồn gửi cá thể di cư đến mỗi đảo
+
+    Tham số:
+    island_count -- Số đảo
+    topology -- 'ring': nhận từ đảo liền trước, 'random': nhận từ một đảo khác chọn ngẫu nhiên
+    rng -- Bộ sinh số ngẫu nhiên
+
+    Trả về:
+    Danh sách sources với sources[i] là đảo gửi cá thể đến đảo i
+    """
+    if topology == "random":
+        sources = rng.randint(0, island_count - 1, size=island_count)
+        return (sources + (sources >= np.arange(island_count))).tolist()
+    return [(island - 1) % island_count for island in range(island_count)]
+
+
+def receive_migrants(population, evaluations, fitness_values, migrants):
+    """
+    Thay các cá thể kém nhất của đảo bằng cá thể nhập cư (giữ nguyên kết quả đánh giá của chúng)
+
+    Tham số:
+    population -- Quần thể của đảo (list hoặc ma trận, sửa trực tiếp)
+    evaluations -- Kết quả đánh giá tương ứng (sửa trực tiếp)
+    fitness_values -- Giá trị thích nghi tương ứng (sửa trực tiếp)
+    migrants -- Danh sách cặp (nhiễm sắc thể, kết quả đánh giá)
+    """
+    worst = np.argsort(fitness_values)[::-1][:len(migrants)]
+    for idx, (chromosome, entry) in zip(worst.tolist(), migrants):
+        population[idx] = chromosome if isinstance(population, np.ndarray) else list(chromosome)
+        evaluations[idx] = entry
+        fitness_values[idx] = entry[0]
+
+
+def island_worker(ga, island, size, seed, connection):
+    """
+    Vòng lặp của một đảo trong tiến trình con
+
+    Mỗi thông điệp (số thế hệ, cá thể nhập cư) cho đảo tiến hóa thêm số thế hệ đó; đảo trả về
+    thống kê của từng thế hệ cùng các cá thể tốt nhất để di cư. Thông điệp None kết thúc tiến trình.
+
+    Tham số:
+    ga -- Bản sao GeneticAlgorithm_CVRP (cấu hình chung của các đảo)
+    island -- Chỉ số đảo
+    size -- Kích thước quần thể của đảo
+    seed -- Hạt giống ngẫu nhiên của đảo
+    connection -- Đầu Pipe nối với tiến trình chính
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+
+    ga.population_size = size
+    ga.elitism = min(ga.elitism, size)
+    ga.tournament_size = min(ga.tournament_size, size)
+    ga.savings_seeding = ga.savings_seeding and island == 0
+
+    population = None
+    evaluations = fitness_values = None
+    generation = 0
+    diversity = 0
+
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+
+        generations, immigrants = message
+        if immigrants:
+            receive_migrants(population, evaluations, fitness_values, immigrants)
+
+        records = []
+        for _ in range(generations):
+            if population is None:
+                if ga.representation == "array":
+                    population = ga.initialize_population_array()
+                else:
+                    population = ga.initialize_population()
+                evaluations = [None] * len(population)
+            elif ga.representation == "array":
+                population, evaluations = ga.breed_population_array(population, evaluations, fitness_values)
+            else:
+                population, evaluations = ga.breed_population(population, evaluations, fitness_values)
+
+            start_time = time.time()
+            evaluations = ga.evaluate_population(population, evaluations)
+            fitness_values = [fitness for fitness, _ in evaluations]
+            solution, cost = ga.generation_best(evaluations, fitness_values)
+            if generation % ga.diversity_interval == 0:
+                diversity = ga.calculate_diversity(population)
+
+            records.append({
+                'cost': cost,
+                'solution': solution,
+                'fitness_values': fitness_values,
+                'diversity': diversity,
+                'cache_hits': ga.cache_hits,
+                'cache_misses': ga.cache_misses,
+                'computation_time': time.time() - start_time,
+            })
+            generation += 1
+
+        # Các cá thể tốt nhất của đảo được gửi đi di cư
+        emigrants = []
+        for idx in np.argsort(fitness_values)[:ga.migration_size].tolist():
+            chromosome = population[idx]
+            chromosome = chromosome.tolist() if isinstance(chromosome, np.ndarray) else list(chromosome)
+            emigrants.append((chromosome, evaluations[idx]))
+
+        connection.send((records, emigrants))
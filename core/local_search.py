@@ -0,0 +1,130 @@
+"""
+Tìm kiếm cục bộ 2-opt dùng chung cho ACO và GA
+Đánh giá nước đi bằng chênh lệch O(1), giới hạn bằng danh sách láng giềng và bit don't-look
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+# Số láng giềng gần nhất mặc định xem xét cho mỗi khách hàng
+DEFAULT_NEIGHBOR_COUNT = 20
+
+# Ngưỡng cải thiện tối thiểu để tránh lặp vô hạn do sai số làm tròn
+EPSILON = 1e-10
+
+
+def route_neighbors(route, distances, neighbor_count=DEFAULT_NEIGHBOR_COUNT):
+    """
+    Danh sách láng giềng trong tuyến: với mỗi khách hàng, các khách hàng cùng tuyến gần nhất
+
+    Tham số:
+    route -- Tuyến (danh sách khách hàng)
+    distances -- Ma trận khoảng cách
+    neighbor_count -- Số láng giềng giữ lại cho mỗi khách hàng (None = tất cả)
+
+    Trả về:
+    Từ điển khách hàng -> danh sách láng giềng đã sắp tăng dần theo khoảng cách
+    """
+    nodes = np.asarray(route)
+    order = np.argsort(distances[np.ix_(nodes, nodes)], axis=1, kind='stable')[:, 1:]
+    if neighbor_count is not None:
+        order = order[:, :neighbor_count]
+    return dict(zip(route, nodes[order].tolist()))
+
+
+def two_opt_route(route, distances, neighbors=None, neighbor_count=DEFAULT_NEIGHBOR_COUNT):
+    """
+    Áp dụng 2-opt (cải thiện đầu tiên) cho một tuyến, kể cả các cạnh nối với depot
+
+    Mỗi nước đi thay cặp cạnh (a, b), (c, e) bằng (a, c), (b, e) với chênh lệch
+    d(a,c) + d(b,e) - d(a,b) - d(c,e), tính trong O(1) mà không dựng lại tuyến.
+
+    Tham số:
+    route -- Tuyến ban đầu (danh sách khách hàng, không gồm depot)
+    distances -- Ma trận khoảng cách
+    neighbors -- Danh sách láng giềng toàn cục đã sắp theo khoảng cách (vd. CVRP.get_neighbors);
+                 None = dùng láng giềng trong tuyến (route_neighbors)
+    neighbor_count -- Số láng giềng trong tuyến khi neighbors là None
+
+    Trả về:
+    Tuyến cải tiến
+    """
+    if len(route) <= 2:
+        return list(route)
+
+    if neighbors is None:
+        neighbors = route_neighbors(route, distances, neighbor_count)
+
+    tour = [0] + list(route) + [0]
+    position = {node: idx for idx, node in enumerate(tour[1:-1], start=1)}
+
+    # Bit don't-look: chỉ các khách hàng trong hàng đợi mới được xem xét lại
+    active = deque(route)
+    queued = set(route)
+
+    while active:
+        a = active.popleft()
+        queued.discard(a)
+        i = position[a]
+        improved = False
+
+        # Xét cạnh nối a với nút kế tiếp (direction = 1) và nút liền trước (direction = -1)
+        for direction in (1, -1):
+            b = tour[i + direction]
+            d_ab = distances[a, b]
+
+            for c in neighbors[a]:
+                j = position.get(c)
+                if j is None:
+                    continue
+
+                # Láng giềng đã sắp tăng dần: các ứng viên sau không thể cải thiện
+                d_ac = distances[a, c]
+                if d_ac >= d_ab:
+                    break
+
+                e = tour[j + direction]
+                if c == b or e == a:
+                    continue
+
+                delta = d_ac + distances[b, e] - d_ab - distances[c, e]
+                if delta < -EPSILON:
+                    # Đảo ngược đoạn nằm giữa hai cạnh bị thay thế
+                    if direction == 1:
+                        start, end = (i + 1, j) if i < j else (j + 1, i)
+                    else:
+                        start, end = (i, j - 1) if i < j else (j, i - 1)
+                    tour[start:end + 1] = tour[start:end + 1][::-1]
+                    for k in range(start, end + 1):
+                        position[tour[k]] = k
+
+                    # Bật lại bit của các đầu mút bị ảnh hưởng
+                    for node in (a, b, c, e):
+                        if node != 0 and node not in queued:
+                            active.append(node)
+                            queued.add(node)
+                    improved = True
+                    break
+
+            if improved:
+                break
+
+    return tour[1:-1]
+
+
+def two_opt_solution(solution, distances, neighbors=None, neighbor_count=DEFAULT_NEIGHBOR_COUNT):
+    """
+    Áp dụng 2-opt cho từng tuyến của một giải pháp
+
+    Tham số:
+    solution -- Giải pháp (danh sách các tuyến)
+    distances -- Ma trận khoảng cách
+    neighbors -- Danh sách láng giềng toàn cục đã sắp theo khoảng cách (None = láng giềng trong tuyến)
+    neighbor_count -- Số láng giềng trong tuyến khi neighbors là None
+
+    Trả về:
+    Giải pháp cải tiến
+    """
+    return [two_opt_route(route, distances, neighbors, neighbor_count) for route in solution]
@@ -0,0 +1,349 @@
+"""
+Biểu diễn quần thể GA dạng ma trận NumPy (pop_size x số khách hàng, int32)
+Các toán tử chọn lọc, lai ghép và đột biến xử lý đồng thời nhiều hàng
+"""
+
+import numpy as np
+
+
+def random_population(size, n_customers, rng=np.random):
+    """
+    Tạo quần thể ngẫu nhiên: mỗi hàng là một hoán vị của khách hàng 1..n_customers
+
+    Tham số:
+    size -- Số cá thể
+    n_customers -- Số khách hàng (độ dài nhiễm sắc thể)
+    rng -- Bộ sinh số ngẫu nhiên (mặc định np.random)
+
+    Trả về:
+    Ma trận int32 (size x n_customers)
+    """
+    return (np.argsort(rng.random_sample((size, n_customers)), axis=1) + 1).astype(np.int32)
+
+
+def gene_positions(matrix):
+    """
+    Vị trí của từng gene trong mỗi hàng: positions[r, g] là chỉ số của gene g trong hàng r
+
+    Tham số:
+    matrix -- Ma trận nhiễm sắc thể (gene từ 1 đến số cột)
+
+    Trả về:
+    Ma trận (số hàng x số cột + 1), cột 0 không dùng
+    """
+    rows, length = matrix.shape
+    positions = np.zeros((rows, length + 1), dtype=np.intp)
+    np.put_along_axis(positions, matrix, np.arange(length), axis=1)
+    return positions
+
+
+def segment_bounds(count, length, rng=np.random):
+    """
+    Chọn ngẫu nhiên đoạn [start, end] với start < end cho mỗi hàng
+
+    Cùng phân phối với cặp random.randint(0, length - 2), random.randint(start + 1, length - 1)
+    dùng trong các toán tử dạng list.
+
+    Tham số:
+    count -- Số hàng
+    length -- Độ dài nhiễm sắc thể
+    rng -- Bộ sinh số ngẫu nhiên
+
+    Trả về:
+    Cặp mảng (start, end)
+    """
+    start = rng.randint(0, length - 1, size=count)
+    end = start + 1 + (rng.random_sample(count) * (length - 1 - start)).astype(np.intp)
+    return start, end
+
+
+def segment_mask(start, end, length):
+    """Mặt nạ boolean (số hàng x length) đánh dấu các vị trí trong đoạn [start, end] của mỗi hàng"""
+    columns = np.arange(length)
+    return (columns >= start[:, None]) & (columns <= end[:, None])
+
+
+def segment_genes(matrix, mask):
+    """Mặt nạ boolean theo gene: in_segment[r, g] cho biết gene g nằm trong đoạn của hàng r"""
+    rows, length = matrix.shape
+    in_segment = np.zeros((rows, length + 1), dtype=bool)
+    np.put_along_axis(in_segment, matrix, mask, axis=1)
+    return in_segment
+
+
+# Các phương pháp chọn lọc (trả về chỉ số hàng)
+def tournament_select(fitness_values, count, tournament_size, rng=np.random):
+    """
+    Chọn lọc tournament cho count lượt cùng lúc (mỗi lượt chọn không lặp tournament_size cá thể)
+
+    Tham số:
+    fitness_values -- Mảng độ thích nghi (thấp hơn là tốt hơn)
+    count -- Số cá thể cần chọn
+    tournament_size -- Kích thước tournament
+    rng -- Bộ sinh số ngẫu nhiên
+
+    Trả về:
+    Mảng chỉ số cá thể được chọn
+    """
+    fitness_values = np.asarray(fitness_values)
+    size = len(fitness_values)
+    k = min(tournament_size, size)
+    candidates = np.argpartition(rng.random_sample((count, size)), k - 1, axis=1)[:, :k]
+    winners = np.argmin(fitness_values[candidates], axis=1)
+    return candidates[np.arange(count), winners]
+
+
+def roulette_select(fitness_values, count, rng=np.random):
+    """
+    Chọn lọc bánh xe roulette cho count lượt cùng lúc
+
+    Tham số:
+    fitness_values -- Mảng độ thích nghi (thấp hơn là tốt hơn)
+    count -- Số cá thể cần chọn
+    rng -- Bộ sinh số ngẫu nhiên
+
+    Trả về:
+    Mảng chỉ số cá thể được chọn
+    """
+    fitness_values = np.asarray(fitness_values, dtype=float)
+    inv_fitness = fitness_values.max() - fitness_values + 0.01  # +0.01 để tránh 0
+    return rng.choice(len(fitness_values), size=count, p=inv_fitness / inv_fitness.sum())
+
+
+def rank_select(fitness_values, count, rng=np.random):
+    """
+    Chọn lọc theo thứ hạng cho count lượt cùng lúc (cá thể tốt nhất có hạng cao nhất)
+
+    Tham số:
+    fitness_values -- Mảng độ thích nghi (thấp hơn là tốt hơn)
+    count -- Số cá thể cần chọn
+    rng -- Bộ sinh số ngẫu nhiên
+
+    Trả về:
+    Mảng chỉ số cá thể được chọn
+    """
+    size = len(fitness_values)
+    ranks = np.empty(size)
+    ranks[np.argsort(fitness_values)] = np.arange(size, 0, -1)
+    return rng.choice(size, size=count, p=ranks / ranks.sum())
+
+
+# Các phương pháp lai ghép (mỗi hàng của parents1 ghép với hàng tương ứng của parents2)
+def ordered_crossover_rows(parents1, parents2, start, end):
+    """
+    Lai ghép thứ tự (OX) theo hàng: giữ đoạn [start, end] của parents1, các vị trí còn lại
+    điền lần lượt các gene của parents2 không nằm trong đoạn đó
+
+    Tham số:
+    parents1, parents2 -- Ma trận cha mẹ cùng kích thước
+    start, end -- Mảng điểm lai ghép cho mỗi hàng
+
+    Trả về:
+    Ma trận con
+    """
+    mask = segment_mask(start, end, parents1.shape[1])
+    in_segment = segment_genes(parents1, mask)
+    keep = ~np.take_along_axis(in_segment, parents2, axis=1)
+
+    # Mỗi hàng có số gene giữ lại bằng số vị trí trống nên có thể gán theo thứ tự hàng
+    children = parents1.copy()
+    children[~mask] = parents2[keep]
+    return children
+
+
+def partially_mapped_crossover_rows(parents1, parents2, start, end):
+    """
+    Lai ghép ánh xạ một phần (PMX) theo hàng: đoạn [start, end] lấy từ parents1, phần còn lại
+    lấy từ parents2 và giải xung đột bằng ánh xạ parents1[j] -> parents2[j] trong đoạn
+
+    Tham số:
+    parents1, parents2 -- Ma trận cha mẹ cùng kích thước
+    start, end -- Mảng điểm lai ghép cho mỗi hàng
+
+    Trả về:
+    Ma trận con
+    """
+    rows, length = parents1.shape
+    mask = segment_mask(start, end, length)
+    in_segment = segment_genes(parents1, mask)
+
+    # Ánh xạ gene -> gene, là ánh xạ đồng nhất ngoài các gene trong đoạn của parents1
+    mapping = np.tile(np.arange(length + 1, dtype=parents1.dtype), (rows, 1))
+    row_index = np.nonzero(mask)[0]
+    mapping[row_index, parents1[mask]] = parents2[mask]
+
+    children = np.where(mask, parents1, parents2)
+    conflict_rows, conflict_cols = np.nonzero(~mask & np.take_along_axis(in_segment, children, axis=1))
+    genes = children[conflict_rows, conflict_cols]
+
+    # Đi theo chuỗi ánh xạ cho đến khi gene không còn nằm trong đoạn
+    pending = np.ones(len(genes), dtype=bool)
+    while pending.any():
+        genes[pending] = mapping[conflict_rows[pending], genes[pending]]
+        pending[pending] = in_segment[conflict_rows[pending], genes[pending]]
+
+    children[conflict_rows, conflict_cols] = genes
+    return children
+
+
+def cycle_crossover_rows(parents1, parents2):
+    """
+    Lai ghép chu trình (CX) theo hàng: các chu trình vị trí luân phiên lấy gene từ parents1 và parents2
+
+    Chu trình của mỗi vị trí được gán nhãn bằng chỉ số nhỏ nhất của nó (nhảy con trỏ, O(n log n)),
+    thứ tự chu trình là thứ tự xuất hiện của nhãn khi duyệt từ trái sang phải.
+
+    Tham số:
+    parents1, parents2 -- Ma trận cha mẹ cùng kích thước
+
+    Trả về:
+    Hai ma trận con
+    """
+    rows, length = parents1.shape
+    columns = np.arange(length)
+
+    # Vị trí kế tiếp trong chu trình: vị trí trong parents2 của gene parents1 tại vị trí hiện tại
+    successor = np.take_along_axis(gene_positions(parents2), parents1, axis=1)
+
+    labels = np.tile(columns, (rows, 1))
+    jump = successor
+    steps = 1
+    while steps < length:
+        labels = np.minimum(labels, np.take_along_axis(labels, jump, axis=1))
+        jump = np.take_along_axis(jump, jump, axis=1)
+        steps *= 2
+
+    cycle_number = np.cumsum(labels == columns, axis=1) - 1
+    from_first = np.take_along_axis(cycle_number, labels, axis=1) % 2 == 0
+
+    children1 = np.where(from_first, parents1, parents2)
+    children2 = np.where(from_first, parents2, parents1)
+    return children1, children2
+
+
+# Các phương pháp đột biến (sửa trực tiếp các hàng được chọn của ma trận)
+def permute_rows(matrix, rows, source):
+    """Sắp lại các hàng được chọn: hàng mới tại cột k lấy giá trị ở cột source[:, k]"""
+    matrix[rows] = np.take_along_axis(matrix[rows], source, axis=1)
+
+
+def swap_mutation_rows(matrix, rows, rng=np.random):
+    """
+    Đột biến hoán đổi hai vị trí ngẫu nhiên trên các hàng được chọn
+
+    Tham số:
+    matrix -- Ma trận nhiễm sắc thể
+    rows -- Chỉ số các hàng cần đột biến
+    rng -- Bộ sinh số ngẫu nhiên
+    """
+    length = matrix.shape[1]
+    idx1 = rng.randint(0, length, size=len(rows))
+    idx2 = rng.randint(0, length, size=len(rows))
+    matrix[rows, idx1], matrix[rows, idx2] = matrix[rows, idx2], matrix[rows, idx1]
+
+
+def insert_mutation_rows(matrix, rows, rng=np.random):
+    """
+    Đột biến chèn: chuyển gene ở vị trí sau lên vị trí trước, dịch đoạn giữa sang phải
+
+    Tham số:
+    matrix -- Ma trận nhiễm sắc thể
+    rows -- Chỉ số các hàng cần đột biến
+    rng -- Bộ sinh số ngẫu nhiên
+    """
+    length = matrix.shape[1]
+    idx = np.sort(rng.randint(0, length, size=(len(rows), 2)), axis=1)
+    start, end = idx[:, :1], idx[:, 1:]
+
+    columns = np.arange(length)
+    source = np.where((columns > start) & (columns <= end), columns - 1, columns)
+    source = np.where(columns == start, end, source)
+    permute_rows(matrix, rows, source)
+
+
+def inversion_mutation_rows(matrix, rows, rng=np.random):
+    """
+    Đột biến đảo ngược một đoạn ngẫu nhiên trên các hàng được chọn
+
+    Tham số:
+    matrix -- Ma trận nhiễm sắc thể
+    rows -- Chỉ số các hàng cần đột biến
+    rng -- Bộ sinh số ngẫu nhiên
+    """
+    length = matrix.shape[1]
+    start, end = segment_bounds(len(rows), length, rng)
+    mask = segment_mask(start, end, length)
+
+    columns = np.arange(length)
+    source = np.where(mask, (start + end)[:, None] - columns, columns)
+    permute_rows(matrix, rows, source)
+
+
+def scramble_mutation_rows(matrix, rows, rng=np.random):
+    """
+    Đột biến xáo trộn một đoạn ngẫu nhiên trên các hàng được chọn
+
+    Tham số:
+    matrix -- Ma trận nhiễm sắc thể
+    rows -- Chỉ số các hàng cần đột biến
+    rng -- Bộ sinh số ngẫu nhiên
+    """
+    length = matrix.shape[1]
+    start, end = segment_bounds(len(rows), length, rng)
+    mask = segment_mask(start, end, length)
+
+    # Khóa sắp xếp: ngoài đoạn giữ nguyên chỉ số cột, trong đoạn là số ngẫu nhiên trong [start, end + 1)
+    columns = np.arange(length)
+    random_keys = start[:, None] + rng.random_sample(mask.shape) * (end - start + 1)[:, None]
+    keys = np.where(mask, random_keys, columns)
+    permute_rows(matrix, rows, np.argsort(keys, axis=1, kind='stable'))
+
+
+# Đo độ đa dạng
+def hamming_diversity(matrix):
+    """
+    Độ đa dạng chính xác: khoảng cách Hamming trung bình giữa mọi cặp hàng, tính bằng phần trăm
+
+    Thay vì so sánh O(P^2) cặp, đếm tại mỗi vị trí số cặp có cùng gene (tổng C(c, 2) theo
+    số lần xuất hiện c của từng gene), nên chi phí chỉ là O(P * n).
+
+    Tham số:
+    matrix -- Ma trận nhiễm sắc thể (P x n)
+
+    Trả về:
+    Phần trăm đa dạng
+    """
+    size, length = matrix.shape
+    if size < 2 or length == 0:
+        return 0
+
+    keys = matrix.astype(np.int64) + (int(matrix.max()) + 1) * np.arange(length)
+    counts = np.bincount(keys.ravel())
+    equal_pairs = int((counts * (counts - 1) // 2).sum())
+    pairs = size * (size - 1) // 2
+    return (pairs * length - equal_pairs) / pairs / length * 100
+
+
+def sampled_hamming_diversity(matrix, pair_count, rng=np.random):
+    """
+    Ước lượng độ đa dạng từ pair_count cặp hàng chọn ngẫu nhiên (tính chính xác nếu đủ ngân sách)
+
+    Tham số:
+    matrix -- Ma trận nhiễm sắc thể (P x n)
+    pair_count -- Số cặp tối đa được so sánh
+    rng -- Bộ sinh số ngẫu nhiên
+
+    Trả về:
+    Phần trăm đa dạng (ước lượng không chệch của hamming_diversity)
+    """
+    size, length = matrix.shape
+    if size < 2 or length == 0:
+        return 0
+    if pair_count >= size * (size - 1) // 2:
+        return hamming_diversity(matrix)
+
+    first = rng.randint(0, size, size=pair_count)
+    second = rng.randint(0, size - 1, size=pair_count)
+    second += second >= first
+    differences = np.count_nonzero(matrix[first] != matrix[second])
+    return differences / pair_count / length * 100
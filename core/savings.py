@@ -0,0 +1,96 @@
+"""
+Thuật toán tiết kiệm Clarke-Wright (savings) cho bài toán CVRP
+Dùng để khởi tạo MIN-MAX ACO và gieo quần thể ban đầu cho GA
+"""
+
+import numpy as np
+
+
+def compute_savings(distances):
+    """
+    Tính và sắp xếp các giá trị savings cho mọi cặp khách hàng (vector hóa)
+
+    Tham số:
+    distances -- Ma trận khoảng cách (nút 0 là depot)
+
+    Trả về:
+    Ba mảng (savings, i, j) sắp xếp giảm dần theo savings, rồi theo i, j
+    """
+    n = len(distances)
+    depot = distances[0, 1:]
+    rows, cols = np.triu_indices(n - 1, k=1)
+
+    # Savings = dist(0,i) + dist(0,j) - dist(i,j)
+    savings = depot[rows] + depot[cols] - distances[rows + 1, cols + 1]
+
+    order = np.lexsort((cols, rows, savings))[::-1]
+    return savings[order], rows[order] + 1, cols[order] + 1
+
+
+def clarke_wright_savings(cvrp):
+    """
+    Xây dựng giải pháp bằng phương pháp savings của Clarke-Wright
+
+    Giữ ánh xạ khách hàng -> tuyến và tải trọng của từng tuyến, nên mỗi lần hợp nhất
+    chỉ cập nhật các khách hàng của tuyến bị gộp thay vì quét lại toàn bộ các tuyến.
+
+    Tham số:
+    cvrp -- Đối tượng CVRP
+
+    Trả về:
+    Danh sách các tuyến đường
+    """
+    n = len(cvrp.customers)
+    if n <= 1:
+        return []
+
+    demands = cvrp.demands.tolist()
+    capacity = cvrp.capacity
+
+    # Ban đầu mỗi khách hàng có một tuyến riêng, tuyến k phục vụ khách hàng k
+    routes = {i: [i] for i in range(1, n)}
+    loads = {i: demands[i] for i in range(1, n)}
+    customer_to_route = list(range(n))
+
+    _, first, second = compute_savings(cvrp.distances)
+
+    # Hợp nhất các tuyến đường dựa trên savings
+    for i, j in zip(first.tolist(), second.tolist()):
+        route_i_id = customer_to_route[i]
+        route_j_id = customer_to_route[j]
+
+        # Nếu i và j đã ở cùng tuyến đường, bỏ qua
+        if route_i_id == route_j_id:
+            continue
+
+        route_i = routes[route_i_id]
+        route_j = routes[route_j_id]
+
+        # Chỉ hợp nhất khi i và j đều là đầu/cuối của tuyến
+        if (i != route_i[0] and i != route_i[-1]) or (j != route_j[0] and j != route_j[-1]):
+            continue
+
+        # Kiểm tra ràng buộc dung lượng bằng tải trọng đã lưu
+        total_demand = loads[route_i_id] + loads[route_j_id]
+        if total_demand > capacity:
+            continue
+
+        # Đảo chiều để i ở cuối tuyến i và j ở đầu tuyến j
+        if i == route_i[0]:
+            route_i.reverse()
+        if j == route_j[-1]:
+            route_j.reverse()
+
+        route_i.extend(route_j)
+        loads[route_i_id] = total_demand
+        for k in route_j:
+            customer_to_route[k] = route_i_id
+        del routes[route_j_id]
+        del loads[route_j_id]
+
+    return [routes[route_id] for route_id in sorted(routes)]
+
+
+def solution_to_chromosome(solution):
+    """Nối các tuyến của một giải pháp thành một nhiễm sắc thể (hoán vị khách hàng)"""
+    return [customer for route in solution for customer in route]
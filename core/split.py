@@ -0,0 +1,172 @@
+"""
+Thuật toán Split (Prins) cho bài toán CVRP
+Chia tối ưu một hoán vị khách hàng (giant tour) thành các tuyến thỏa mãn sức chứa
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+def split_state(chromosome, distances, demands, capacity, previous=None, start=0):
+    """
+    Tính trạng thái Split (nhãn và các tổng tiền tố) cho một giant tour trong O(n) bằng hàng đợi hai đầu
+
+    Nhãn V[i] là chi phí nhỏ nhất để phục vụ i khách hàng đầu tiên của tour. Với tổng
+    tiền tố khoảng cách D và tải trọng Q, chi phí tuyến phục vụ các vị trí j+1..i là
+    d(0, t[j+1]) + D[i] - D[j+1] + d(t[i], 0), nên V[i] = min_j (V[j] + d(0, t[j+1]) - D[j+1])
+    + D[i] + d(t[i], 0) với các j thỏa Q[i] - Q[j] <= capacity (cửa sổ trượt).
+
+    V[0..k] chỉ phụ thuộc k khách hàng đầu tiên, nên khi tour khác trạng thái trước đó
+    (previous) từ vị trí start trở đi, các nhãn V[0..start] được dùng lại và chỉ phần đuôi
+    được tính lại; hàng đợi tại vị trí start được dựng lại từ các nhãn đã có.
+
+    Tham số:
+    chromosome -- Giant tour (hoán vị khách hàng)
+    distances -- Ma trận khoảng cách
+    demands -- Mảng nhu cầu của các nút
+    capacity -- Sức chứa phương tiện
+    previous -- Trạng thái Split của một tour trùng với chromosome ở start vị trí đầu (None = tính từ đầu)
+    start -- Vị trí đầu tiên (tính từ 0) mà chromosome có thể khác tour của previous; mọi vị trí
+             nhỏ hơn đều trùng (một cận dưới cũng đúng, chỉ tính lại nhiều hơn)
+
+    Trả về:
+    Bộ mảng NumPy (V, pred, D, Q, depot): nhãn chi phí, vị trí kết thúc tuyến trước đó, tổng
+    tiền tố khoảng cách, tổng tiền tố tải trọng và khoảng cách tới depot cho mỗi vị trí 0..m
+    """
+    tour = np.asarray(chromosome, dtype=np.intp)
+    m = len(tour)
+    if previous is None:
+        start = 0
+    start = min(start, m)
+
+    labels = np.zeros(m + 1)
+    pred = np.zeros(m + 1, dtype=np.intp)
+    dist_prefix = np.zeros(m + 1)
+    load_prefix = np.zeros(m + 1)
+    depot = np.zeros(m + 2)
+
+    # Phần đầu [0..start] lấy từ trạng thái trước bằng một phép gán khối cho mỗi mảng
+    if start > 0:
+        for array, reused in zip((labels, pred, dist_prefix, load_prefix, depot), previous):
+            array[:start + 1] = reused[:start + 1]
+
+    # Tổng tiền tố của phần đuôi, cộng dồn tiếp từ giá trị tại start để có cùng thứ tự cộng
+    # (và cùng kết quả dấu phẩy động) như khi tính từ đầu
+    first = max(start, 1)
+    if m > first:
+        edges = distances[tour[first - 1:-1], tour[first:]]
+        dist_prefix[first + 1:] = np.cumsum(np.concatenate(([dist_prefix[first]], edges)))[1:]
+    if m > start:
+        load_prefix[start + 1:] = np.cumsum(np.concatenate(([load_prefix[start]], demands[tour[start:]])))[1:]
+        depot[start + 1:m + 1] = distances[0, tour[start:]]
+
+    # Vòng lặp chỉ đọc các vị trí từ lo trở đi: trước lo không còn điểm bắt đầu nào đủ sức
+    # chứa cho vị trí start, nên các danh sách dưới đây dài O(phần đuôi + một tuyến)
+    lo = int(np.searchsorted(load_prefix[:start + 1], load_prefix[start] - capacity, side='left'))
+    local_labels = labels[lo:].tolist()
+    local_pred = pred[lo:].tolist()
+    local_dist = dist_prefix[lo:].tolist()
+    local_load = load_prefix[lo:].tolist()
+    local_depot = depot[lo:].tolist()
+    local_start = start - lo
+    local_end = m - lo
+
+    # Phần chi phí chỉ phụ thuộc điểm bắt đầu j của tuyến: V[j] + d(0, t[j+1]) - D[j+1], tính
+    # một lần khi V[j] đã biết (j tính từ lo, j < m)
+    known = min(start, m - 1) + 1
+    start_costs = ((labels[lo:known] + depot[lo + 1:known + 1]) - dist_prefix[lo + 1:known + 1]).tolist()
+    start_costs += [0.0] * (local_end - len(start_costs))
+
+    if start == 0:
+        window = deque([0])
+    else:
+        # Hàng đợi sau vị trí start: các j còn đủ sức chứa, giữ j nếu rẻ hơn hẳn mọi j sau nó
+        window = deque()
+        best_later = float('inf')
+        for j in range(local_start, -1, -1):
+            cost_j = start_costs[j] if j < local_end else best_later
+            if cost_j < best_later:
+                window.appendleft(j)
+                best_later = cost_j
+
+    for i in range(local_start + 1, local_end + 1):
+        # Bỏ các điểm bắt đầu làm tuyến vượt quá sức chứa
+        load_i = local_load[i]
+        while window and load_i - local_load[window[0]] > capacity:
+            window.popleft()
+
+        # Khách hàng có nhu cầu vượt sức chứa được phục vụ bằng tuyến riêng
+        j = window[0] if window else i - 1
+        label = start_costs[j] + local_dist[i] + local_depot[i]
+        local_labels[i] = label
+        local_pred[i] = j + lo
+
+        if i < local_end:
+            cost_i = label + local_depot[i + 1] - local_dist[i + 1]
+            start_costs[i] = cost_i
+            while window and start_costs[window[-1]] >= cost_i:
+                window.pop()
+            window.append(i)
+
+    labels[start + 1:] = local_labels[local_start + 1:]
+    pred[start + 1:] = local_pred[local_start + 1:]
+    return labels, pred, dist_prefix, load_prefix, depot
+
+
+def split_labels(chromosome, distances, demands, capacity):
+    """
+    Tính nhãn Split tối ưu cho một giant tour trong O(n) (xem split_state)
+
+    Tham số:
+    chromosome -- Giant tour (hoán vị khách hàng)
+    distances -- Ma trận khoảng cách
+    demands -- Mảng nhu cầu của các nút
+    capacity -- Sức chứa phương tiện
+
+    Trả về:
+    Cặp (V, pred): nhãn chi phí và vị trí kết thúc tuyến trước đó cho mỗi vị trí 0..m
+    """
+    labels, pred, _, _, _ = split_state(chromosome, distances, demands, capacity)
+    return labels, pred
+
+
+def routes_from_labels(chromosome, pred, end=None):
+    """
+    Dựng lại các tuyến từ mảng pred của Split
+
+    Tham số:
+    chromosome -- Giant tour
+    pred -- Vị trí kết thúc tuyến trước đó cho mỗi vị trí
+    end -- Vị trí cuối cùng (mặc định là cuối tour)
+
+    Trả về:
+    Danh sách các tuyến theo thứ tự trong tour
+    """
+    routes = []
+    i = len(chromosome) if end is None else end
+    while i > 0:
+        j = int(pred[i])
+        routes.append(list(chromosome[j:i]))
+        i = j
+    routes.reverse()
+    return routes
+
+
+def split_giant_tour(chromosome, distances, demands, capacity):
+    """
+    Chia giant tour thành các tuyến tối ưu (Split của Prins)
+
+    Tham số:
+    chromosome -- Giant tour (hoán vị khách hàng)
+    distances -- Ma trận khoảng cách
+    demands -- Mảng nhu cầu của các nút
+    capacity -- Sức chứa phương tiện
+
+    Trả về:
+    Cặp (danh sách tuyến, tổng chi phí)
+    """
+    if len(chromosome) == 0:
+        return [], 0.0
+    labels, pred = split_labels(chromosome, distances, demands, capacity)
+    return routes_from_labels(chromosome, pred), float(labels[-1])
@@ -0,0 +1,68 @@
+"""
+Chạy một cấu hình thuật toán với một hạt giống, dùng cho thử nghiệm tham số song song
+Mỗi tác vụ (cấu hình, lần chạy) độc lập và có hạt giống xác định, nên kết quả không phụ
+thuộc số tiến trình hay thứ tự hoàn thành
+"""
+
+import random
+import time
+import traceback
+
+import numpy as np
+
+from .aco import ACO_CVRP
+from .genetic import GeneticAlgorithm_CVRP
+
+
+ALGORITHMS = {
+    "ACO": ACO_CVRP,
+    "GA": GeneticAlgorithm_CVRP,
+}
+
+# Bài toán CVRP trong mỗi tiến trình con, gửi một lần khi khởi tạo
+_worker_cvrp = None
+
+
+def init_sweep_worker(cvrp):
+    """Khởi tạo tiến trình con (hoặc luồng chạy tuần tự) với bài toán CVRP"""
+    global _worker_cvrp
+    _worker_cvrp = cvrp
+
+
+def task_seed(base_seed, config_idx, run):
+    """Hạt giống xác định của tác vụ (config_idx, run)"""
+    return int(np.random.SeedSequence([base_seed, config_idx, run]).generate_state(1)[0])
+
+
+def run_sweep_task(task):
+    """
+    Chạy một cấu hình một lần
+
+    Tham số:
+    task -- Bộ (config_idx, run, algorithm_type, config, seed)
+
+    Trả về:
+    Từ điển gồm chỉ số tác vụ, chi phí tốt nhất, lịch sử chi phí tốt nhất/trung bình theo vòng
+    lặp, thời gian chạy và thông báo lỗi (None nếu thành công)
+    """
+    config_idx, run, algorithm_type, config, seed = task
+    outcome = {'config_idx': config_idx, 'run': run, 'seed': seed, 'error': None}
+    try:
+        random.seed(seed)
+        np.random.seed(seed)
+        algorithm = ALGORITHMS[algorithm_type](_worker_cvrp, **config)
+
+        start_time = time.time()
+        best_solution, best_cost = algorithm.run()
+        outcome['time'] = time.time() - start_time
+
+        # Vòng lặp ACO đánh số từ 1, thế hệ GA từ 0 (như trong dữ liệu step_callback)
+        first_iteration = 1 if algorithm_type == "ACO" else 0
+        outcome['valid'] = best_solution is not None
+        outcome['best_cost'] = float(best_cost) if best_cost is not None else None
+        outcome['costs'] = [float(cost) for cost in algorithm.cost_history]
+        outcome['avg_costs'] = [float(cost) for cost in algorithm.avg_cost_history]
+        outcome['iterations'] = list(range(first_iteration, first_iteration + len(algorithm.cost_history)))
+    except Exception as e:
+        outcome['error'] = f"{e}\n{traceback.format_exc()}"
+    return outcome
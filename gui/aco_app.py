@@ -15,6 +15,7 @@ import os
 import datetime
 
 from core import CVRP, ACO_CVRP
+from core.callbacks import LatestValue
 from .visualization import ACOVisualization
 from .tooltip import ToolTip
 
@@ -888,6 +889,7 @@ class AntColonyApp:
 
     def run_algorithm(self):
         """Chạy thuật toán trong một luồng riêng"""
+        self.step_buffer = LatestValue()
         try:
             self.algorithm.run(
                 callback=self.algorithm_finished,
@@ -900,13 +902,6 @@ class AntColonyApp:
 
     def algorithm_step(self, data):
         """Hàm gọi lại cho mỗi bước của thuật toán"""
-        # Cập nhật giao diện trong luồng chính
-        self.root.after(0, lambda: self.update_visualization(data))
-
-        # Cập nhật thanh tiến trình
-        progress = data.get('progress', 0)
-        self.root.after(0, lambda: self.update_progress(progress))
-
         # Cập nhật biểu đồ hội tụ
         iteration = data.get('iteration', 0)
         best_cost = data.get('best_cost', float('inf'))
@@ -929,14 +924,26 @@ class AntColonyApp:
             'min_pheromone': min_pheromone
         })
 
-        self.root.after(0, lambda: self.update_analysis(iteration))
-
-        # Cập nhật vòng lặp hiện tại
-        self.root.after(0, lambda: self.iteration_var.set(f"{iteration}/{self.iterations}"))
+        # Cập nhật giao diện trong luồng chính; các bước tới khi giao diện chưa kịp vẽ được
+        # gộp lại, chỉ bước mới nhất được vẽ
+        if self.step_buffer.put(data):
+            self.root.after(0, self.show_latest_step)
 
         # Độ trễ dựa trên tốc độ mô phỏng
         time.sleep(1.0 - self.speed_var.get())
 
+    def show_latest_step(self):
+        """Vẽ bước mới nhất của thuật toán (chạy trong luồng chính)"""
+        data = self.step_buffer.take()
+        if data is None:
+            return
+
+        iteration = data.get('iteration', 0)
+        self.update_visualization(data)
+        self.update_progress(data.get('progress', 0))
+        self.update_analysis(iteration)
+        self.iteration_var.set(f"{iteration}/{self.iterations}")
+
     def update_progress(self, progress):
         """Cập nhật thanh tiến trình"""
         self.progress.config(value=progress * 100)
@@ -18,6 +18,7 @@ import datetime
 import psutil  # Thêm thư viện để quản lý tài nguyên hệ thống
 
 from core import CVRP, ACO_CVRP, GeneticAlgorithm_CVRP
+from core.callbacks import LatestValue
 from .visualization import ACOVisualization, GeneticVisualization
 from .tooltip import ToolTip
 
@@ -101,6 +102,8 @@ class ComparisonApp:
         # Dữ liệu phân tích
         self.aco_convergence_data = []
         self.ga_convergence_data = []
+        self.aco_step_buffer = LatestValue()
+        self.ga_step_buffer = LatestValue()
         self.aco_best_solution = None
         self.ga_best_solution = None
         self.aco_best_cost = float('inf')
@@ -690,6 +693,8 @@ class ComparisonApp:
         # Thiết lập lại dữ liệu phân tích
         self.aco_convergence_data = []
         self.ga_convergence_data = []
+        self.aco_step_buffer = LatestValue()
+        self.ga_step_buffer = LatestValue()
         self.aco_best_solution = None
         self.ga_best_solution = None
         self.aco_best_cost = float('inf')
@@ -1027,8 +1032,12 @@ class ComparisonApp:
                 if iteration % 5 == 0 or iteration == 1:  # In mỗi 5 vòng lặp để tránh quá nhiều output
                     print(f"[ACO] Vòng lặp {iteration}/{self.aco_iterations} - Chi phí hiện tại: {data['best_cost']:.2f}")
                 
-                # Xử lý dữ liệu trong thread chính
-                self.root.after(0, lambda: self._handle_aco_step_data(data))
+                # Xử lý dữ liệu trong thread chính; chỉ lên lịch khi bộ đệm đang trống, các bước
+                # đến trước khi giao diện kịp xử lý được gộp lại thành bước mới nhất
+                self.aco_convergence_data.append(data['best_cost'])
+                self.aco_pure_computation_time += data.get('computation_time', 0)
+                if self.aco_step_buffer.put(data):
+                    self.root.after(0, self._handle_aco_step_data)
                 # Kiểm tra dừng
                 return not self.is_running
             
@@ -1044,19 +1053,15 @@ class ComparisonApp:
             print(f"[ERROR] Lỗi khi chạy ACO: {str(e)}")
             self.root.after(0, lambda: messagebox.showerror("Lỗi ACO", f"Lỗi khi chạy thuật toán ACO: {str(e)}"))
     
-    def _handle_aco_step_data(self, data):
-        """Xử lý dữ liệu bước từ ACO trong thread chính"""
-        if not self.is_running:
+    def _handle_aco_step_data(self):
+        """Xử lý bước mới nhất từ ACO trong thread chính"""
+        data = self.aco_step_buffer.take()
+        if not self.is_running or data is None:
             return
             
         # Cập nhật dữ liệu
         self.aco_best_solution = data['best_solution']
         self.aco_best_cost = data['best_cost']
-        self.aco_convergence_data.append(data['best_cost'])
-        
-        # Cộng dồn thời gian tính toán thuần túy
-        if 'computation_time' in data:
-            self.aco_pure_computation_time += data['computation_time']
         
         # Cập nhật giao diện
         self.update_aco_visualization(data)
@@ -1119,8 +1124,12 @@ class ComparisonApp:
                 if generation % 5 == 0 or generation == 1:  # In mỗi 5 thế hệ để tránh quá nhiều output
                     print(f"[GA] Thế hệ {generation}/{self.ga_iterations} - Chi phí hiện tại: {data['best_cost']:.2f}")
                 
-                # Xử lý dữ liệu trong thread chính
-                self.root.after(0, lambda: self._handle_ga_step_data(data))
+                # Xử lý dữ liệu trong thread chính; chỉ lên lịch khi bộ đệm đang trống, các bước
+                # đến trước khi giao diện kịp xử lý được gộp lại thành bước mới nhất
+                self.ga_convergence_data.append(data['best_cost'])
+                self.ga_pure_computation_time += data.get('computation_time', 0)
+                if self.ga_step_buffer.put(data):
+                    self.root.after(0, self._handle_ga_step_data)
                 # Kiểm tra dừng
                 return not self.is_running
             
@@ -1136,19 +1145,15 @@ class ComparisonApp:
             print(f"[ERROR] Lỗi khi chạy GA: {str(e)}")
             self.root.after(0, lambda: messagebox.showerror("Lỗi GA", f"Lỗi khi chạy thuật toán GA: {str(e)}"))
     
-    def _handle_ga_step_data(self, data):
-        """Xử lý dữ liệu bước từ GA trong thread chính"""
-        if not self.is_running:
+    def _handle_ga_step_data(self):
+        """Xử lý bước mới nhất từ GA trong thread chính"""
+        data = self.ga_step_buffer.take()
+        if not self.is_running or data is None:
             return
             
         # Cập nhật dữ liệu
         self.ga_best_solution = data['best_solution']
         self.ga_best_cost = data['best_cost']
-        self.ga_convergence_data.append(data['best_cost'])
-        
-        # Cộng dồn thời gian tính toán thuần túy
-        if 'computation_time' in data:
-            self.ga_pure_computation_time += data['computation_time']
         
         # Cập nhật giao diện
         self.update_ga_visualization(data)
@@ -1200,7 +1205,8 @@ class ComparisonApp:
             self.cvrp,
             data['best_solution'],
             data['best_cost'],
-            data.get('population', None)
+            data.get('population', None),
+            data.get('fitness_values', None)
         )
 
     def update_convergence_chart(self):
@@ -15,6 +15,7 @@ import os
 import datetime
 
 from core import CVRP, GeneticAlgorithm_CVRP
+from core.callbacks import LatestValue
 from .visualization import GeneticVisualization
 from .tooltip import ToolTip
 
@@ -835,6 +836,7 @@ class GeneticApp:
 
     def run_algorithm(self):
         """Chạy thuật toán trong một luồng riêng"""
+        self.step_buffer = LatestValue()
         try:
             self.algorithm.run(
                 callback=self.algorithm_finished,
@@ -847,13 +849,6 @@ class GeneticApp:
 
     def algorithm_step(self, data):
         """Hàm gọi lại cho mỗi bước của thuật toán"""
-        # Cập nhật giao diện trong luồng chính
-        self.root.after(0, lambda: self.update_visualization(data))
-
-        # Cập nhật thanh tiến trình
-        progress = data.get('progress', 0)
-        self.root.after(0, lambda: self.update_progress(progress))
-
         # Cập nhật biểu đồ hội tụ
         generation = data.get('generation', 0)
         best_cost = data.get('best_cost', float('inf'))
@@ -870,14 +865,26 @@ class GeneticApp:
             'diversity': diversity
         })
 
-        self.root.after(0, lambda: self.update_analysis(generation))
-
-        # Cập nhật thế hệ hiện tại
-        self.root.after(0, lambda: self.generation_var.set(f"{generation}/{self.max_generations}"))
+        # Cập nhật giao diện trong luồng chính; các bước tới khi giao diện chưa kịp vẽ được
+        # gộp lại, chỉ bước mới nhất được vẽ
+        if self.step_buffer.put(data):
+            self.root.after(0, self.show_latest_step)
 
         # Độ trễ dựa trên tốc độ mô phỏng
         time.sleep(1.0 - self.speed_var.get())
 
+    def show_latest_step(self):
+        """Vẽ bước mới nhất của thuật toán (chạy trong luồng chính)"""
+        data = self.step_buffer.take()
+        if data is None:
+            return
+
+        generation = data.get('generation', 0)
+        self.update_visualization(data)
+        self.update_progress(data.get('progress', 0))
+        self.update_analysis(generation)
+        self.generation_var.set(f"{generation}/{self.max_generations}")
+
     def update_progress(self, progress):
         """Cập nhật thanh tiến trình"""
         self.progress.config(value=progress * 100)
@@ -141,9 +141,9 @@ class GeneticVisualization(CVRPVisualization):
         cost = data['cost']
         best_solution = data['best_solution']
         best_cost = data['best_cost']
-        population = data['population']
         fitness_values = data['fitness_values']
-        cost_history = data['cost_history']
+        # Lịch sử tới đúng thế hệ này, đọc qua đối tượng lịch sử thay vì bản sao ở mỗi bước
+        cost_history = data['history'].get('cost_history', end=data['history_length'])
 
         # Save data for export
         self.best_solution = best_solution
@@ -234,7 +234,7 @@ class GeneticVisualization(CVRPVisualization):
 
         self.canvas.draw()
 
-    def update(self, cvrp, solution, cost, population=None):
+    def update(self, cvrp, solution, cost, population=None, fitness_values=None):
         """
         Update method that matches the signature in comparison_app.py
         
@@ -243,6 +243,7 @@ class GeneticVisualization(CVRPVisualization):
         solution -- Giải pháp hiện tại
         cost -- Chi phí hiện tại
         population -- Quần thể hiện tại (tùy chọn)
+        fitness_values -- Chi phí của các cá thể (tùy chọn; khi có thì không cần giải mã population)
         """
         # Save data for export
         self.best_solution = solution
@@ -310,7 +311,7 @@ class GeneticVisualization(CVRPVisualization):
         self.status_text.set_text(f'Current cost: {cost:.2f}')
         
         # Update population fitness chart if provided
-        if population is not None:
+        if population is not None or fitness_values is not None:
             # Tạo fitness_bars nếu chưa có
             if not hasattr(self, 'fitness_bars'):
                 # Khởi tạo biểu đồ phân phối fitness
@@ -320,13 +321,16 @@ class GeneticVisualization(CVRPVisualization):
                 self.axs[1, 0].set_ylabel('Fitness (cost)')
                 
                 # Tạo các thanh biểu đồ
-                pop_size = min(len(population), 50)  # Giới hạn hiển thị 50 cá thể
+                individuals = fitness_values if fitness_values is not None else population
+                pop_size = min(len(individuals), 50)  # Giới hạn hiển thị 50 cá thể
                 self.fitness_bars = self.axs[1, 0].bar(range(pop_size), 
                                                       [0] * pop_size,
                                                       color='skyblue')
             
-            # Tạo fitness values giả lập từ population
-            if isinstance(population, list) and len(population) > 0:
+            if fitness_values is not None:
+                fitness_values = list(fitness_values)[:len(self.fitness_bars)]
+            elif isinstance(population, list) and len(population) > 0:
+                # Tạo fitness values giả lập từ population
                 # Tính toán fitness values (chi phí) cho mỗi cá thể trong quần thể
                 fitness_values = []
                 for indiv in population[:len(self.fitness_bars)]:
@@ -336,26 +340,21 @@ class GeneticVisualization(CVRPVisualization):
                         # Tính chi phí
                         indiv_cost = self.cvrp.calculate_solution_cost(indiv_solution)
                         fitness_values.append(indiv_cost)
+            
+            # Sắp xếp và hiển thị
+            if fitness_values:
+                sorted_fitness = sorted(fitness_values)
+                max_fitness = max(sorted_fitness)
+                
+                # Cập nhật chiều cao của các thanh
+                for i, fitness in enumerate(sorted_fitness[:len(self.fitness_bars)]):
+                    self.fitness_bars[i].set_height(fitness)
                 
-                # Sắp xếp và hiển thị
-                if fitness_values:
-                    sorted_fitness = sorted(fitness_values)
-                    max_fitness = max(sorted_fitness)
-                    
-                    # Cập nhật chiều cao của các thanh
-                    for i, fitness in enumerate(sorted_fitness[:len(self.fitness_bars)]):
-                        self.fitness_bars[i].set_height(fitness)
-                    
-                    # Cập nhật giới hạn trục y
-                    self.axs[1, 0].set_ylim(0, max_fitness * 1.1)
-                    self.axs[1, 0].set_title(f'Fitness Distribution (Avg: {np.mean(sorted_fitness):.2f})')
-                else:
-                    # Nếu không có dữ liệu fitness, đặt giá trị mặc định
-                    for i in range(len(self.fitness_bars)):
-                        self.fitness_bars[i].set_height(cost * (0.9 + 0.2 * random.random()))
-                    self.axs[1, 0].set_ylim(0, cost * 1.5)
+                # Cập nhật giới hạn trục y
+                self.axs[1, 0].set_ylim(0, max_fitness * 1.1)
+                self.axs[1, 0].set_title(f'Fitness Distribution (Avg: {np.mean(sorted_fitness):.2f})')
             else:
-                # Nếu không có dữ liệu quần thể hợp lệ, sử dụng giá trị mặc định
+                # Nếu không có dữ liệu fitness hợp lệ, đặt giá trị mặc định
                 for i in range(len(self.fitness_bars)):
                     self.fitness_bars[i].set_height(cost * (0.9 + 0.2 * random.random()))
                 self.axs[1, 0].set_ylim(0, cost * 1.5)
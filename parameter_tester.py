@@ -10,6 +10,7 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 import pandas as pd
 import threading
+import multiprocessing
 import os
 import json
 import time
@@ -19,6 +20,14 @@ from datetime import datetime
 from core.cvrp import CVRP
 from core.aco import ACO_CVRP
 from core.genetic import GeneticAlgorithm_CVRP
+from core.callbacks import LatestValue
+from core.sweep import init_sweep_worker, run_sweep_task, task_seed
+
+# Các thiết lập của lần thử nghiệm (không phải tham số thuật toán)
+SWEEP_SETTINGS = ("num_runs", "sweep_workers", "sweep_seed")
+
+# Chu kỳ (giây) kiểm tra yêu cầu dừng khi chờ kết quả từ các tiến trình con
+POLL_INTERVAL = 0.2
 
 class ParameterTester(tk.Tk):
     def __init__(self):
@@ -37,6 +46,7 @@ class ParameterTester(tk.Tk):
         self.running = False
         self.lock = threading.Lock()
         self.current_experiment = None
+        self.chart_buffer = LatestValue()
         
         # Danh sách cấu hình thử nghiệm
         self.aco_test_configs = []
@@ -276,6 +286,14 @@ class ParameterTester(tk.Tk):
         self.parameter_vars["num_runs"] = tk.IntVar(value=3)
         ttk.Entry(self.parameter_frame, textvariable=self.parameter_vars["num_runs"], width=10).grid(row=15, column=1, padx=5, pady=3)
         
+        ttk.Label(self.parameter_frame, text="Số tiến trình song song:").grid(row=16, column=0, sticky=tk.W, padx=5, pady=3)
+        self.parameter_vars["sweep_workers"] = tk.IntVar(value=os.cpu_count() or 1)
+        ttk.Entry(self.parameter_frame, textvariable=self.parameter_vars["sweep_workers"], width=10).grid(row=16, column=1, padx=5, pady=3)
+        
+        ttk.Label(self.parameter_frame, text="Hạt giống thử nghiệm:").grid(row=17, column=0, sticky=tk.W, padx=5, pady=3)
+        self.parameter_vars["sweep_seed"] = tk.IntVar(value=0)
+        ttk.Entry(self.parameter_frame, textvariable=self.parameter_vars["sweep_seed"], width=10).grid(row=17, column=1, padx=5, pady=3)
+        
     def update_configs_list(self):
         """Cập nhật danh sách cấu hình trong listbox"""
         self.configs_list.delete(0, tk.END)  # Xóa tất cả các mục hiện tại
@@ -304,10 +322,10 @@ class ParameterTester(tk.Tk):
             messagebox.showerror("Lỗi", "Không có tham số nào được cấu hình")
             return
             
-        # Lấy tham số hiện tại (loại bỏ số lần chạy)
+        # Lấy tham số hiện tại (loại bỏ các thiết lập thử nghiệm)
         config = {}
         for param, var in self.parameter_vars.items():
-            if param != "num_runs":
+            if param not in SWEEP_SETTINGS:
                 config[param] = var.get()
         
         # Thêm vào danh sách tương ứng
@@ -396,7 +414,7 @@ class ParameterTester(tk.Tk):
                 # Lấy giá trị cơ bản hiện tại
                 base_config = {}
                 for param, var in self.parameter_vars.items():
-                    if param != "num_runs":
+                    if param not in SWEEP_SETTINGS:
                         base_config[param] = var.get()
                 
                 # Phân tích giá trị tham số
@@ -501,7 +519,7 @@ class ParameterTester(tk.Tk):
                 # Lấy giá trị cơ bản hiện tại
                 base_config = {}
                 for param, var in self.parameter_vars.items():
-                    if param != "num_runs":
+                    if param not in SWEEP_SETTINGS:
                         base_config[param] = var.get()
                 
                 # Phân tích giá trị tham số
@@ -632,6 +650,14 @@ class ParameterTester(tk.Tk):
         except:
             messagebox.showerror("Lỗi", "Số lần chạy không hợp lệ")
             return
+        
+        # Số tiến trình và hạt giống gốc của các tác vụ
+        try:
+            workers = max(1, self.parameter_vars["sweep_workers"].get())
+            base_seed = self.parameter_vars["sweep_seed"].get()
+        except:
+            messagebox.showerror("Lỗi", "Số tiến trình hoặc hạt giống không hợp lệ")
+            return
             
         # Xóa danh sách kết quả cũ
         for item in self.result_tree.get_children():
@@ -640,300 +666,182 @@ class ParameterTester(tk.Tk):
         # Khởi chạy luồng thử nghiệm
         self.running = True
         self.results = []
-        experiment_thread = threading.Thread(target=self.run_experiment_thread, args=(configs, num_runs))
+        experiment_thread = threading.Thread(target=self.run_experiment_thread, args=(configs, num_runs, workers, base_seed))
         experiment_thread.daemon = True
         experiment_thread.start()
     
-    def run_experiment_thread(self, configs, num_runs):
+    def fix_config(self, algorithm_type, config, config_idx):
+        """Kiểm tra và khắc phục tham số của một cấu hình, trả về bản sao đã sửa"""
         try:
-            # Tổng số cấu hình
-            total_configs = len(configs)
-            
-            # Lưu kết quả tổng hợp
-            all_costs_history = []
-            all_avg_costs_history = []
-            all_iterations_history = []
-            all_config_names = []
+            # Tạo bản sao cấu hình để tránh thay đổi gốc
+            fixed_config = config.copy()
             
-            for config_idx, config in enumerate(configs):
-                if not self.running:
-                    break
-                    
-                algorithm_type = self.algorithm.get()
-                self.current_experiment = {
-                    'algorithm': algorithm_type,
-                    'config': config,
-                    'results': []
-                }
-                
-                config_name = f"{algorithm_type} {config_idx+1}"
-                all_config_names.append(config_name)
+            # Kiểm tra phạm vi giá trị
+            if algorithm_type == "ACO":
+                if "num_ants" in fixed_config and (fixed_config["num_ants"] <= 0 or fixed_config["num_ants"] > 1000):
+                    print(f"Cảnh báo: num_ants={fixed_config['num_ants']} nằm ngoài phạm vi hợp lệ (1-1000)")
+                    fixed_config["num_ants"] = max(1, min(fixed_config["num_ants"], 1000))
+                if "alpha" in fixed_config and fixed_config["alpha"] < 0:
+                    print(f"Cảnh báo: alpha={fixed_config['alpha']} không được âm")
+                    fixed_config["alpha"] = max(0, fixed_config["alpha"])
+                if "beta" in fixed_config and fixed_config["beta"] < 0:
+                    print(f"Cảnh báo: beta={fixed_config['beta']} không được âm")
+                    fixed_config["beta"] = max(0, fixed_config["beta"])
+                if "rho" in fixed_config and (fixed_config["rho"] <= 0 or fixed_config["rho"] >= 1):
+                    print(f"Cảnh báo: rho={fixed_config['rho']} nằm ngoài phạm vi hợp lệ (0-1)")
+                    fixed_config["rho"] = max(0.001, min(fixed_config["rho"], 0.999))
+                if "q" in fixed_config and fixed_config["q"] <= 0:
+                    print(f"Cảnh báo: q={fixed_config['q']} phải dương")
+                    fixed_config["q"] = max(1, fixed_config["q"])
+                if "max_iterations" in fixed_config and fixed_config["max_iterations"] <= 0:
+                    print(f"Cảnh báo: max_iterations={fixed_config['max_iterations']} phải dương")
+                    fixed_config["max_iterations"] = max(1, fixed_config["max_iterations"])
+                if "elitist_ants" in fixed_config and fixed_config["elitist_ants"] < 0:
+                    print(f"Cảnh báo: elitist_ants={fixed_config['elitist_ants']} không được âm")
+                    fixed_config["elitist_ants"] = max(0, fixed_config["elitist_ants"])
+            else:  # GA
+                if "population_size" in fixed_config and fixed_config["population_size"] <= 0:
+                    print(f"Cảnh báo: population_size={fixed_config['population_size']} phải dương")
+                    fixed_config["population_size"] = max(10, fixed_config["population_size"])
+                if "mutation_rate" in fixed_config and (fixed_config["mutation_rate"] < 0 or fixed_config["mutation_rate"] > 1):
+                    print(f"Cảnh báo: mutation_rate={fixed_config['mutation_rate']} nằm ngoài phạm vi hợp lệ (0-1)")
+                    fixed_config["mutation_rate"] = max(0, min(fixed_config["mutation_rate"], 1))
+                if "crossover_rate" in fixed_config and (fixed_config["crossover_rate"] < 0 or fixed_config["crossover_rate"] > 1):
+                    print(f"Cảnh báo: crossover_rate={fixed_config['crossover_rate']} nằm ngoài phạm vi hợp lệ (0-1)")
+                    fixed_config["crossover_rate"] = max(0, min(fixed_config["crossover_rate"], 1))
+                if "elitism" in fixed_config and (fixed_config["elitism"] < 0):
+                    print(f"Cảnh báo: elitism={fixed_config['elitism']} không được âm")
+                    fixed_config["elitism"] = max(0, fixed_config["elitism"])
+                if "elitism" in fixed_config and "population_size" in fixed_config and fixed_config["elitism"] >= fixed_config["population_size"]:
+                    print(f"Cảnh báo: elitism={fixed_config['elitism']} phải nhỏ hơn population_size={fixed_config['population_size']}")
+                    fixed_config["elitism"] = max(0, min(fixed_config["elitism"], fixed_config["population_size"] - 1))
+                if "tournament_size" in fixed_config and fixed_config["tournament_size"] <= 0:
+                    print(f"Cảnh báo: tournament_size={fixed_config['tournament_size']} phải dương")
+                    fixed_config["tournament_size"] = max(2, fixed_config["tournament_size"])
+                if "selection_method" in fixed_config and fixed_config["selection_method"] not in ["tournament", "roulette", "rank"]:
+                    print(f"Cảnh báo: selection_method={fixed_config['selection_method']} không hợp lệ")
+                    fixed_config["selection_method"] = "tournament"
+                if "crossover_method" in fixed_config and fixed_config["crossover_method"] not in ["ordered", "partially_mapped", "cycle"]:
+                    print(f"Cảnh báo: crossover_method={fixed_config['crossover_method']} không hợp lệ")
+                    fixed_config["crossover_method"] = "ordered"
+                if "mutation_method" in fixed_config and fixed_config["mutation_method"] not in ["swap", "insert", "inversion", "scramble"]:
+                    print(f"Cảnh báo: mutation_method={fixed_config['mutation_method']} không hợp lệ")
+                    fixed_config["mutation_method"] = "swap"
                 
-                # Thông báo cấu hình hiện tại
-                self.update_status(f"Đang chạy {algorithm_type} cấu hình {config_idx+1}/{total_configs}: {self.format_config_string(config)}")
-                
-                # Kiểm tra và khắc phục tham số cấu hình
-                try:
-                    # Tạo bản sao cấu hình để tránh thay đổi gốc
-                    fixed_config = config.copy()
+                # Xử lý trường hợp đặc biệt: partially_mapped có vấn đề với scramble
+                if fixed_config.get("crossover_method") == "partially_mapped" and fixed_config.get("mutation_method") == "scramble":
+                    print(f"Cảnh báo: Phát hiện tổ hợp không tương thích: crossover_method=partially_mapped và mutation_method=scramble")
+                    print(f"Đang chuyển sang phương pháp đột biến an toàn hơn: swap")
+                    fixed_config["mutation_method"] = "swap"
                     
-                    # Kiểm tra phạm vi giá trị
-                    if algorithm_type == "ACO":
-                        if "num_ants" in fixed_config and (fixed_config["num_ants"] <= 0 or fixed_config["num_ants"] > 1000):
-                            print(f"Cảnh báo: num_ants={fixed_config['num_ants']} nằm ngoài phạm vi hợp lệ (1-1000)")
-                            fixed_config["num_ants"] = max(1, min(fixed_config["num_ants"], 1000))
-                        if "alpha" in fixed_config and fixed_config["alpha"] < 0:
-                            print(f"Cảnh báo: alpha={fixed_config['alpha']} không được âm")
-                            fixed_config["alpha"] = max(0, fixed_config["alpha"])
-                        if "beta" in fixed_config and fixed_config["beta"] < 0:
-                            print(f"Cảnh báo: beta={fixed_config['beta']} không được âm")
-                            fixed_config["beta"] = max(0, fixed_config["beta"])
-                        if "rho" in fixed_config and (fixed_config["rho"] <= 0 or fixed_config["rho"] >= 1):
-                            print(f"Cảnh báo: rho={fixed_config['rho']} nằm ngoài phạm vi hợp lệ (0-1)")
-                            fixed_config["rho"] = max(0.001, min(fixed_config["rho"], 0.999))
-                        if "q" in fixed_config and fixed_config["q"] <= 0:
-                            print(f"Cảnh báo: q={fixed_config['q']} phải dương")
-                            fixed_config["q"] = max(1, fixed_config["q"])
-                        if "max_iterations" in fixed_config and fixed_config["max_iterations"] <= 0:
-                            print(f"Cảnh báo: max_iterations={fixed_config['max_iterations']} phải dương")
-                            fixed_config["max_iterations"] = max(1, fixed_config["max_iterations"])
-                        if "elitist_ants" in fixed_config and fixed_config["elitist_ants"] < 0:
-                            print(f"Cảnh báo: elitist_ants={fixed_config['elitist_ants']} không được âm")
-                            fixed_config["elitist_ants"] = max(0, fixed_config["elitist_ants"])
-                    else:  # GA
-                        if "population_size" in fixed_config and fixed_config["population_size"] <= 0:
-                            print(f"Cảnh báo: population_size={fixed_config['population_size']} phải dương")
-                            fixed_config["population_size"] = max(10, fixed_config["population_size"])
-                        if "mutation_rate" in fixed_config and (fixed_config["mutation_rate"] < 0 or fixed_config["mutation_rate"] > 1):
-                            print(f"Cảnh báo: mutation_rate={fixed_config['mutation_rate']} nằm ngoài phạm vi hợp lệ (0-1)")
-                            fixed_config["mutation_rate"] = max(0, min(fixed_config["mutation_rate"], 1))
-                        if "crossover_rate" in fixed_config and (fixed_config["crossover_rate"] < 0 or fixed_config["crossover_rate"] > 1):
-                            print(f"Cảnh báo: crossover_rate={fixed_config['crossover_rate']} nằm ngoài phạm vi hợp lệ (0-1)")
-                            fixed_config["crossover_rate"] = max(0, min(fixed_config["crossover_rate"], 1))
-                        if "elitism" in fixed_config and (fixed_config["elitism"] < 0):
-                            print(f"Cảnh báo: elitism={fixed_config['elitism']} không được âm")
-                            fixed_config["elitism"] = max(0, fixed_config["elitism"])
-                        if "elitism" in fixed_config and "population_size" in fixed_config and fixed_config["elitism"] >= fixed_config["population_size"]:
-                            print(f"Cảnh báo: elitism={fixed_config['elitism']} phải nhỏ hơn population_size={fixed_config['population_size']}")
-                            fixed_config["elitism"] = max(0, min(fixed_config["elitism"], fixed_config["population_size"] - 1))
-                        if "tournament_size" in fixed_config and fixed_config["tournament_size"] <= 0:
-                            print(f"Cảnh báo: tournament_size={fixed_config['tournament_size']} phải dương")
-                            fixed_config["tournament_size"] = max(2, fixed_config["tournament_size"])
-                        if "selection_method" in fixed_config and fixed_config["selection_method"] not in ["tournament", "roulette", "rank"]:
-                            print(f"Cảnh báo: selection_method={fixed_config['selection_method']} không hợp lệ")
-                            fixed_config["selection_method"] = "tournament"
-                        if "crossover_method" in fixed_config and fixed_config["crossover_method"] not in ["ordered", "partially_mapped", "cycle"]:
-                            print(f"Cảnh báo: crossover_method={fixed_config['crossover_method']} không hợp lệ")
-                            fixed_config["crossover_method"] = "ordered"
-                        if "mutation_method" in fixed_config and fixed_config["mutation_method"] not in ["swap", "insert", "inversion", "scramble"]:
-                            print(f"Cảnh báo: mutation_method={fixed_config['mutation_method']} không hợp lệ")
-                            fixed_config["mutation_method"] = "swap"
-                        
-                        # Xử lý trường hợp đặc biệt: partially_mapped có vấn đề với scramble
-                        if fixed_config.get("crossover_method") == "partially_mapped" and fixed_config.get("mutation_method") == "scramble":
-                            print(f"Cảnh báo: Phát hiện tổ hợp không tương thích: crossover_method=partially_mapped và mutation_method=scramble")
-                            print(f"Đang chuyển sang phương pháp đột biến an toàn hơn: swap")
-                            fixed_config["mutation_method"] = "swap"
-                            
-                    # Nếu đã sửa đổi cấu hình, thông báo
-                    if fixed_config != config:
-                        print(f"Đã sửa đổi cấu hình {config_idx+1} để đảm bảo các tham số hợp lệ")
-                        print(f"Cấu hình gốc: {config}")
-                        print(f"Cấu hình đã sửa: {fixed_config}")
-                except Exception as e:
-                    print(f"Lỗi khi kiểm tra tham số cấu hình {config_idx+1}: {str(e)}")
-                    fixed_config = config.copy()  # Sử dụng cấu hình gốc nếu có lỗi
-                
-                # Chạy nhiều lần với cấu hình hiện tại
-                all_best_costs = []
-                all_avg_costs = []
-                all_times = []
-                costs_history = []
-                avg_costs_history = []
-                iterations_history = []
-                
-                for run in range(num_runs):
+            # Nếu đã sửa đổi cấu hình, thông báo
+            if fixed_config != config:
+                print(f"Đã sửa đổi cấu hình {config_idx+1} để đảm bảo các tham số hợp lệ")
+                print(f"Cấu hình gốc: {config}")
+                print(f"Cấu hình đã sửa: {fixed_config}")
+        except Exception as e:
+            print(f"Lỗi khi kiểm tra tham số cấu hình {config_idx+1}: {str(e)}")
+            fixed_config = config.copy()  # Sử dụng cấu hình gốc nếu có lỗi
+        return fixed_config
+    
+    def sweep_outcomes(self, tasks, workers):
+        """
+        Chạy các tác vụ (cấu hình, lần chạy) và trả về kết quả theo thứ tự hoàn thành
+        
+        Với workers > 1, các tác vụ được gửi tới nhóm tiến trình con; việc dừng (self.running)
+        được kiểm tra mỗi POLL_INTERVAL giây và nhóm tiến trình bị hủy ngay khi dừng
+        """
+        if workers <= 1:
+            init_sweep_worker(self.cvrp)
+            for task in tasks:
+                if not self.running:
+                    return
+                yield run_sweep_task(task)
+            return
+        
+        # Dùng 'spawn' vì thử nghiệm chạy trong luồng nền của giao diện
+        context = multiprocessing.get_context("spawn")
+        pool = context.Pool(min(workers, len(tasks)), initializer=init_sweep_worker, initargs=(self.cvrp,))
+        try:
+            outcomes = pool.imap_unordered(run_sweep_task, tasks)
+            for _ in range(len(tasks)):
+                while True:
                     if not self.running:
-                        break
-                        
-                    self.update_status(f"Đang chạy {algorithm_type} cấu hình {config_idx+1}/{total_configs}, lần {run+1}/{num_runs}")
-                    
+                        return
                     try:
-                        # Tạo và chạy thuật toán với cấu hình đã sửa đổi
-                        if algorithm_type == "ACO":
-                            # Tạo thuật toán ACO với cấu hình
-                            algorithm = ACO_CVRP(self.cvrp, **fixed_config)
-                            
-                            # Lưu dữ liệu callback
-                            iteration_data = []
-                            
-                            def step_callback(data):
-                                try:
-                                    # Kiểm tra dữ liệu callback hợp lệ
-                                    if 'iteration' not in data or 'best_cost' not in data or 'avg_cost' not in data:
-                                        print(f"Cảnh báo: Dữ liệu callback ACO không đầy đủ: {data.keys()}")
-                                        return
-                                    
-                                    # Kiểm tra giá trị
-                                    if not isinstance(data['best_cost'], (int, float)) or not isinstance(data['avg_cost'], (int, float)):
-                                        print(f"Cảnh báo: Chi phí không phải là số: best_cost={data['best_cost']}, avg_cost={data['avg_cost']}")
-                                        return
-                                    
-                                    # Thêm dữ liệu vào lịch sử
-                                    iteration_data.append({
-                                        'iteration': data['iteration'],
-                                        'best_cost': data['best_cost'],
-                                        'avg_cost': data['avg_cost'],
-                                        'time': data['computation_time'] if 'computation_time' in data else 0
-                                    })
-                                except Exception as e:
-                                    print(f"Lỗi trong callback ACO: {str(e)}")
-                            
-                            start_time = time.time()
-                            try:
-                                # Bắt lỗi chi tiết trong quá trình chạy thuật toán
-                                best_solution, best_cost = algorithm.run(step_callback=step_callback)
-                            except Exception as specific_e:
-                                print(f"Lỗi cụ thể khi chạy ACO: {str(specific_e)}")
-                                import traceback
-                                traceback.print_exc()
-                                continue  # Bỏ qua lần chạy này nếu xảy ra lỗi
-                            end_time = time.time()
-                            
-                        else:  # GA
-                            # Tạo thuật toán GA với cấu hình
-                            try:
-                                algorithm = GeneticAlgorithm_CVRP(self.cvrp, **fixed_config)
-                            except Exception as e:
-                                print(f"Lỗi khi khởi tạo thuật toán GA: {str(e)}")
-                                continue  # Bỏ qua lần chạy này nếu không thể khởi tạo thuật toán
-                            
-                            # Lưu dữ liệu callback
-                            iteration_data = []
-                            
-                            def step_callback(data):
-                                try:
-                                    # Kiểm tra dữ liệu callback hợp lệ
-                                    if 'generation' not in data or 'best_cost' not in data or 'avg_cost' not in data:
-                                        print(f"Cảnh báo: Dữ liệu callback GA không đầy đủ: {data.keys()}")
-                                        return
-                                    
-                                    # Kiểm tra giá trị
-                                    if not isinstance(data['best_cost'], (int, float)) or not isinstance(data['avg_cost'], (int, float)):
-                                        print(f"Cảnh báo: Chi phí không phải là số: best_cost={data['best_cost']}, avg_cost={data['avg_cost']}")
-                                        return
-                                    
-                                    # Thêm dữ liệu vào lịch sử
-                                    iteration_data.append({
-                                        'iteration': data['generation'],
-                                        'best_cost': data['best_cost'],
-                                        'avg_cost': data['avg_cost'],
-                                        'time': data['computation_time'] if 'computation_time' in data else 0
-                                    })
-                                except Exception as e:
-                                    print(f"Lỗi trong callback GA: {str(e)}")
-                            
-                            start_time = time.time()
-                            try:
-                                # Bắt lỗi chi tiết trong quá trình chạy thuật toán
-                                best_solution, best_cost = algorithm.run(step_callback=step_callback)
-                            except Exception as specific_e:
-                                print(f"Lỗi cụ thể khi chạy GA: {str(specific_e)}")
-                                import traceback
-                                traceback.print_exc()
-                                continue  # Bỏ qua lần chạy này nếu xảy ra lỗi
-                            end_time = time.time()
-                        
-                        # Kiểm tra kết quả
-                        if best_solution is None or best_cost is None or not isinstance(best_cost, (int, float)):
-                            print(f"Lỗi: Kết quả không hợp lệ: best_solution={(type(best_solution))} best_cost={best_cost}")
-                            continue
-                            
-                        # Kiểm tra chi phí bất thường
-                        if best_cost <= 0 or best_cost > 10000:
-                            print(f"Cảnh báo: Chi phí bất thường: {best_cost}")
-                        
-                        # Lưu kết quả
-                        total_time = end_time - start_time
-                        
-                        # Kiểm tra iteration_data trống
-                        if not iteration_data:
-                            print(f"Cảnh báo: Không có dữ liệu lặp cho cấu hình {config_idx+1}, lần chạy {run+1}")
-                            continue
-                        
-                        # Tính toán các giá trị thống kê
-                        costs = [data['best_cost'] for data in iteration_data]
-                        avg_costs = [data['avg_cost'] for data in iteration_data]
-                        iterations = [data['iteration'] for data in iteration_data]
-                        
-                        costs_history.append(costs)
-                        avg_costs_history.append(avg_costs)
-                        iterations_history.append(iterations)
-                        all_best_costs.append(best_cost)
-                        all_avg_costs.append(np.mean(avg_costs))
-                        all_times.append(total_time)
-                        
-                        print(f"Hoàn thành cấu hình {config_idx+1}, lần chạy {run+1}: chi phí={best_cost:.2f}, thời gian={total_time:.2f}s")
-                    except Exception as e:
-                        print(f"Lỗi khi chạy cấu hình {config_idx+1}, lần chạy {run+1}: {str(e)}")
-                        print(f"Tham số cấu hình: {fixed_config}")
-                        # Tiếp tục với lần chạy tiếp theo
+                        outcome = outcomes.next(timeout=POLL_INTERVAL)
+                        break
+                    except multiprocessing.TimeoutError:
                         continue
+                yield outcome
+        finally:
+            pool.terminate()
+            pool.join()
+    
+    def run_experiment_thread(self, configs, num_runs, workers, base_seed):
+        try:
+            # Tổng số cấu hình
+            total_configs = len(configs)
+            algorithm_type = self.algorithm.get()
+            config_names = [f"{algorithm_type} {config_idx+1}" for config_idx in range(total_configs)]
+            
+            # Kiểm tra tham số và tạo một tác vụ cho mỗi (cấu hình, lần chạy) với hạt giống xác định
+            fixed_configs = [self.fix_config(algorithm_type, config, config_idx)
+                             for config_idx, config in enumerate(configs)]
+            tasks = [
+                (config_idx, run, algorithm_type, fixed_configs[config_idx], task_seed(base_seed, config_idx, run))
+                for config_idx in range(total_configs)
+                for run in range(num_runs)
+            ]
+            
+            # Kết quả của từng cấu hình: lần chạy -> kết quả, và số lần chạy đã kết thúc (kể cả lỗi)
+            config_runs = [{} for _ in range(total_configs)]
+            finished_runs = [0] * total_configs
+            completed_tasks = 0
+            
+            self.update_status(f"Đang chạy {len(tasks)} lần chạy {algorithm_type} ({total_configs} cấu hình) "
+                               f"với {workers} tiến trình")
+            
+            for outcome in self.sweep_outcomes(tasks, workers):
+                config_idx = outcome['config_idx']
+                run = outcome['run']
+                finished_runs[config_idx] += 1
+                completed_tasks += 1
+                self.update_status(f"Đã xong {completed_tasks}/{len(tasks)} lần chạy {algorithm_type}")
                 
-                # Kiểm tra nếu không có dữ liệu hợp lệ
-                if not all_best_costs:
-                    print(f"Cảnh báo: Không có dữ liệu hợp lệ cho cấu hình {config_idx+1}")
-                    continue
-                
-                # Thêm vào lịch sử chung cho biểu đồ so sánh
-                all_costs_history.append(costs_history)
-                all_avg_costs_history.append(avg_costs_history)
-                all_iterations_history.append(iterations_history)
-                
-                # Lưu kết quả tổng hợp cho mỗi cấu hình
-                if self.running:
-                    # Tính toán thống kê
-                    avg_best_cost = np.mean(all_best_costs)
-                    min_best_cost = np.min(all_best_costs)
-                    std_best_cost = np.std(all_best_costs)
-                    avg_time = np.mean(all_times)
-                    
-                    result = {
-                        'algorithm': algorithm_type,
-                        'config': fixed_config,  # Lưu cấu hình đã sửa đổi
-                        'original_config': config,  # Lưu cấu hình gốc
-                        'config_idx': config_idx + 1,
-                        'num_runs': num_runs,
-                        'best_costs': all_best_costs,
-                        'avg_costs': all_avg_costs,
-                        'times': all_times,
-                        'avg_best_cost': avg_best_cost,
-                        'min_best_cost': min_best_cost,
-                        'std_best_cost': std_best_cost,
-                        'avg_time': avg_time,
-                        'costs_history': costs_history,
-                        'avg_costs_history': avg_costs_history,
-                        'iterations_history': iterations_history
-                    }
-                    
-                    self.results.append(result)
+                # Kiểm tra kết quả; lần chạy lỗi vẫn được tính là đã kết thúc
+                if outcome['error'] is not None:
+                    print(f"Lỗi khi chạy cấu hình {config_idx+1}, lần chạy {run+1}: {outcome['error']}")
+                    print(f"Tham số cấu hình: {fixed_configs[config_idx]}")
+                elif not outcome['valid'] or outcome['best_cost'] is None:
+                    print(f"Lỗi: Kết quả không hợp lệ cho cấu hình {config_idx+1}, lần chạy {run+1}")
+                elif not outcome['costs']:
+                    print(f"Cảnh báo: Không có dữ liệu lặp cho cấu hình {config_idx+1}, lần chạy {run+1}")
+                else:
+                    # Kiểm tra chi phí bất thường
+                    best_cost = outcome['best_cost']
+                    if best_cost <= 0 or best_cost > 10000:
+                        print(f"Cảnh báo: Chi phí bất thường: {best_cost}")
                     
-                    # Cập nhật bảng kết quả
-                    self.update_result_table(config_idx+1, algorithm_type, fixed_config, avg_best_cost, np.mean(all_avg_costs), avg_time)
+                    print(f"Hoàn thành cấu hình {config_idx+1}, lần chạy {run+1}: chi phí={best_cost:.2f}, thời gian={outcome['time']:.2f}s")
+                    config_runs[config_idx][run] = outcome
                     
-                    # Cập nhật biểu đồ sau mỗi cấu hình
-                    try:
-                        self.update_comparison_chart(all_costs_history, all_iterations_history, all_config_names)
-                    except Exception as e:
-                        print(f"Lỗi khi cập nhật biểu đồ: {str(e)}")
+                    # Cập nhật bảng và biểu đồ ngay khi có kết quả mới (giá trị trung bình trên các lần chạy đã xong)
+                    result = self.config_result(algorithm_type, configs[config_idx], fixed_configs[config_idx],
+                                                config_idx, num_runs, config_runs[config_idx])
+                    self.update_result_table(config_idx+1, algorithm_type, fixed_configs[config_idx],
+                                             result['avg_best_cost'], np.mean(result['avg_costs']), result['avg_time'])
+                    self.update_comparison_chart(*self.chart_series(config_runs, config_names))
+                
+                # Lưu kết quả tổng hợp khi cấu hình đã chạy đủ số lần, nếu có ít nhất một lần thành công
+                if finished_runs[config_idx] == num_runs and config_runs[config_idx]:
+                    self.results.append(self.config_result(algorithm_type, configs[config_idx],
+                                                           fixed_configs[config_idx], config_idx, num_runs,
+                                                           config_runs[config_idx]))
             
             # Hoàn thành thử nghiệm
             if self.running:
-                # Hiển thị kết quả so sánh
-                try:
-                    self.update_comparison_chart(all_costs_history, all_iterations_history, all_config_names)
-                except Exception as e:
-                    print(f"Lỗi khi cập nhật biểu đồ kết quả: {str(e)}")
+                self.results.sort(key=lambda x: x['config_idx'])
                 
                 summary = f"Đã hoàn thành thử nghiệm {total_configs} cấu hình.\n"
                 if self.results:
@@ -958,13 +866,57 @@ class ParameterTester(tk.Tk):
         finally:
             self.running = False
     
+    def config_result(self, algorithm_type, config, fixed_config, config_idx, num_runs, runs):
+        """Tổng hợp kết quả các lần chạy đã xong của một cấu hình (theo thứ tự lần chạy)"""
+        outcomes = [runs[run] for run in sorted(runs)]
+        all_best_costs = [outcome['best_cost'] for outcome in outcomes]
+        all_avg_costs = [np.mean(outcome['avg_costs']) for outcome in outcomes]
+        all_times = [outcome['time'] for outcome in outcomes]
+        
+        return {
+            'algorithm': algorithm_type,
+            'config': fixed_config,  # Lưu cấu hình đã sửa đổi
+            'original_config': config,  # Lưu cấu hình gốc
+            'config_idx': config_idx + 1,
+            'num_runs': num_runs,
+            'seeds': [outcome['seed'] for outcome in outcomes],
+            'best_costs': all_best_costs,
+            'avg_costs': all_avg_costs,
+            'times': all_times,
+            'avg_best_cost': np.mean(all_best_costs),
+            'min_best_cost': np.min(all_best_costs),
+            'std_best_cost': np.std(all_best_costs),
+            'avg_time': np.mean(all_times),
+            'costs_history': [outcome['costs'] for outcome in outcomes],
+            'avg_costs_history': [outcome['avg_costs'] for outcome in outcomes],
+            'iterations_history': [outcome['iterations'] for outcome in outcomes]
+        }
+    
+    def chart_series(self, config_runs, config_names):
+        """Lịch sử chi phí (theo thứ tự lần chạy) của các cấu hình đã có kết quả, cho biểu đồ so sánh"""
+        all_costs_history = []
+        all_iterations_history = []
+        names = []
+        for runs, config_name in zip(config_runs, config_names):
+            if runs:
+                all_costs_history.append([runs[run]['costs'] for run in sorted(runs)])
+                all_iterations_history.append([runs[run]['iterations'] for run in sorted(runs)])
+                names.append(config_name)
+        return all_costs_history, all_iterations_history, names
+    
     def update_status(self, message):
         # Cập nhật trên luồng giao diện
         self.after(0, lambda: self.title(f"Phần mềm Thử nghiệm Tham số CVRP - {message}"))
     
     def update_comparison_chart(self, all_costs_history, all_iterations_history, config_names):
-        # Cập nhật biểu đồ trên luồng giao diện
-        self.after(0, lambda: self._draw_comparison_chart(all_costs_history, all_iterations_history, config_names))
+        # Cập nhật biểu đồ trên luồng giao diện; chỉ vẽ dữ liệu mới nhất khi kết quả đến dồn dập
+        if self.chart_buffer.put((all_costs_history, all_iterations_history, config_names)):
+            self.after(0, self._draw_latest_chart)
+    
+    def _draw_latest_chart(self):
+        series = self.chart_buffer.take()
+        if series is not None:
+            self._draw_comparison_chart(*series)
     
     def _draw_comparison_chart(self, all_costs_history, all_iterations_history, config_names):
         # Vẽ biểu đồ so sánh các cấu hình
@@ -1006,15 +958,23 @@ class ParameterTester(tk.Tk):
             # Định dạng tham số
             params_str = self.format_config_string(params)
             
-            # Chèn vào bảng
-            self.result_tree.insert('', 'end', values=(
+            values = (
                 config_idx,
                 algorithm,
                 params_str,
                 f"{avg_best_cost:.2f}",
                 f"{avg_avg_cost:.2f}",
                 f"{avg_time:.2f}"
-            ))
+            )
+            
+            # Mỗi cấu hình một dòng, cập nhật lại khi có thêm lần chạy hoàn thành
+            row_id = str(config_idx)
+            if self.result_tree.exists(row_id):
+                self.result_tree.item(row_id, values=values)
+            else:
+                # Chèn vào bảng theo thứ tự cấu hình
+                position = sum(1 for item in self.result_tree.get_children() if int(item) < config_idx)
+                self.result_tree.insert('', position, iid=row_id, values=values)
         except Exception as e:
             print(f"Lỗi khi cập nhật bảng kết quả: {str(e)}")
     
@@ -0,0 +1,20 @@
+"""
+Cấu hình chung cho các bài kiểm tra: nhập các mô-đun của dự án từ thư mục gốc
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import CVRP
+
+
+@pytest.fixture
+def small_cvrp():
+    """Bài toán ngẫu nhiên 30 khách hàng, sức chứa 100 (khoảng 6 tuyến)"""
+    cvrp = CVRP()
+    cvrp.load_problem(30, 100, seed=1)
+    return cvrp
@@ -0,0 +1,127 @@
+"""
+Kiểm tra ACO_CVRP: các phép tính vector hóa khớp với vòng lặp, tính tất định và việc giải phóng
+tài nguyên
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from core import aco as aco_module
+from core.aco import ACO_CVRP
+
+
+def test_seeded_batched_construction_ignores_global_random_state(small_cvrp):
+    results = []
+    for global_seed in (1, 2):
+        np.random.seed(global_seed)
+        aco = ACO_CVRP(small_cvrp, num_ants=8, max_iterations=5, construction="batched", seed=7)
+        results.append(aco.run())
+    assert results[0] == results[1]
+
+
+def test_parallel_construction_matches_serial(small_cvrp):
+    serial = ACO_CVRP(small_cvrp, num_ants=6, max_iterations=3, seed=3).run()
+    parallel = ACO_CVRP(small_cvrp, num_ants=6, max_iterations=3, seed=3, workers=2).run()
+    assert serial == parallel
+
+
+def test_step_data_gets_a_pheromone_copy_only_for_delivered_steps(small_cvrp):
+    aco = ACO_CVRP(small_cvrp, num_ants=4, max_iterations=7, seed=2, callback_every=3)
+    aco.pheromone = aco.pheromone.view(CountingArray)
+    copies = CountingArray.copies = []
+
+    steps = []
+    aco.run(step_callback=lambda data: steps.append(data))
+
+    # Vòng lặp 3 và 6 được chuyển tiếp, vòng lặp 7 (bị giữ lại) được gửi khi kết thúc
+    assert [data['iteration'] for data in steps] == [3, 6, 7]
+    assert len(copies) == 3
+    for data in steps:
+        assert not np.shares_memory(data['pheromone'], aco.pheromone)
+        assert data['min_pheromone'] <= data['avg_pheromone'] <= data['max_pheromone']
+    assert np.array_equal(steps[-1]['pheromone'], aco.pheromone)
+
+
+class CountingArray(np.ndarray):
+    """Mảng ghi lại mỗi lần copy(), dùng để đếm số bản sao pheromone"""
+    copies = None
+
+    def copy(self, *args, **kwargs):
+        self.copies.append(1)
+        return np.asarray(self).copy(*args, **kwargs)
+
+
+@pytest.mark.parametrize("alpha, beta", [(1.0, 2.0), (1.5, 3.0)])
+def test_choice_info_matches_elementwise_formula(small_cvrp, alpha, beta):
+    aco = ACO_CVRP(small_cvrp, alpha=alpha, beta=beta)
+    aco.pheromone[:] = np.random.RandomState(0).uniform(0.1, 2.0, aco.pheromone.shape)
+    aco.update_choice_info()
+
+    for i in range(aco.n):
+        for j in range(aco.n):
+            expected = aco.pheromone[i][j] ** alpha * aco.heuristic[i][j] ** beta
+            assert aco.choice_info[i][j] == pytest.approx(expected, rel=1e-12)
+
+
+def reference_deposit(pheromone, solution, amount):
+    """Thả pheromone từng cạnh bằng vòng lặp (phiên bản ban đầu), dùng để so sánh"""
+    for route in solution:
+        tour = [0] + route + [0]
+        for i, j in zip(tour, tour[1:]):
+            pheromone[i][j] += amount
+            pheromone[j][i] += amount
+
+
+def test_pheromone_update_matches_edge_loop(small_cvrp):
+    aco = ACO_CVRP(small_cvrp, num_ants=5, rho=0.3, elitist_ants=2, seed=4)
+    solutions = [aco.construct_solution(np.random.RandomState(ant)) for ant in range(5)]
+    costs = [small_cvrp.calculate_solution_cost(solution) for solution in solutions]
+    aco.best_solution, aco.best_cost = solutions[0], costs[0]
+
+    expected = aco.pheromone * (1 - aco.rho)
+    for solution, cost in zip(solutions, costs):
+        reference_deposit(expected, solution, aco.q / cost)
+    reference_deposit(expected, aco.best_solution, aco.q / aco.best_cost * aco.elitist_ants)
+
+    aco.update_pheromone(solutions, costs)
+    assert np.allclose(aco.pheromone, expected, rtol=1e-12, atol=0)
+
+
+def test_shared_memory_released_when_pool_creation_fails(small_cvrp, monkeypatch):
+    class FailingContext:
+        def Pool(self, *args, **kwargs):
+            raise OSError("cannot start workers")
+
+    monkeypatch.setattr(multiprocessing, "get_context", lambda method: FailingContext())
+    aco = ACO_CVRP(small_cvrp, num_ants=4, max_iterations=2, workers=2)
+    with pytest.raises(OSError):
+        aco.run()
+    assert aco.shared_choice_info is None
+    assert aco.pool is None
+
+
+def test_ant_worker_attaches_shared_choice_info_without_own_matrices(small_cvrp):
+    aco = ACO_CVRP(small_cvrp, candidate_list_size=5)
+    aco.run_seed = 3
+    block = shared_memory.SharedMemory(create=True, size=aco.choice_info.nbytes)
+    try:
+        shared = np.ndarray(aco.choice_info.shape, dtype=np.float64, buffer=block.buf)
+        shared[:] = aco.choice_info
+        aco_module._init_ant_worker(small_cvrp.distances, small_cvrp.demands, small_cvrp.capacity,
+                                    {'candidate_list_size': 5}, 3, block.name)
+        worker = aco_module._worker_aco
+        assert worker.pheromone is None and worker.heuristic is None and worker.heuristic_beta is None
+        assert worker.build_ant(worker.ant_rng(0, 0)) == aco.build_ant(aco.ant_rng(0, 0))
+        # Tiến trình cha làm mới choice_info dùng chung, tiến trình con thấy ngay giá trị mới
+        shared[0, 1] = 123.0
+        assert worker.choice_info[0, 1] == 123.0
+    finally:
+        del shared
+        aco_module._worker_aco = None
+        aco_module._worker_shared_memory.close()
+        aco_module._worker_shared_memory = None
+        block.close()
+        block.unlink()
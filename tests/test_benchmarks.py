@@ -0,0 +1,26 @@
+"""
+Kiểm tra phần tổng hợp kết quả của các benchmark
+"""
+
+from benchmarks.instance_benchmark import summarize
+
+
+def run(cost, valid, time_to_target=None):
+    return {'seed': 0, 'cost': cost, 'valid': valid, 'wall_time': 1.0,
+            'time_to_target': time_to_target, 'iterations': 10}
+
+
+def test_summary_ignores_invalid_runs():
+    summary = summarize([run(90.0, False, 0.5), run(110.0, True), run(130.0, True)], 100.0)
+    assert summary['best_cost'] == 110.0
+    assert summary['mean_cost'] == 120.0
+    assert summary['best_gap'] == 10.0
+    assert summary['invalid_runs'] == 1
+    assert summary['target_hits'] == 0
+
+
+def test_summary_without_valid_runs():
+    summary = summarize([run(90.0, False)], 100.0)
+    assert summary['best_cost'] is None
+    assert summary['mean_gap'] is None
+    assert summary['invalid_runs'] == 1
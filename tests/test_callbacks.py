@@ -0,0 +1,102 @@
+"""
+Kiểm tra StepThrottle và LatestValue: bước cuối luôn được chuyển tiếp, bộ đệm chỉ giữ giá trị mới nhất
+"""
+
+import threading
+
+from core.callbacks import LatestValue, StepThrottle, throttle_callback
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_steps(throttle, count, clock=None, step_seconds=0.0):
+    for step in range(1, count + 1):
+        throttle({'step': step})
+        if clock is not None:
+            clock.now += step_seconds
+    throttle.flush()
+
+
+def test_every_n_steps_and_final_step_are_delivered():
+    delivered = []
+    throttle = StepThrottle(lambda data: delivered.append(data['step']), every=3)
+    run_steps(throttle, 10)
+    assert delivered == [3, 6, 9, 10]
+
+
+def test_final_step_is_not_delivered_twice():
+    delivered = []
+    throttle = StepThrottle(lambda data: delivered.append(data['step']), every=3)
+    run_steps(throttle, 9)
+    assert delivered == [3, 6, 9]
+    assert throttle.flush() is None
+
+
+def test_min_interval_holds_steps_until_enough_time_passed():
+    delivered = []
+    clock = FakeClock()
+    throttle = StepThrottle(lambda data: delivered.append(data['step']), min_interval_ms=250, clock=clock)
+    run_steps(throttle, 10, clock, step_seconds=0.1)
+    assert delivered == [1, 4, 7, 10]
+
+
+def test_lazy_data_is_built_only_for_delivered_steps():
+    built = []
+
+    def step_data(step):
+        def build():
+            built.append(step)
+            return {'step': step}
+        return build
+
+    delivered = []
+    throttle = StepThrottle(lambda data: delivered.append(data['step']), every=4)
+    for step in range(1, 7):
+        throttle(step_data(step))
+    throttle.flush()
+    assert delivered == built == [4, 6]
+
+
+def test_unthrottled_callback_sees_every_step_and_its_result():
+    throttle = throttle_callback(lambda data: data['step'] == 2)
+    assert [throttle({'step': step}) for step in (1, 2, 3)] == [False, True, False]
+    assert throttle_callback(None) is None
+
+
+def test_latest_value_keeps_only_the_newest_value():
+    buffer = LatestValue()
+    assert buffer.take() is None
+    assert buffer.put(1) is True
+    assert buffer.put(2) is False
+    assert buffer.put(3) is False
+    assert buffer.take() == 3
+    assert buffer.dropped == 2
+    assert buffer.take() is None
+    assert buffer.put(4) is True
+
+
+def test_latest_value_schedules_one_take_per_batch_across_threads():
+    buffer = LatestValue()
+    scheduled = []
+
+    def producer(start):
+        for value in range(start, start + 1000):
+            if buffer.put(value):
+                scheduled.append(value)
+
+    threads = [threading.Thread(target=producer, args=(start,)) for start in (0, 1000)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Không có take() nào xen giữa nên chỉ lần put() đầu tiên cần lên lịch
+    assert len(scheduled) == 1
+    assert buffer.take() in (999, 1999)
+    assert buffer.dropped == 1999
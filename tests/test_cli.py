@@ -0,0 +1,41 @@
+"""
+Kiểm tra giao diện dòng lệnh (kiểm tra tham số và đọc dữ liệu)
+"""
+
+import json
+import os
+
+import pytest
+
+from cli import load_instance, main
+
+INSTANCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "json_datasets", "A", "A-n32-k5.json")
+
+
+@pytest.mark.parametrize("argv", [
+    ["-a", "aco", "--construction", "foo"],
+    ["-a", "ga", "--decoder", "bogus"],
+    ["-a", "ga", "--construction", "batched"],
+    ["-a", "aco", "--population-size", "10"],
+    ["-a", "aco", "--savings-seeding"],
+])
+def test_invalid_options_are_rejected(argv):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["solve", INSTANCE] + argv)
+    assert exit_info.value.code == 2
+
+
+def test_solve_writes_result(tmp_path):
+    output = tmp_path / "result.json"
+    assert main(["solve", INSTANCE, "-a", "ga", "-n", "2", "--seed", "0", "-o", str(output)]) == 0
+    result = json.loads(output.read_text())
+    assert result['valid']
+    assert result['iterations'] == 2
+
+
+def test_missing_depot_is_an_error(tmp_path):
+    vrp_file = tmp_path / "no-depot.vrp"
+    vrp_file.write_text("CAPACITY : 10\nNODE_COORD_SECTION\n2 1 1\n3 2 2\nDEMAND_SECTION\n2 3\n3 4\nEOF\n")
+    with pytest.raises(ValueError):
+        load_instance(str(vrp_file))
@@ -0,0 +1,56 @@
+"""
+Kiểm tra lớp CVRP: dữ liệu dạng mảng luôn khớp với danh sách khách hàng, ma trận khoảng cách
+tính theo khối và danh sách láng giềng khớp với cách tính trực tiếp
+"""
+
+import numpy as np
+import pytest
+
+from core import CVRP
+from core.aco import ACO_CVRP
+from core.genetic import GeneticAlgorithm_CVRP
+
+
+def test_arrays_follow_customers_added_one_by_one():
+    cvrp = CVRP(capacity=30)
+    cvrp.add_depot(0, 0)
+    cvrp.add_customer(1, 3, 4, 10)
+    cvrp.add_customer(2, -3, 4, 15)
+
+    # Chưa tính ma trận khoảng cách: các phép kiểm tra tải trọng vẫn dùng được
+    assert cvrp.calculate_route_demand([1, 2]) == 25
+    assert cvrp.is_solution_valid([[1, 2]])
+
+    cvrp.add_customer(3, 0, -5, 20)
+    assert cvrp.demands.tolist() == [0, 10, 15, 20]
+    assert cvrp.xs.tolist() == [0, 3, -3, 0]
+    assert not cvrp.is_solution_valid([[1, 2, 3]])
+    assert cvrp.is_solution_valid([[1, 2], [3]])
+
+    cvrp.calculate_distances()
+    assert cvrp.distances[0, 1] == 5.0
+    ACO_CVRP(cvrp, num_ants=2, max_iterations=1)
+    GeneticAlgorithm_CVRP(cvrp, population_size=4, max_generations=1)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("block_size", [1, 7, 1024])
+def test_blocked_distances_match_naive_matrix(small_cvrp, dtype, block_size):
+    small_cvrp.calculate_distances(dtype=dtype, block_size=block_size)
+    xs = np.array([c.x for c in small_cvrp.customers])
+    ys = np.array([c.y for c in small_cvrp.customers])
+    naive = np.hypot(xs[:, None] - xs[None, :], ys[:, None] - ys[None, :]).astype(dtype)
+
+    assert small_cvrp.distances.dtype == dtype
+    assert np.array_equal(small_cvrp.distances, naive)
+
+
+@pytest.mark.parametrize("k", [1, 5, 29])
+@pytest.mark.parametrize("block_size", [4, 1024])
+def test_neighbor_lists_match_argsort_order(small_cvrp, k, block_size):
+    n = len(small_cvrp.customers)
+    expected = [[node for node in np.argsort(small_cvrp.distances[i], kind='stable') if node not in (0, i)][:k]
+                for i in range(n)]
+
+    assert small_cvrp.build_neighbor_lists(k, block_size).tolist() == expected
+    assert small_cvrp.get_neighbors(k).tolist() == expected
@@ -0,0 +1,86 @@
+"""
+Kiểm tra đánh giá độ thích nghi (bộ nhớ đệm LRU, tiến trình con) và biến thể steady-state của
+GeneticAlgorithm_CVRP
+"""
+
+import random
+
+import pytest
+
+from core import genetic
+from core.genetic import GeneticAlgorithm_CVRP
+
+
+def random_chromosomes(cvrp, count, seed=0):
+    rng = random.Random(seed)
+    chromosomes = []
+    for _ in range(count):
+        chromosome = list(range(1, len(cvrp.customers)))
+        rng.shuffle(chromosome)
+        chromosomes.append(chromosome)
+    return chromosomes
+
+
+def test_fitness_worker_matches_serial_and_keeps_no_split_states(small_cvrp, monkeypatch):
+    monkeypatch.setattr(genetic, "_worker_ga", None)
+    genetic._init_fitness_worker(small_cvrp.distances, small_cvrp.demands, small_cvrp.capacity, "split")
+    ga = GeneticAlgorithm_CVRP(small_cvrp, decoder="split", fitness_cache_size=0)
+
+    for chromosome in random_chromosomes(small_cvrp, 200):
+        assert genetic._evaluate_task(chromosome) == ga.decode_and_evaluate(chromosome)
+
+    # Tiến trình con giải mã mọi con của cả lần chạy, không được giữ trạng thái Split của chúng
+    assert len(genetic._worker_ga.split_states) == 0
+
+
+def test_steady_state_reports_and_stops_early_without_replacements(small_cvrp):
+    # Không lai ghép, không đột biến: mọi con trùng cha mẹ nên không có lần thay thế nào
+    random.seed(0)
+    ga = GeneticAlgorithm_CVRP(small_cvrp, population_size=10, max_generations=20, engine="steady_state",
+                               crossover_rate=0, mutation_rate=0)
+    reports = []
+    ga.run(step_callback=reports.append)
+    assert len(reports) == 20
+
+    ga = GeneticAlgorithm_CVRP(small_cvrp, population_size=10, max_generations=20, engine="steady_state",
+                               crossover_rate=0, mutation_rate=0, early_stopping=3)
+    ga.run()
+    assert len(ga.cost_history) < 20
+
+
+def test_steady_state_keeps_split_states_of_members_only(small_cvrp):
+    random.seed(0)
+    ga = GeneticAlgorithm_CVRP(small_cvrp, population_size=20, max_generations=10, engine="steady_state",
+                               decoder="split")
+    ga.run()
+    assert len(ga.split_states) <= 20
+    assert not ga.parent_hints
+
+
+def test_steady_state_rejects_array_representation(small_cvrp):
+    with pytest.raises(ValueError):
+        GeneticAlgorithm_CVRP(small_cvrp, engine="steady_state", representation="array")
+
+
+def test_fitness_cache_counts_hits_and_evicts_least_recently_used(small_cvrp):
+    ga = GeneticAlgorithm_CVRP(small_cvrp, fitness_cache_size=2)
+    a, b, c = random_chromosomes(small_cvrp, 3)
+
+    for chromosome in (a, b, a, c):
+        ga.evaluate(chromosome)
+    assert (ga.cache_hits, ga.cache_misses) == (1, 3)
+    assert list(ga.fitness_cache) == [tuple(a), tuple(c)]  # b ít được dùng gần đây nhất nên bị loại
+
+    assert ga.evaluate(b) == ga.decode_and_evaluate(b)
+    ga.evaluate(c)
+    assert (ga.cache_hits, ga.cache_misses) == (2, 4)
+    assert list(ga.fitness_cache) == [tuple(b), tuple(c)]
+
+
+def test_disabled_fitness_cache_counts_every_decode_as_a_miss(small_cvrp):
+    ga = GeneticAlgorithm_CVRP(small_cvrp, fitness_cache_size=0)
+    chromosome = random_chromosomes(small_cvrp, 1)[0]
+    for _ in range(3):
+        ga.evaluate(chromosome)
+    assert (ga.cache_hits, ga.cache_misses) == (0, 3)
+    assert not ga.fitness_cache
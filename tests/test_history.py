@@ -0,0 +1,31 @@
+"""
+Kiểm tra RunHistory: lịch sử tại một bước không đổi dù thuật toán đã chạy tiếp
+"""
+
+import random
+
+import pytest
+
+from core.genetic import GeneticAlgorithm_CVRP
+
+
+def test_step_history_is_the_history_at_that_step(small_cvrp):
+    random.seed(0)
+    ga = GeneticAlgorithm_CVRP(small_cvrp, population_size=10, max_generations=6)
+    steps = []
+    ga.run(step_callback=steps.append)
+
+    history = steps[0]['history']
+    assert all(data['history'] is history for data in steps)
+    for data in steps:
+        length = data['history_length']
+        assert history.get('cost_history', end=length) == ga.cost_history[:length]
+        assert history.get('cost_history', end=length)[-1] == data['best_cost']
+        assert history.get('avg_cost_history', end=length)[-1] == data['avg_cost']
+
+    assert len(history) == len(ga.cost_history) == 6
+    assert history.since('cost_history', 4) == ga.cost_history[4:]
+    assert history.latest('diversity_history') == ga.diversity_history[-1]
+    assert history.snapshot(end=2)['worst_cost_history'] == ga.worst_cost_history[:2]
+    with pytest.raises(KeyError):
+        history.get('population')
@@ -0,0 +1,28 @@
+"""
+Kiểm tra 2-opt: lời giải hợp lệ và chi phí không tăng
+"""
+
+import random
+
+import pytest
+
+from core.local_search import two_opt_route, two_opt_solution
+from core.savings import clarke_wright_savings
+
+
+@pytest.mark.parametrize("neighbor_count", [3, 40])
+def test_two_opt_keeps_customers_and_never_increases_cost(small_cvrp, neighbor_count):
+    rng = random.Random(neighbor_count)
+    for _ in range(50):
+        route = rng.sample(range(1, len(small_cvrp.customers)), rng.randint(0, 12))
+        improved = two_opt_route(route, small_cvrp.distances, neighbor_count=neighbor_count)
+        assert sorted(improved) == sorted(route)
+        assert (small_cvrp.calculate_route_distance(improved)
+                <= small_cvrp.calculate_route_distance(route) + 1e-9)
+
+
+def test_two_opt_solution_stays_valid(small_cvrp):
+    solution = clarke_wright_savings(small_cvrp)
+    improved = two_opt_solution(solution, small_cvrp.distances)
+    assert small_cvrp.is_solution_valid(improved)
+    assert small_cvrp.calculate_solution_cost(improved) <= small_cvrp.calculate_solution_cost(solution) + 1e-9
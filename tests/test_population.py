@@ -0,0 +1,85 @@
+"""
+Kiểm tra các toán tử theo hàng của biểu diễn ma trận và độ đa dạng vector hóa so với cách tính
+trên list của GA
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from core.genetic import GeneticAlgorithm_CVRP
+from core.population import (
+    cycle_crossover_rows, hamming_diversity, ordered_crossover_rows, partially_mapped_crossover_rows,
+    random_population, sampled_hamming_diversity,
+)
+
+
+def parent_pairs(count, size, seed=0):
+    rng = random.Random(seed)
+    return [(rng.sample(range(1, size + 1), size), rng.sample(range(1, size + 1), size)) for _ in range(count)]
+
+
+def crossover_points(seed, size):
+    # Cùng cách chọn điểm lai ghép như ordered_crossover/partially_mapped_crossover
+    random.seed(seed)
+    point1 = random.randint(0, size - 2)
+    return point1, random.randint(point1 + 1, size - 1)
+
+
+@pytest.fixture
+def ga(small_cvrp):
+    return GeneticAlgorithm_CVRP(small_cvrp)
+
+
+def test_cycle_crossover_rows_match_list_operator(ga):
+    for parent1, parent2 in parent_pairs(200, 12):
+        children1, children2 = cycle_crossover_rows(np.array([parent1]), np.array([parent2]))
+        child1, child2 = ga.cycle_crossover(parent1, parent2)
+        assert children1[0].tolist() == child1
+        assert children2[0].tolist() == child2
+
+
+@pytest.mark.parametrize("name, kernel", [
+    ("ordered_crossover", ordered_crossover_rows),
+    ("partially_mapped_crossover", partially_mapped_crossover_rows),
+])
+def test_segment_crossover_rows_match_list_operator(ga, name, kernel):
+    for seed, (parent1, parent2) in enumerate(parent_pairs(200, 12)):
+        point1, point2 = crossover_points(seed, len(parent1))
+        random.seed(seed)
+        child1, child2 = getattr(ga, name)(parent1, parent2)
+
+        first, second = np.array([parent1]), np.array([parent2])
+        start, end = np.array([point1]), np.array([point2])
+        assert kernel(first, second, start, end)[0].tolist() == child1
+        assert kernel(second, first, start, end)[0].tolist() == child2
+
+
+def pairwise_diversity(population, pairs):
+    """Khoảng cách Hamming trung bình theo từng cặp (phiên bản ban đầu), tính bằng phần trăm"""
+    total_diff = sum(sum(1 for a, b in zip(population[i], population[j]) if a != b) for i, j in pairs)
+    return total_diff / len(pairs) / len(population[0]) * 100
+
+
+@pytest.mark.parametrize("size", [2, 7, 40])
+def test_hamming_diversity_matches_pairwise_loop(size):
+    matrix = random_population(size, 15, np.random.RandomState(size))
+    matrix[1] = matrix[0]  # Có cá thể trùng nhau
+    pairs = [(i, j) for i in range(size) for j in range(i + 1, size)]
+    expected = pairwise_diversity(matrix.tolist(), pairs)
+
+    assert hamming_diversity(matrix) == pytest.approx(expected)
+    assert sampled_hamming_diversity(matrix, len(pairs), np.random.RandomState(0)) == pytest.approx(expected)
+
+
+def test_sampled_hamming_diversity_averages_the_drawn_pairs():
+    matrix = random_population(30, 15, np.random.RandomState(1))
+    rng = np.random.RandomState(2)
+    first = rng.randint(0, 30, size=50)
+    second = rng.randint(0, 29, size=50)
+    second += second >= first
+    assert (first != second).all()  # Không so sánh một hàng với chính nó
+    expected = pairwise_diversity(matrix.tolist(), list(zip(first, second)))
+
+    assert sampled_hamming_diversity(matrix, 50, np.random.RandomState(2)) == pytest.approx(expected)
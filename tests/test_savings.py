@@ -0,0 +1,42 @@
+"""
+Kiểm tra savings (Clarke-Wright): lời giải hợp lệ và giống phiên bản ban đầu
+"""
+
+from core.savings import clarke_wright_savings
+
+
+def reference_savings(cvrp):
+    """Phiên bản savings ban đầu (quét lại mọi tuyến sau mỗi lần hợp nhất), dùng để so sánh"""
+    n = len(cvrp.customers)
+    distances = cvrp.distances
+    routes = [[i] for i in range(1, n)]
+    savings = sorted(((distances[0, i] + distances[0, j] - distances[i, j], i, j)
+                      for i in range(1, n) for j in range(i + 1, n)), reverse=True)
+    customer_to_route = {i: idx for idx, route in enumerate(routes) for i in route}
+    for _, i, j in savings:
+        if customer_to_route[i] == customer_to_route[j]:
+            continue
+        route_i = routes[customer_to_route[i]]
+        route_j = routes[customer_to_route[j]]
+        if i not in (route_i[0], route_i[-1]) or j not in (route_j[0], route_j[-1]):
+            continue
+        if sum(cvrp.customers[k].demand for k in route_i + route_j) > cvrp.capacity:
+            continue
+        if i == route_i[0]:
+            route_i.reverse()
+        if j == route_j[-1]:
+            route_j.reverse()
+        routes[customer_to_route[i]] = route_i + route_j
+        routes.pop(customer_to_route[j])
+        customer_to_route = {k: idx for idx, route in enumerate(routes) for k in route}
+    return routes
+
+
+def test_savings_is_valid_and_matches_reference(small_cvrp):
+    solution = clarke_wright_savings(small_cvrp)
+    assert small_cvrp.is_solution_valid(solution)
+    assert solution == reference_savings(small_cvrp)
+
+    # Chỉ hợp nhất khi savings dương nên không tệ hơn mỗi khách hàng một tuyến
+    star = [[customer] for customer in range(1, len(small_cvrp.customers))]
+    assert small_cvrp.calculate_solution_cost(solution) <= small_cvrp.calculate_solution_cost(star)
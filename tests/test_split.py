@@ -0,0 +1,90 @@
+"""
+Kiểm tra Split: tính lại từ một vị trí phải cho kết quả giống hệt tính từ đầu
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from core.genetic import GeneticAlgorithm_CVRP
+from core.split import split_giant_tour, split_state
+
+
+@pytest.mark.parametrize("capacity", [100, 45])
+def test_incremental_split_matches_full_split(small_cvrp, capacity):
+    rng = random.Random(capacity)
+    customers = list(range(1, len(small_cvrp.customers)))
+    for _ in range(200):
+        parent = customers[:]
+        rng.shuffle(parent)
+        changed = rng.randint(0, len(parent))
+        child = parent[:changed] + rng.sample(parent[changed:], len(parent) - changed)
+        start = rng.randint(0, changed)  # Một cận dưới bất kỳ của vị trí khác đầu tiên
+
+        previous = split_state(parent, small_cvrp.distances, small_cvrp.demands, capacity)
+        incremental = split_state(child, small_cvrp.distances, small_cvrp.demands, capacity, previous, start)
+        full = split_state(child, small_cvrp.distances, small_cvrp.demands, capacity)
+        for reused, computed in zip(incremental, full):
+            assert np.array_equal(reused, computed)
+
+
+def test_split_routes_respect_capacity_and_cost(small_cvrp):
+    chromosome = list(range(1, len(small_cvrp.customers)))
+    random.Random(0).shuffle(chromosome)
+    routes, cost = split_giant_tour(chromosome, small_cvrp.distances, small_cvrp.demands, small_cvrp.capacity)
+
+    assert small_cvrp.is_solution_valid(routes)
+    assert [customer for route in routes for customer in route] == chromosome
+    assert cost == pytest.approx(small_cvrp.calculate_solution_cost(routes))
+
+
+@pytest.mark.parametrize("crossover_method", ["ordered", "partially_mapped", "cycle"])
+@pytest.mark.parametrize("mutation_method", ["swap", "insert", "inversion", "scramble"])
+def test_operator_hints_bound_the_first_change(small_cvrp, crossover_method, mutation_method):
+    random.seed(0)
+    ga = GeneticAlgorithm_CVRP(small_cvrp, decoder="split", crossover_method=crossover_method,
+                               mutation_method=mutation_method, mutation_rate=0.5, crossover_rate=0.8)
+    population = ga.initialize_population()
+    fitness_values = [ga.evaluate_fitness(individual) for individual in population]
+
+    for _ in range(50):
+        children = ga.make_offspring(population, fitness_values)
+        hints = dict(ga.parent_hints)
+        for child in children:
+            origin, start = hints[tuple(child)]
+            assert tuple(child[:start]) == origin[:start]
+            # Giải mã từ trạng thái của cha/mẹ cho cùng tuyến như giải mã từ đầu
+            ga.parent_hints = {tuple(child): (origin, start)}
+            ga.split_states[origin] = split_state(list(origin), small_cvrp.distances,
+                                                  small_cvrp.demands, small_cvrp.capacity)
+            routes = ga.split_chromosome(child)
+            ga.parent_hints = {}
+            ga.split_states.clear()
+            assert routes == ga.split_chromosome(child)
+
+
+def test_cycle_crossover_hint_bounds_the_first_alternated_gene(small_cvrp):
+    ga = GeneticAlgorithm_CVRP(small_cvrp, decoder="split", crossover_method="cycle")
+    rng = random.Random(3)
+    customers = list(range(1, len(small_cvrp.customers)))
+    alternated = 0
+    for _ in range(100):
+        parent1, parent2 = rng.sample(customers, len(customers)), rng.sample(customers, len(customers))
+        children = ga.cycle_crossover(parent1, parent2)
+        for child, (origin, start) in zip(children, ga.offspring_origins):
+            changed = [i for i, (gene, kept) in enumerate(zip(child, origin)) if gene != kept]
+            # Chu trình một phần tử có cùng gene ở hai cha/mẹ nên start chỉ là cận dưới
+            assert start <= (changed[0] if changed else len(child))
+            assert child[:start] == origin[:start]
+            alternated += bool(changed)
+
+            ga.parent_hints = {tuple(child): (tuple(origin), start)}
+            ga.split_states[tuple(origin)] = split_state(origin, small_cvrp.distances,
+                                                         small_cvrp.demands, small_cvrp.capacity)
+            routes = ga.split_chromosome(child)
+            ga.parent_hints = {}
+            ga.split_states.clear()
+            assert routes == ga.split_chromosome(child)
+    # Hầu hết các cặp cha/mẹ ngẫu nhiên có nhiều hơn một chu trình
+    assert alternated > 100
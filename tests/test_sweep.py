@@ -0,0 +1,53 @@
+"""
+Kiểm tra thử nghiệm tham số song song: kết quả không phụ thuộc số tiến trình
+"""
+
+import multiprocessing
+
+from core.sweep import init_sweep_worker, run_sweep_task, task_seed
+
+
+def sweep_tasks():
+    configs = [
+        ("GA", {'max_generations': 5, 'population_size': 12}),
+        ("GA", {'max_generations': 5, 'population_size': 12, 'mutation_method': 'inversion'}),
+        ("ACO", {'max_iterations': 3, 'num_ants': 5}),
+    ]
+    return [(config_idx, run, algorithm_type, config, task_seed(0, config_idx, run))
+            for config_idx, (algorithm_type, config) in enumerate(configs)
+            for run in range(2)]
+
+
+def outcomes_by_task(outcomes):
+    return {(outcome['config_idx'], outcome['run']): outcome for outcome in outcomes}
+
+
+def test_task_seeds_are_distinct_and_stable():
+    seeds = [task[4] for task in sweep_tasks()]
+    assert len(set(seeds)) == len(seeds)
+    assert seeds == [task[4] for task in sweep_tasks()]
+
+
+def test_sweep_results_do_not_depend_on_worker_count(small_cvrp):
+    tasks = sweep_tasks()
+
+    init_sweep_worker(small_cvrp)
+    serial = outcomes_by_task(run_sweep_task(task) for task in tasks)
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(2, initializer=init_sweep_worker, initargs=(small_cvrp,)) as pool:
+        parallel = outcomes_by_task(pool.imap_unordered(run_sweep_task, tasks))
+
+    assert set(serial) == set(parallel)
+    for key, outcome in serial.items():
+        assert outcome['error'] is None
+        for field in ('best_cost', 'costs', 'avg_costs', 'iterations', 'valid', 'seed'):
+            assert outcome[field] == parallel[key][field]
+
+
+def test_failed_task_reports_its_error(small_cvrp):
+    init_sweep_worker(small_cvrp)
+    outcome = run_sweep_task((0, 1, "GA", {'engine': 'steady_state', 'representation': 'array'}, task_seed(0, 0, 1)))
+    assert (outcome['config_idx'], outcome['run']) == (0, 1)
+    assert outcome['error'] is not None
+    assert 'best_cost' not in outcome